@@ -4,13 +4,12 @@ from fastapi.staticfiles import StaticFiles
 from reactpy.backend.fastapi import configure, Options
 from reactpy import html
 from contextlib import asynccontextmanager
-import os
 import time
-import asyncio
 import re
 import requests
 from components.common.router import RootRouter
 import components.common.calendar_db as calendar_db
+from components.common import ai_admission, ai_client, ai_cache, airport_index, artifact_store, exchange_rates, generate_flightroute, pc_solver, route_images, task_runner
 from components.common.config import CACHE_SUFFIX, set_CACHE_SUFFIX
 
 # ───────────────────────────────────────────────────────────────────────────────
@@ -29,50 +28,21 @@ def debug_print(*args, **kwargs):
     if DEBUG_MODE:
         print("[app.py DEBUG]", *args, **kwargs)
 
-# ─── Cleanup Config ─────────────────────────────────────────────
-MAX_AGE_SECONDS = 60 * 60  # 1 hour
-CLEANUP_INTERVAL = 60 * 60  # 1 hour
-
-def cleanup_temp_files():
-    temp_dirs = [
-        "static/assets/tts_temp",
-        "static/assets/flight_routes_temp"
-        "static/assets/pdf_temp",
-    ]
-    MAX_AGE_SECONDS = 60 * 60  # 1 hour
-    removed_total = 0
-    for dir_path in temp_dirs:
-        if os.path.exists(dir_path):
-            now = time.time()
-            removed = 0
-            for f in os.listdir(dir_path):
-                fpath = os.path.join(dir_path, f)
-                if os.path.isfile(fpath) and (f.endswith('.wav') or f.endswith('.png')):
-                    try:
-                        if now - os.path.getmtime(fpath) > MAX_AGE_SECONDS:
-                            os.remove(fpath)
-                            removed += 1
-                    except Exception:
-                        pass
-            if removed:
-                print(f"Cleaned up {removed} old temp files in {dir_path}.")
-            removed_total += removed
-        else:
-            print(f"{dir_path} does not exist, no cleanup needed.")
-    return removed_total
-
-async def periodic_cleanup():
-    while True:
-        cleanup_temp_files()
-        await asyncio.sleep(CLEANUP_INTERVAL)
-
 # ─── Lifespan for FastAPI Startup/Shutdown ─────────────────────────
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     debug_print("Starting FastAPI lifespan...")
-    asyncio.create_task(periodic_cleanup())
+    await ai_client.start()
+    exchange_rates.start()
+    task_runner.spawn(task_runner.run_blocking(pc_solver.prepare), name="pc_catalog_warmup")
+    task_runner.spawn(task_runner.run_blocking(airport_index.load), name="airport_index_warmup")
+    await artifact_store.start()
     yield
     debug_print("Shutting down FastAPI lifespan...")
+    await task_runner.shutdown()
+    generate_flightroute.shutdown_render_pool()
+    await task_runner.run_blocking(artifact_store.close)
+    await ai_client.close()
 
 # ─── FastAPI App ────────────────────────────────────────────────────
 app = FastAPI(lifespan=lifespan)
@@ -105,6 +75,36 @@ def get_calendar(user_id: str, request: Request):
     debug_print(f"ICS content (first 200 chars):\n{ics[:200]}")
     return Response(content=ics, media_type="text/calendar")
 
+# ─── Route Image Endpoint ───────────────────────────────────────────
+@app.get("/routes/{name}")
+async def get_route_image(name: str, request: Request):
+    """/routes/OTP-JFK-LAX.svg (or _320.webp, _800.webp, _1600.webp, _print.jpg): rendered once, then cached."""
+    try:
+        codes, variant = route_images.parse(name)
+        entry = await route_images.ensure(codes)
+    except ValueError as e:
+        return Response(content=str(e), status_code=404, media_type="text/plain")
+    except RuntimeError as e:  # render pool busy, timed out or crashed
+        return Response(content=str(e), status_code=503, media_type="text/plain", headers={"Retry-After": "5"})
+    etag = route_images.etag(entry, variant)
+    headers = {"ETag": etag, "Cache-Control": route_images.cache_control(entry, variant, request.query_params.get("v"))}
+    if route_images.not_modified(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(route_images.blob_path(entry, variant), media_type=route_images.media_type(variant), headers=headers)
+
+# ─── AI Metrics Endpoint ────────────────────────────────────────────
+@app.get("/metrics/ai")
+def get_ai_metrics():
+    return {
+        "client": ai_client.metrics(),
+        "admission": ai_admission.metrics(),
+        "cache": ai_cache.stats(),
+        "tasks": task_runner.metrics(),
+        "exchange_rates": exchange_rates.status(),
+        "route_maps": generate_flightroute.render_metrics(),
+        "artifacts": artifact_store.stats(),
+    }
+
 # ─── ReactPy Configuration ──────────────────────────────────────────
 configure(
     app, RootRouter,
@@ -0,0 +1,187 @@
+import asyncio
+import heapq
+import itertools
+import time
+import uuid
+import weakref
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager
+from reactpy import use_scope
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  DEBUG LOGGER
+# ───────────────────────────────────────────────────────────────────────────────
+
+try:
+    from components.common.config import DEBUG_MODE, REACTPY_DEBUG_MODE
+    if REACTPY_DEBUG_MODE:
+        import reactpy
+        reactpy.config.REACTPY_DEBUG_MODE.current = True
+        print("[ai_admission.py DEBUG] REACTPY_DEBUG_MODE imported from config.py, using value:", REACTPY_DEBUG_MODE)
+    if DEBUG_MODE:
+        print("[ai_admission.py DEBUG] DEBUG_MODE imported from config.py, using value:", DEBUG_MODE)
+except ImportError:
+    DEBUG_MODE = False
+    print("Warning: DEBUG_MODE not imported from config.py, using default value False.")
+
+def debug_log(*args):
+    if DEBUG_MODE:
+        print("[ai_admission.py DEBUG]", *args)
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  CONFIGURATION
+# ───────────────────────────────────────────────────────────────────────────────
+
+MAX_CONCURRENT = 16         # upstream AI calls running at once, process-wide
+MAX_PER_SESSION = 3         # upstream AI calls running at once for one browser tab
+QUEUE_TIMEOUT = 20          # seconds a call may wait for a slot before failing fast
+WAIT_SAMPLES = 500          # recent wait times kept for the percentile metrics
+
+# Priorities (lower runs first)
+INTERACTIVE = 0             # chat turns, the thing the user is staring at
+DEFAULT = 1                 # one-shot tools (translate, summarize, generate...)
+BACKGROUND = 2              # nice-to-have extras (PC Part Picker analysis, estimates)
+
+PRIORITY_NAMES = {INTERACTIVE: "interactive", DEFAULT: "default", BACKGROUND: "background"}
+
+SESSION_SCOPE_KEY = "ai_session_key"
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  ADMISSION GATE
+# ───────────────────────────────────────────────────────────────────────────────
+
+class _Gate:
+    """Slots and the priority queue for one event loop (futures are loop-bound)."""
+
+    def __init__(self):
+        self.active = 0
+        self.per_session = defaultdict(int)
+        self.waiters = []  # heap of [priority, seq, session_key, future]
+        self.seq = itertools.count()
+
+    def queued(self):
+        return sum(1 for entry in self.waiters if not entry[3].done())
+
+    def _has_room(self, session_key):
+        if self.active >= MAX_CONCURRENT:
+            return False
+        return session_key is None or self.per_session[session_key] < MAX_PER_SESSION
+
+    def _take(self, session_key):
+        self.active += 1
+        if session_key is not None:
+            self.per_session[session_key] += 1
+
+    def release(self, session_key):
+        self.active -= 1
+        if session_key is not None:
+            self.per_session[session_key] -= 1
+            if self.per_session[session_key] <= 0:
+                del self.per_session[session_key]
+        self.dispatch()
+
+    def dispatch(self):
+        """Hand free slots to the best waiters; a tab at its own cap doesn't block others."""
+        blocked = []
+        while self.waiters and self.active < MAX_CONCURRENT:
+            entry = heapq.heappop(self.waiters)
+            future = entry[3]
+            if future.done():
+                continue  # timed out or cancelled while queued
+            if not self._has_room(entry[2]):
+                blocked.append(entry)
+                continue
+            self._take(entry[2])
+            future.set_result(None)
+        for entry in blocked:
+            heapq.heappush(self.waiters, entry)
+
+    def enqueue(self, priority, session_key):
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.waiters, [priority, next(self.seq), session_key, future])
+        self.dispatch()
+        return future
+
+_gates = weakref.WeakKeyDictionary()  # loop -> _Gate
+
+def _gate():
+    loop = asyncio.get_running_loop()
+    gate = _gates.get(loop)
+    if gate is None:
+        gate = _gates[loop] = _Gate()
+    return gate
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  METRICS
+# ───────────────────────────────────────────────────────────────────────────────
+
+_stats = {"admitted": 0, "rejected": 0, "cancelled": 0}
+_admitted_by_priority = defaultdict(int)
+_waits = deque(maxlen=WAIT_SAMPLES)  # seconds spent queued, most recent last
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+def metrics():
+    """Queue depth, slot usage and recent wait times (served at /metrics/ai)."""
+    waits = sorted(_waits)
+    return {
+        "max_concurrent": MAX_CONCURRENT,
+        "max_per_session": MAX_PER_SESSION,
+        "active": sum(g.active for g in _gates.values()),
+        "queued": sum(g.queued() for g in _gates.values()),
+        "admitted": _stats["admitted"],
+        "rejected": _stats["rejected"],
+        "cancelled": _stats["cancelled"],
+        "admitted_by_priority": {PRIORITY_NAMES.get(p, str(p)): n for p, n in _admitted_by_priority.items()},
+        "wait_ms": {
+            "avg": round(1000 * sum(waits) / len(waits), 1) if waits else 0.0,
+            "p50": round(1000 * _percentile(waits, 0.50), 1),
+            "p95": round(1000 * _percentile(waits, 0.95), 1),
+            "max": round(1000 * waits[-1], 1) if waits else 0.0,
+        },
+    }
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  PUBLIC API
+# ───────────────────────────────────────────────────────────────────────────────
+
+@asynccontextmanager
+async def slot(priority=DEFAULT, session_key=None, timeout=QUEUE_TIMEOUT):
+    """
+    Hold one upstream AI slot for the duration of the block. Waiters are served
+    by priority, then arrival order. Raises RuntimeError if no slot frees up
+    within `timeout` seconds, so overload shows a quick "busy" error instead of
+    every request hanging until the HTTP timeout.
+    """
+    gate = _gate()
+    queued_at = time.monotonic()
+    future = gate.enqueue(priority, session_key)
+    try:
+        await asyncio.wait_for(future, timeout)
+    except BaseException as e:
+        if future.done() and not future.cancelled():
+            gate.release(session_key)  # slot was granted just as we gave up
+        else:
+            future.cancel()
+        if isinstance(e, asyncio.TimeoutError):
+            _stats["rejected"] += 1
+            debug_log(f"Rejected after {timeout}s in queue (priority {priority})")
+            raise RuntimeError("The AI service is busy right now, please try again in a moment.") from None
+        _stats["cancelled"] += 1
+        raise
+    _waits.append(time.monotonic() - queued_at)
+    _stats["admitted"] += 1
+    _admitted_by_priority[priority] += 1
+    try:
+        yield
+    finally:
+        gate.release(session_key)
+
+def use_session_key():
+    """Hook returning a stable key for the current browser tab (one ReactPy connection)."""
+    scope = use_scope()
+    return scope.setdefault(SESSION_SCOPE_KEY, uuid.uuid4().hex)
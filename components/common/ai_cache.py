@@ -0,0 +1,217 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from collections import OrderedDict
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  DEBUG LOGGER
+# ───────────────────────────────────────────────────────────────────────────────
+
+try:
+    from components.common.config import DEBUG_MODE, REACTPY_DEBUG_MODE
+    if REACTPY_DEBUG_MODE:
+        import reactpy
+        reactpy.config.REACTPY_DEBUG_MODE.current = True
+        print("[ai_cache.py DEBUG] REACTPY_DEBUG_MODE imported from config.py, using value:", REACTPY_DEBUG_MODE)
+    if DEBUG_MODE:
+        print("[ai_cache.py DEBUG] DEBUG_MODE imported from config.py, using value:", DEBUG_MODE)
+except ImportError:
+    DEBUG_MODE = False
+    print("Warning: DEBUG_MODE not imported from config.py, using default value False.")
+
+def debug_log(*args):
+    if DEBUG_MODE:
+        print("[ai_cache.py DEBUG]", *args)
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  CONFIGURATION
+# ───────────────────────────────────────────────────────────────────────────────
+
+DB_PATH = os.path.join(os.path.dirname(__file__), '../../server-assets/persistent/ai_cache.db')
+
+DEFAULT_TTL = 24 * 60 * 60          # seconds a cached completion stays valid
+MEMORY_MAX_ENTRIES = 1024           # LRU tier: max number of responses
+MEMORY_MAX_BYTES = 8 * 1024 * 1024  # LRU tier: max total size of cached text
+SQLITE_ENABLED = True               # set to False to keep the cache in memory only
+SQLITE_MAX_ROWS = 20000             # SQLite tier: oldest rows are evicted past this
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  KEYS AND COUNTERS
+# ───────────────────────────────────────────────────────────────────────────────
+
+def make_key(endpoint, messages, max_tokens):
+    """Content address of a completion request: sha256 over (endpoint, messages, max_tokens)."""
+    raw = json.dumps(
+        {"endpoint": endpoint, "messages": messages, "max_tokens": max_tokens},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+_stats = {}
+
+def _counter(namespace):
+    if namespace not in _stats:
+        _stats[namespace] = {"hits": 0, "memory_hits": 0, "sqlite_hits": 0, "misses": 0, "stores": 0}
+    return _stats[namespace]
+
+def stats():
+    """Per-module hit/miss counters plus the current size of the memory tier."""
+    return {
+        "modules": {ns: dict(c) for ns, c in _stats.items()},
+        "memory_entries": len(_memory),
+        "memory_bytes": _memory_bytes,
+    }
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  MEMORY TIER (LRU with TTL and size limits)
+# ───────────────────────────────────────────────────────────────────────────────
+
+_memory = OrderedDict()  # key -> (expires_at, value, size)
+_memory_bytes = 0
+
+def _memory_get(key, now):
+    global _memory_bytes
+    entry = _memory.get(key)
+    if entry is None:
+        return None
+    expires_at, value, size = entry
+    if expires_at <= now:
+        del _memory[key]
+        _memory_bytes -= size
+        return None
+    _memory.move_to_end(key)
+    return value
+
+def _memory_put(key, value, expires_at):
+    global _memory_bytes
+    size = sys.getsizeof(value)
+    old = _memory.pop(key, None)  # dropped even if the new value is too big, so it can't be served stale
+    if old is not None:
+        _memory_bytes -= old[2]
+    if size > MEMORY_MAX_BYTES:
+        return
+    _memory[key] = (expires_at, value, size)
+    _memory_bytes += size
+    while _memory and (len(_memory) > MEMORY_MAX_ENTRIES or _memory_bytes > MEMORY_MAX_BYTES):
+        _, (_, _, evicted_size) = _memory.popitem(last=False)
+        _memory_bytes -= evicted_size
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  SQLITE TIER (server-assets/persistent/ai_cache.db)
+# ───────────────────────────────────────────────────────────────────────────────
+
+def get_db():
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def init_db():
+    debug_log("Initializing AI cache DB")
+    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+    conn = get_db()
+    c = conn.cursor()
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            expires_at REAL NOT NULL,
+            created_at REAL NOT NULL
+        )
+    ''')
+    c.execute('CREATE INDEX IF NOT EXISTS responses_created ON responses (created_at)')
+    conn.commit()
+    conn.close()
+
+_db_ready = False
+
+def _ensure_db():
+    """Create the DB on first use rather than at import, so importing this module writes nothing."""
+    global _db_ready, SQLITE_ENABLED
+    if _db_ready:
+        return
+    try:
+        init_db()
+    except Exception as e:
+        print(f"Warning: AI cache SQLite tier disabled ({e}).")
+        SQLITE_ENABLED = False
+        raise
+    _db_ready = True
+
+def _sqlite_get(key, now):
+    _ensure_db()
+    conn = get_db()
+    try:
+        row = conn.execute('SELECT value, expires_at FROM responses WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        if row['expires_at'] <= now:
+            conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+            conn.commit()
+            return None
+        return row['value'], row['expires_at']
+    finally:
+        conn.close()
+
+def _sqlite_put(key, value, expires_at, now):
+    _ensure_db()
+    conn = get_db()
+    try:
+        conn.execute(
+            'REPLACE INTO responses (key, value, expires_at, created_at) VALUES (?, ?, ?, ?)',
+            (key, value, expires_at, now)
+        )
+        conn.execute('DELETE FROM responses WHERE expires_at <= ?', (now,))
+        conn.execute(
+            'DELETE FROM responses WHERE key IN ('
+            ' SELECT key FROM responses ORDER BY created_at DESC LIMIT -1 OFFSET ?)',
+            (SQLITE_MAX_ROWS,)
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  PUBLIC API
+# ───────────────────────────────────────────────────────────────────────────────
+
+async def get(key, namespace):
+    """Look a response up in memory, then SQLite. Returns None on a miss."""
+    now = time.time()
+    counter = _counter(namespace)
+    value = _memory_get(key, now)
+    if value is not None:
+        counter["hits"] += 1
+        counter["memory_hits"] += 1
+        return value
+    if SQLITE_ENABLED:
+        try:
+            row = await asyncio.to_thread(_sqlite_get, key, now)
+        except Exception as e:
+            debug_log("SQLite get failed:", e)
+            row = None
+        if row is not None:
+            value, expires_at = row
+            _memory_put(key, value, expires_at)
+            counter["hits"] += 1
+            counter["sqlite_hits"] += 1
+            return value
+    counter["misses"] += 1
+    return None
+
+async def put(key, value, namespace, ttl=DEFAULT_TTL):
+    """Store a response in both tiers."""
+    now = time.time()
+    expires_at = now + ttl
+    _counter(namespace)["stores"] += 1
+    _memory_put(key, value, expires_at)
+    if SQLITE_ENABLED:
+        try:
+            await asyncio.to_thread(_sqlite_put, key, value, expires_at, now)
+        except Exception as e:
+            debug_log("SQLite put failed:", e)
@@ -0,0 +1,261 @@
+import asyncio
+import aiohttp
+import json
+import os
+from contextlib import asynccontextmanager
+from components.common import ai_admission, ai_cache
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  DEBUG LOGGER
+# ───────────────────────────────────────────────────────────────────────────────
+
+try:
+    from components.common.config import DEBUG_MODE, REACTPY_DEBUG_MODE
+    if REACTPY_DEBUG_MODE:
+        import reactpy
+        reactpy.config.REACTPY_DEBUG_MODE.current = True
+        print("[ai_client.py DEBUG] REACTPY_DEBUG_MODE imported from config.py, using value:", REACTPY_DEBUG_MODE)
+    if DEBUG_MODE:
+        print("[ai_client.py DEBUG] DEBUG_MODE imported from config.py, using value:", DEBUG_MODE)
+except ImportError:
+    DEBUG_MODE = False
+    print("Warning: DEBUG_MODE not imported from config.py, using default value False.")
+
+def debug_log(*args):
+    if DEBUG_MODE:
+        print("[ai_client.py DEBUG]", *args)
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  CONFIGURATION
+# ───────────────────────────────────────────────────────────────────────────────
+
+# Override with the AI_ENDPOINT env var to point at a local stub (tests/sse_stub_server.py)
+AI_ENDPOINT = os.environ.get("AI_ENDPOINT", "https://ai.hackclub.com/chat/completions")
+DEFAULT_TIMEOUT = 60            # seconds, total time for one completion
+MAX_CONNECTIONS = 100           # pool size across all hosts
+MAX_CONNECTIONS_PER_HOST = 20   # concurrent sockets to the AI endpoint
+DNS_CACHE_TTL = 300             # seconds to keep resolved addresses
+KEEPALIVE_TIMEOUT = 60          # seconds an idle connection is kept open
+STREAM_FLUSH_INTERVAL = 0.05    # seconds between partial-text updates while streaming
+STREAM_FLUSH_TOKENS = 8         # ...or after this many streamed deltas, whichever comes first
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  SHARED SESSION (created/closed by app.py lifespan)
+# ───────────────────────────────────────────────────────────────────────────────
+
+_session = None
+_session_loop = None
+
+def _make_connector():
+    return aiohttp.TCPConnector(
+        limit=MAX_CONNECTIONS,
+        limit_per_host=MAX_CONNECTIONS_PER_HOST,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        use_dns_cache=True,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+    )
+
+async def start():
+    """Create the shared pooled session on the running (server) event loop."""
+    global _session, _session_loop
+    if _session is not None and not _session.closed:
+        return _session
+    _session = aiohttp.ClientSession(
+        connector=_make_connector(),
+        headers={"Content-Type": "application/json"},
+    )
+    _session_loop = asyncio.get_running_loop()
+    debug_log("Shared AI session started")
+    return _session
+
+async def close():
+    """Close the shared session and its connector (app shutdown)."""
+    global _session, _session_loop
+    if _session is not None and not _session.closed:
+        await _session.close()
+        debug_log("Shared AI session closed")
+    _session = None
+    _session_loop = None
+
+@asynccontextmanager
+async def session_scope():
+    """
+    Yields the shared session when called on the loop it was created on.
+    Callers running on another loop (scripts, worker threads) or before
+    start() get a short-lived session instead, since aiohttp sessions are
+    loop-bound.
+    """
+    loop = asyncio.get_running_loop()
+    if _session is not None and not _session.closed and _session_loop is loop:
+        yield _session
+        return
+    debug_log("Using a temporary session (not on the server loop)")
+    async with aiohttp.ClientSession(headers={"Content-Type": "application/json"}) as temp:
+        yield temp
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  COMPLETIONS
+# ───────────────────────────────────────────────────────────────────────────────
+
+async def complete(messages, max_tokens=None, timeout=DEFAULT_TIMEOUT, cache=None, cache_ttl=ai_cache.DEFAULT_TTL,
+                   priority=ai_admission.DEFAULT, session_key=None):
+    """
+    Send a chat completion request and return the assistant's message text.
+    Raises RuntimeError on a non-200 response.
+
+    cache: module name to opt into the response cache (e.g. "translator").
+    Identical (endpoint, messages, max_tokens) requests are then answered
+    from memory/SQLite until cache_ttl expires. Hits and misses are counted
+    per module name.
+
+    Concurrent identical requests share one upstream call (single-flight).
+
+    priority / session_key: the upstream call waits for an admission slot
+    (see ai_admission); session_key is the tab's use_session_key() value.
+    """
+    key = ai_cache.make_key(AI_ENDPOINT, messages, max_tokens)
+    if cache:
+        cached = await ai_cache.get(key, cache)
+        if cached is not None:
+            debug_log(f"Cache hit for {cache}")
+            return cached
+
+    async def fetch():
+        async with ai_admission.slot(priority, session_key):
+            content = await _post_completion(messages, max_tokens, timeout)
+        if cache:
+            await ai_cache.put(key, content, cache, ttl=cache_ttl)
+        return content
+
+    return await _single_flight(key, fetch)
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  STREAMING (OpenAI-style "stream": true server-sent events)
+# ───────────────────────────────────────────────────────────────────────────────
+
+def _delta_text(chunk):
+    choices = chunk.get("choices") or []
+    if not choices:
+        return ""
+    choice = choices[0]
+    delta = choice.get("delta") or choice.get("message") or {}
+    return delta.get("content") or ""
+
+async def stream(messages, max_tokens=None, timeout=DEFAULT_TIMEOUT,
+                 priority=ai_admission.INTERACTIVE, session_key=None):
+    """
+    Async generator yielding text deltas as the model produces them.
+    Falls back to yielding the whole message once if the endpoint answers
+    with plain JSON instead of an event stream. Holds an admission slot
+    until the stream ends.
+    """
+    payload = {"messages": messages, "stream": True}
+    if max_tokens is not None:
+        payload["max_tokens"] = max_tokens
+    async with ai_admission.slot(priority, session_key), session_scope() as session:
+        async with session.post(
+            AI_ENDPOINT,
+            json=payload,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as resp:
+            debug_log("AI endpoint stream status:", resp.status)
+            if resp.status != 200:
+                raise RuntimeError(f"AI model returned {resp.status}")
+            if resp.content_type == "application/json":
+                data = await resp.json()
+                yield data["choices"][0]["message"]["content"]
+                return
+            async for raw_line in resp.content:
+                line = raw_line.decode("utf-8").strip()
+                if not line.startswith("data:"):
+                    continue  # blank separators, comments and other SSE fields
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    return
+                try:
+                    text = _delta_text(json.loads(data))
+                except ValueError:
+                    debug_log("Skipping malformed stream line:", data[:80])
+                    continue
+                if text:
+                    yield text
+
+async def stream_text(messages, max_tokens=None, timeout=DEFAULT_TIMEOUT,
+                      interval=STREAM_FLUSH_INTERVAL, max_pending=STREAM_FLUSH_TOKENS,
+                      priority=ai_admission.INTERACTIVE, session_key=None):
+    """
+    Async generator yielding the accumulated reply text in throttled batches:
+    at most once per `interval` seconds unless `max_pending` deltas piled up.
+    The last value yielded is always the complete reply.
+    """
+    loop = asyncio.get_running_loop()
+    text = ""
+    pending = 0
+    last_flush = loop.time()
+    async for delta in stream(messages, max_tokens=max_tokens, timeout=timeout,
+                              priority=priority, session_key=session_key):
+        text += delta
+        pending += 1
+        now = loop.time()
+        if pending >= max_pending or now - last_flush >= interval:
+            yield text
+            pending = 0
+            last_flush = now
+    if pending or not text:
+        yield text
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  SINGLE-FLIGHT (coalesce identical in-flight requests)
+# ───────────────────────────────────────────────────────────────────────────────
+
+_inflight = {}  # (loop, fingerprint) -> asyncio.Task
+_flight_stats = {"upstream": 0, "coalesced": 0}
+
+def _forget_flight(flight_key, task):
+    if _inflight.get(flight_key) is task:
+        del _inflight[flight_key]
+    # Mark the result as retrieved even if every waiter was cancelled
+    if not task.cancelled():
+        task.exception()
+
+async def _single_flight(fingerprint, factory):
+    """
+    Run factory() once per fingerprint at a time; concurrent callers await the
+    same task. Each waiter is shielded, so cancelling one waiter (e.g. a
+    component unmounting) never cancels the shared upstream request.
+    """
+    flight_key = (asyncio.get_running_loop(), fingerprint)
+    task = _inflight.get(flight_key)
+    if task is None:
+        task = asyncio.ensure_future(factory())
+        _inflight[flight_key] = task
+        task.add_done_callback(lambda t: _forget_flight(flight_key, t))
+        _flight_stats["upstream"] += 1
+    else:
+        _flight_stats["coalesced"] += 1
+        debug_log("Joined in-flight request", fingerprint[:12])
+    return await asyncio.shield(task)
+
+def metrics():
+    """Counters for the shared AI call path (served at /metrics/ai)."""
+    return {
+        "inflight": len(_inflight),
+        "upstream_requests": _flight_stats["upstream"],
+        "coalesced_requests": _flight_stats["coalesced"],
+    }
+
+async def _post_completion(messages, max_tokens, timeout):
+    payload = {"messages": messages}
+    if max_tokens is not None:
+        payload["max_tokens"] = max_tokens
+    async with session_scope() as session:
+        async with session.post(
+            AI_ENDPOINT,
+            json=payload,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as resp:
+            debug_log("AI endpoint response status:", resp.status)
+            if resp.status != 200:
+                raise RuntimeError(f"AI model returned {resp.status}")
+            data = await resp.json()
+    return data["choices"][0]["message"]["content"]
@@ -0,0 +1,322 @@
+import asyncio
+import json
+import math
+import os
+import threading
+from pathlib import Path
+import numpy as np
+from components.common import ai_client
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  DEBUG LOGGER
+# ───────────────────────────────────────────────────────────────────────────────
+
+try:
+    from components.common.config import DEBUG_MODE, REACTPY_DEBUG_MODE
+    if REACTPY_DEBUG_MODE:
+        import reactpy
+        reactpy.config.REACTPY_DEBUG_MODE.current = True
+        print("[airport_index.py DEBUG] REACTPY_DEBUG_MODE imported from config.py, using value:", REACTPY_DEBUG_MODE)
+    if DEBUG_MODE:
+        print("[airport_index.py DEBUG] DEBUG_MODE imported from config.py, using value:", DEBUG_MODE)
+except ImportError:
+    DEBUG_MODE = False
+    print("Warning: DEBUG_MODE not imported from config.py, using default value False.")
+
+def debug_log(*args):
+    if DEBUG_MODE:
+        print("[airport_index.py DEBUG]", *args)
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  CONFIGURATION
+# ───────────────────────────────────────────────────────────────────────────────
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+CACHE_FILE = BASE_DIR / "server-assets" / "persistent" / "airport_cache.json"       # compacted lookups
+JOURNAL_FILE = BASE_DIR / "server-assets" / "persistent" / "airport_cache.journal"  # lookups since, one JSON line each
+PRECACHE_FILE = BASE_DIR / "server-assets" / "airport_precache.json"                # shipped, ~4k Nominatim results
+DB_FILE = BASE_DIR / "server-assets" / "airport_db.json"  # offline airport database (dev-scripts/airports-precache/build_airport_db.py)
+COMPACT_AFTER = 50  # journal lines before they are folded into CACHE_FILE
+
+GRID_DEGREES = 2.0         # spatial index cell size
+EARTH_RADIUS_KM = 6371.0
+
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/search?q={code}+Airport&format=json&limit=1"
+USER_AGENT = "mihais-ai-playground/hackatron-demo"
+MAX_RETRIES = 5     # on 403 (rate limited), with exponential backoff
+INITIAL_DELAY = 2
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  IN-MEMORY INDEX
+# ───────────────────────────────────────────────────────────────────────────────
+
+_coords = None      # IATA code -> (lon, lat): precache, then our own lookups, then the airport database
+_learned = {}       # what CACHE_FILE + JOURNAL_FILE hold
+_airports = {}      # IATA code -> {"name", "iso", "size", "type", "closed"} from the airport database
+_spatial = None
+_journal_lines = 0
+_lock = threading.Lock()
+_pending = {}       # IATA code -> Task of an in-flight Nominatim lookup
+
+def _read_json(path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Warning: could not read airport cache {path}: {e}")
+        return {}
+
+def _read_journal():
+    entries = {}
+    try:
+        with open(JOURNAL_FILE, "r") as f:
+            for line in f:
+                try:
+                    code, lon, lat = json.loads(line)
+                    entries[code] = [lon, lat]
+                except ValueError:
+                    debug_log(f"Skipping damaged journal line: {line!r}")  # e.g. cut short by a crash
+    except FileNotFoundError:
+        pass
+    return entries
+
+def _compact():
+    """Fold the journal into CACHE_FILE (atomic replace), then empty the journal. Call with _lock held."""
+    global _journal_lines
+    os.makedirs(CACHE_FILE.parent, exist_ok=True)
+    tmp_path = CACHE_FILE.with_suffix(".json.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(_learned, f)
+    os.replace(tmp_path, CACHE_FILE)
+    open(JOURNAL_FILE, "w").close()
+    _journal_lines = 0
+    debug_log(f"Compacted airport cache ({len(_learned)} entries)")
+
+def load():
+    """Load the index once (precache, cache file, journal); later calls are free."""
+    global _coords
+    if _coords is not None:
+        return
+    with _lock:
+        if _coords is not None:
+            return
+        _learned.update(_read_json(CACHE_FILE))
+        journal = _read_journal()
+        _learned.update(journal)
+        coords = {code: tuple(v) for code, v in _read_json(PRECACHE_FILE).items()}
+        coords.update((code, tuple(v)) for code, v in _learned.items())
+        _load_db(coords)
+        if journal:
+            try:
+                _compact()
+            except OSError as e:
+                print(f"Warning: could not compact airport cache: {e}")
+        _coords = coords
+        debug_log(f"Airport index loaded: {len(coords)} airports ({len(_airports)} in the database, {len(_learned)} looked up)")
+
+def _load_db(coords):
+    """Overlay the offline database (it is more reliable than geocoding) and build the spatial index."""
+    global _spatial
+    db = _read_json(DB_FILE)
+    columns = db.get("columns", [])
+    rows = [dict(zip(columns, row)) for row in db.get("rows", [])]
+    located = []
+    for row in rows:
+        _airports[row["iata"]] = {key: row[key] for key in ("name", "iso", "size", "type", "closed")}
+        if row["lon"] is not None and row["lat"] is not None:
+            coords[row["iata"]] = (row["lon"], row["lat"])
+            located.append(row)
+        else:  # a closed airport without a position: don't trust a geocoded guess for it either
+            coords.pop(row["iata"], None)
+    _spatial = SpatialIndex(located)
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  SPATIAL INDEX
+# ───────────────────────────────────────────────────────────────────────────────
+
+def _haversine_km(lon, lat, lons, lats):
+    """Great-circle distance from one point to arrays of points, all in radians."""
+    a = np.sin((lats - lat) / 2) ** 2 + np.cos(lat) * np.cos(lats) * np.sin((lons - lon) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+class SpatialIndex:
+    """
+    Database airports bucketed into GRID_DEGREES x GRID_DEGREES cells, so a
+    radius query only measures distances to airports in the cells the circle
+    touches.
+    """
+
+    def __init__(self, rows):
+        self.codes = [row["iata"] for row in rows]
+        lons = np.array([row["lon"] for row in rows], dtype=np.float64)
+        lats = np.array([row["lat"] for row in rows], dtype=np.float64)
+        self.lons = np.radians(lons)
+        self.lats = np.radians(lats)
+        self.sizes = np.array([row["size"] or "" for row in rows])
+        self.open = ~np.array([bool(row["closed"]) for row in rows], dtype=bool)
+        self.n_rows = int(180 / GRID_DEGREES)
+        self.n_cols = int(360 / GRID_DEGREES)
+        cell_rows = np.clip(((lats + 90) // GRID_DEGREES).astype(int), 0, self.n_rows - 1)
+        cell_cols = ((lons + 180) // GRID_DEGREES).astype(int) % self.n_cols
+        cells = {}
+        for i, cell in enumerate(zip(cell_rows.tolist(), cell_cols.tolist())):
+            cells.setdefault(cell, []).append(i)
+        self.cells = {cell: np.array(ids, dtype=np.int32) for cell, ids in cells.items()}
+
+    def _candidates(self, lon, lat, km):
+        dlat = math.degrees(km / EARTH_RADIUS_KM)
+        low, high = lat - dlat, lat + dlat
+        first = max(int((low + 90) // GRID_DEGREES), 0)
+        last = min(int((high + 90) // GRID_DEGREES), self.n_rows - 1)
+        widest = max(abs(low), abs(high))
+        dlon = 180.0 if widest >= 90 else dlat / math.cos(math.radians(widest))
+        if dlon >= 180:
+            cols = range(self.n_cols)
+        else:
+            start = int((lon - dlon + 180) // GRID_DEGREES)
+            cols = [c % self.n_cols for c in range(start, int((lon + dlon + 180) // GRID_DEGREES) + 1)]
+        ids = [self.cells[cell] for row in range(first, last + 1) for cell in ((row, c) for c in cols) if cell in self.cells]
+        return np.concatenate(ids) if ids else np.zeros(0, dtype=np.int32)
+
+    def within(self, lon, lat, km, sizes=None, open_only=True):
+        """[(code, km)] of airports within km of (lon, lat), nearest first."""
+        ids = self._candidates(lon, lat, km)
+        if open_only:
+            ids = ids[self.open[ids]]
+        if sizes is not None:
+            ids = ids[np.isin(self.sizes[ids], list(sizes))]
+        dist = _haversine_km(math.radians(lon), math.radians(lat), self.lons[ids], self.lats[ids])
+        keep = dist <= km
+        ids, dist = ids[keep], dist[keep]
+        order = np.argsort(dist, kind="stable")
+        return [(self.codes[i], float(d)) for i, d in zip(ids[order].tolist(), dist[order].tolist())]
+
+    def nearest(self, lon, lat, sizes=None, max_km=math.pi * EARTH_RADIUS_KM, exclude=()):
+        """(code, km) of the closest matching airport, or None. Widens the search until one is found."""
+        km = min(100.0, max_km)
+        while True:
+            hits = [hit for hit in self.within(lon, lat, km, sizes) if hit[0] not in exclude]
+            if hits or km >= max_km:
+                return hits[0] if hits else None
+            km = min(km * 4, max_km)
+
+def _record(code, lon, lat):
+    """Remember a new lookup: in memory, then one appended journal line."""
+    global _journal_lines
+    _coords[code] = (lon, lat)
+    with _lock:
+        _learned[code] = [lon, lat]
+        try:
+            os.makedirs(JOURNAL_FILE.parent, exist_ok=True)
+            with open(JOURNAL_FILE, "a") as f:
+                f.write(json.dumps([code, lon, lat]) + "\n")
+            _journal_lines += 1
+            if _journal_lines >= COMPACT_AFTER:
+                _compact()
+        except OSError as e:
+            print(f"Warning: could not persist airport {code}: {e}")
+
+def get(code):
+    """(lon, lat) for an IATA code if it is known, without any I/O."""
+    load()
+    return _coords.get(code)
+
+def info(code):
+    """Database record ({"name", "iso", "size", "type", "closed"}) for an IATA code, or None."""
+    load()
+    return _airports.get(code)
+
+def airports_within(lon, lat, km, sizes=None):
+    """[(code, km)] of open database airports within km of (lon, lat), nearest first."""
+    load()
+    return _spatial.within(lon, lat, km, sizes)
+
+def nearest_airport(lon, lat, sizes=None, max_km=math.pi * EARTH_RADIUS_KM):
+    """(code, km) of the closest open database airport (of the given sizes), or None."""
+    load()
+    return _spatial.nearest(lon, lat, sizes, max_km)
+
+def repair_route(codes):
+    """
+    Check an AI-suggested route against the local data only (no geocoding).
+    Codes are normalised, closed and unknown airports are left out and
+    repeated stops collapsed. Returns (route, notes) with a note for every
+    change.
+    """
+    load()
+    route = []
+    notes = []
+    for raw in codes if isinstance(codes, list) else []:
+        code = str(raw).strip().upper()
+        record = _airports.get(code)
+        if record and record["closed"]:  # the database has no position for these
+            notes.append(f"{code} ({record['name']}) is closed and was left out of the route.")
+            continue
+        if code not in _coords:
+            notes.append(f"Unknown airport code {raw!r} was left out of the route.")
+            continue
+        if not route or route[-1] != code:
+            route.append(code)
+    return (route if len(route) >= 2 else []), notes
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  LOOKUPS
+# ───────────────────────────────────────────────────────────────────────────────
+
+async def _fetch(code, session):
+    """Query Nominatim, retrying with exponential backoff on 403."""
+    url = NOMINATIM_URL.format(code=code)
+    delay = INITIAL_DELAY
+    for attempt in range(MAX_RETRIES):
+        debug_log(f"Requesting {url}")
+        async with session.get(url, headers={"User-Agent": USER_AGENT}) as resp:
+            debug_log(f"Nominatim status: {resp.status}")
+            if resp.status != 403:
+                data = await resp.json(content_type=None)
+                break
+        if attempt == MAX_RETRIES - 1:
+            raise RuntimeError(f"Nominatim 403 Forbidden for {code} after {MAX_RETRIES} retries.")
+        debug_log(f"403 Forbidden; retrying after {delay} seconds...")
+        await asyncio.sleep(delay)
+        delay *= 2
+    if not data:
+        raise ValueError(f"Airport '{code}' not found by Nominatim.")
+    return float(data[0]["lon"]), float(data[0]["lat"])
+
+async def _fetch_and_record(code):
+    async with ai_client.session_scope() as session:
+        lon, lat = await _fetch(code, session)
+    _record(code, lon, lat)
+    return lon, lat
+
+def _forget_lookup(code, task):
+    if _pending.get(code) is task:
+        del _pending[code]
+    if not task.cancelled():
+        task.exception()  # retrieved even if every caller was cancelled
+
+async def lookup(code):
+    """
+    (lon, lat) for an IATA code. Known codes are a dict hit; unknown ones are
+    fetched from Nominatim once, however many callers ask at the same time.
+    The fetch runs as its own task and every caller awaits it shielded, so
+    cancelling one caller (a component unmounting) doesn't fail the others.
+    """
+    coords = get(code)
+    if coords is not None:
+        return coords
+    task = _pending.get(code)
+    if task is None:
+        task = _pending[code] = asyncio.ensure_future(_fetch_and_record(code))
+        task.add_done_callback(lambda t: _forget_lookup(code, t))
+    return await asyncio.shield(task)
+
+async def lookup_all(codes):
+    """(lon, lat) for each code, in order; only unknown codes cause network requests."""
+    load()
+    missing = [code for code in dict.fromkeys(codes) if code not in _coords]
+    if missing:
+        await asyncio.gather(*(lookup(code) for code in missing))
+    return [_coords[code] for code in codes]
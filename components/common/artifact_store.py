@@ -0,0 +1,281 @@
+import asyncio
+import heapq
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from components.common import task_runner
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  DEBUG LOGGER
+# ───────────────────────────────────────────────────────────────────────────────
+
+try:
+    from components.common.config import DEBUG_MODE, REACTPY_DEBUG_MODE
+    if REACTPY_DEBUG_MODE:
+        import reactpy
+        reactpy.config.REACTPY_DEBUG_MODE.current = True
+        print("[artifact_store.py DEBUG] REACTPY_DEBUG_MODE imported from config.py, using value:", REACTPY_DEBUG_MODE)
+    if DEBUG_MODE:
+        print("[artifact_store.py DEBUG] DEBUG_MODE imported from config.py, using value:", DEBUG_MODE)
+except ImportError:
+    DEBUG_MODE = False
+    print("Warning: DEBUG_MODE not imported from config.py, using default value False.")
+
+def debug_log(*args):
+    if DEBUG_MODE:
+        print("[artifact_store.py DEBUG]", *args)
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  CONFIGURATION
+# ───────────────────────────────────────────────────────────────────────────────
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+DB_PATH = BASE_DIR / "server-assets" / "persistent" / "artifacts.db"
+
+KINDS = {   # name -> (directory, seconds an artifact lives after its last access)
+    "tts": (BASE_DIR / "static" / "assets" / "tts_temp", 60 * 60),
+    "pdf": (BASE_DIR / "static" / "assets" / "pdf_temp", 60 * 60),
+    "route": (BASE_DIR / "server-assets" / "persistent" / "route_images", 7 * 24 * 60 * 60),
+    "route_temp": (BASE_DIR / "static" / "assets" / "flight_routes_temp", 60 * 60),  # no longer written; old maps expire
+}
+MAX_TOTAL_BYTES = 1024 * 1024 * 1024  # all kinds together; least recently used go first past this
+SWEEP_INTERVAL = 60                   # seconds between expiry sweeps (each costs O(expired))
+FLUSH_INTERVAL = 5                    # seconds between writes of queued index changes to the DB
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  INDEX (memory, mirrored to server-assets/persistent/artifacts.db)
+#
+#  register/touch/contains only change memory, so they are safe on the event
+#  loop. DB writes and file deletions are queued and done by flush(), which
+#  the background service runs in a thread.
+# ───────────────────────────────────────────────────────────────────────────────
+
+_items = None           # path -> {"kind", "size", "created", "accessed"}
+_expiry = []            # heap of (expires_at, path); stale entries are skipped when popped
+_lru = OrderedDict()    # path -> None, least recently accessed first
+_total_bytes = 0
+_touched = set()        # paths whose access time isn't in the DB yet
+_changes = {}           # path -> row to write, or None to delete the row and the file (queued for flush)
+_stats = {"registered": 0, "expired": 0, "evicted": 0, "missing": 0}
+_lock = threading.Lock()
+_sweeper = None
+
+def get_db():
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def _expires_at(item):
+    return item["accessed"] + KINDS[item["kind"]][1]
+
+def _add(path, item):
+    global _total_bytes
+    _items[path] = item
+    _lru[path] = None
+    _lru.move_to_end(path)
+    _total_bytes += item["size"]
+    heapq.heappush(_expiry, (_expires_at(item), path))
+
+def _adopt(conn):
+    """First run only: index the files already in the kind directories (the one directory listing ever made)."""
+    now = time.time()
+    for kind, (directory, _) in KINDS.items():
+        for root, _, files in os.walk(directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                mtime = min(st.st_mtime, now)
+                conn.execute(
+                    'INSERT OR IGNORE INTO artifacts (path, kind, size, created, accessed) VALUES (?, ?, ?, ?, ?)',
+                    (path, kind, st.st_size, mtime, mtime),
+                )
+
+def _load():
+    global _items
+    if _items is not None:
+        return
+    os.makedirs(DB_PATH.parent, exist_ok=True)
+    conn = get_db()
+    try:
+        fresh = conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'artifacts'").fetchone() is None
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS artifacts (
+                path TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL
+            )
+        ''')
+        if fresh:
+            _adopt(conn)
+        conn.commit()
+        rows = conn.execute('SELECT path, kind, size, created, accessed FROM artifacts ORDER BY accessed').fetchall()
+    finally:
+        conn.close()
+    _items = {}
+    for row in rows:
+        if row["kind"] in KINDS:
+            _add(row["path"], {"kind": row["kind"], "size": row["size"], "created": row["created"], "accessed": row["accessed"]})
+    debug_log(f"Loaded {len(_items)} artifacts ({_total_bytes / 1e6:.1f} MB)")
+
+def _drop(path):
+    global _total_bytes
+    item = _items.pop(path)
+    _lru.pop(path, None)
+    _touched.discard(path)
+    _total_bytes -= item["size"]
+
+def _forget(path):
+    """Drop path from the index and queue its deletion from the DB and disk (caller holds _lock)."""
+    _drop(path)
+    _changes[path] = None
+
+def _evict_over_quota():
+    while _total_bytes > MAX_TOTAL_BYTES and len(_lru) > 1:  # never the artifact just registered
+        _forget(next(iter(_lru)))
+        _stats["evicted"] += 1
+
+def _remove_file(path):
+    with _lock:
+        if path in _items:
+            return  # registered again since it was forgotten: the file is live
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            _stats["missing"] += 1
+        except OSError as e:
+            print(f"Warning: could not remove artifact {path}: {e}")
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  PUBLIC API
+# ───────────────────────────────────────────────────────────────────────────────
+
+def path_for(kind, filename):
+    """Where a producer should write a new artifact of this kind (the directory is created)."""
+    directory = KINDS[kind][0]
+    os.makedirs(directory, exist_ok=True)
+    return str(directory / filename)
+
+def register(path, kind):
+    """Start tracking a file a producer has finished writing; may evict others to stay under quota."""
+    path = os.path.abspath(path)
+    now = time.time()
+    size = os.path.getsize(path)
+    with _lock:
+        _load()
+        if path in _items:
+            _drop(path)  # rewritten in place
+        _add(path, {"kind": kind, "size": size, "created": now, "accessed": now})
+        _changes[path] = (path, kind, size, now, now)
+        _stats["registered"] += 1
+        _evict_over_quota()
+
+def touch(path):
+    """Record an access: the artifact's expiry moves forward and it becomes most recently used."""
+    path = os.path.abspath(path)
+    with _lock:
+        _load()
+        item = _items.get(path)
+        if item is None:
+            return
+        item["accessed"] = time.time()
+        _lru.move_to_end(path)
+        _touched.add(path)
+        heapq.heappush(_expiry, (_expires_at(item), path))
+
+def contains(path):
+    """Whether path is a live artifact (answered from memory, no filesystem access)."""
+    with _lock:
+        _load()
+        return os.path.abspath(path) in _items
+
+def flush():
+    """Write queued index changes to the DB and delete forgotten files (blocking: run it in a thread)."""
+    with _lock:
+        _load()
+        changes = list(_changes.items())
+        _changes.clear()
+        accessed = [(_items[path]["accessed"], path) for path in _touched if path in _items]
+        _touched.clear()
+    if not changes and not accessed:
+        return
+    conn = get_db()
+    try:
+        conn.executemany('DELETE FROM artifacts WHERE path = ?', [(path,) for path, row in changes if row is None])
+        conn.executemany(
+            'REPLACE INTO artifacts (path, kind, size, created, accessed) VALUES (?, ?, ?, ?, ?)',
+            [row for _, row in changes if row is not None],
+        )
+        conn.executemany('UPDATE artifacts SET accessed = ? WHERE path = ?', accessed)
+        conn.commit()
+    finally:
+        conn.close()
+    for path, row in changes:
+        if row is None:
+            _remove_file(path)
+
+def sweep(now=None):
+    """Delete expired artifacts and save pending changes. Cost is proportional to what expired."""
+    now = time.time() if now is None else now
+    removed = 0
+    with _lock:
+        _load()
+        while _expiry and _expiry[0][0] <= now:
+            expires_at, path = heapq.heappop(_expiry)
+            item = _items.get(path)
+            if item is None or _expires_at(item) != expires_at:
+                continue  # already gone, or touched since: a later heap entry covers it
+            _forget(path)
+            _stats["expired"] += 1
+            removed += 1
+        if len(_expiry) > 4 * len(_items) + 64:  # mostly stale entries from touches: rebuild
+            _expiry[:] = [(_expires_at(item), path) for path, item in _items.items()]
+            heapq.heapify(_expiry)
+    flush()
+    if removed:
+        print(f"Removed {removed} expired artifacts.")
+    return removed
+
+async def _maintain_forever():
+    next_sweep = 0
+    while True:
+        try:
+            if time.monotonic() >= next_sweep:
+                next_sweep = time.monotonic() + SWEEP_INTERVAL
+                await task_runner.run_blocking(sweep)
+            else:
+                await task_runner.run_blocking(flush)
+        except Exception as e:
+            print(f"Warning: artifact maintenance failed: {e}")
+        await asyncio.sleep(FLUSH_INTERVAL)
+
+async def start():
+    """Load the index in a thread, then sweep and flush it in the background (app startup)."""
+    global _sweeper
+    await task_runner.run_blocking(flush)  # loads the index; nothing is queued yet
+    if _sweeper is None or _sweeper.done():
+        _sweeper = task_runner.start_service(_maintain_forever(), name="artifact_store")
+
+def close():
+    """Write out whatever is still queued (app shutdown, after the producers have stopped)."""
+    if _items is not None:
+        flush()
+
+def stats():
+    with _lock:
+        loaded = _items is not None
+        return {
+            "artifacts": len(_items) if loaded else None,
+            "bytes": _total_bytes,
+            "max_bytes": MAX_TOTAL_BYTES,
+            "heap": len(_expiry),
+            "queued": len(_changes) + len(_touched),
+            **_stats,
+        }
@@ -0,0 +1,172 @@
+import re
+from reactpy import use_ref
+from components.common import ai_admission, ai_client, task_runner
+from components.common.text_chunker import estimate_tokens
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  DEBUG LOGGER
+# ───────────────────────────────────────────────────────────────────────────────
+
+try:
+    from components.common.config import DEBUG_MODE, REACTPY_DEBUG_MODE
+    if REACTPY_DEBUG_MODE:
+        import reactpy
+        reactpy.config.REACTPY_DEBUG_MODE.current = True
+        print("[chat_history.py DEBUG] REACTPY_DEBUG_MODE imported from config.py, using value:", REACTPY_DEBUG_MODE)
+    if DEBUG_MODE:
+        print("[chat_history.py DEBUG] DEBUG_MODE imported from config.py, using value:", DEBUG_MODE)
+except ImportError:
+    DEBUG_MODE = False
+    print("Warning: DEBUG_MODE not imported from config.py, using default value False.")
+
+def debug_log(*args):
+    if DEBUG_MODE:
+        print("[chat_history.py DEBUG]", *args)
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  CONFIGURATION
+# ───────────────────────────────────────────────────────────────────────────────
+
+KEEP_TURNS = 8               # most recent messages always sent verbatim
+MAX_HISTORY_TOKENS = 1500    # estimated budget for summary + history per request
+SUMMARY_MAX_TOKENS = 200     # length of the rolling summary
+
+SUMMARY_PROMPT = (
+    "You maintain a running summary of a chat between a user and an assistant. "
+    "Merge the previous summary with the new messages into one short summary. "
+    "Keep names, facts, preferences and open questions; drop small talk. "
+    "Write plain sentences, no lists, at most 120 words."
+)
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  HISTORY MANAGER
+# ───────────────────────────────────────────────────────────────────────────────
+
+class ChatHistory:
+    """
+    Builds the messages for one conversation turn from the component's chat list
+    of (speaker, message) pairs, where speaker "You" is the user.
+
+    The last KEEP_TURNS messages go in verbatim. Older ones are folded into a
+    rolling summary by a background AI call, so the turn that triggers it never
+    waits; until the summary catches up, the not-yet-summarized messages are sent
+    as long as they fit. The whole history is trimmed to MAX_HISTORY_TOKENS.
+    """
+
+    def __init__(self, keep_turns=KEEP_TURNS, max_tokens=MAX_HISTORY_TOKENS):
+        self.keep_turns = keep_turns
+        self.max_tokens = max_tokens
+        self.summary = ""
+        self.summarized = 0      # chat entries already folded into the summary
+        self._generation = 0     # bumped by reset() so stale refreshes are dropped
+        self._task = None
+
+    def reset(self):
+        self.summary = ""
+        self.summarized = 0
+        self._generation += 1
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    def messages(self, system_prompt, chat, new_message, session_key=None):
+        """Return the messages list for the next request; may start a summary refresh."""
+        entries = [
+            {"role": "user" if speaker == "You" else "assistant", "content": message}
+            for speaker, message in chat
+        ]
+        fold_upto = max(0, len(entries) - self.keep_turns)
+        if fold_upto > self.summarized:
+            self._refresh(entries[self.summarized:fold_upto], fold_upto, session_key)
+
+        head = [{"role": "system", "content": system_prompt}]
+        if self.summary:
+            head.append({"role": "system", "content": f"Summary of the earlier conversation: {self.summary}"})
+        history = entries[self.summarized:]
+        latest = {"role": "user", "content": new_message}
+
+        # Drop the oldest history until the estimate fits the budget
+        used = sum(estimate_tokens(m["content"]) for m in head[1:]) + estimate_tokens(new_message)
+        kept = []
+        for entry in reversed(history):
+            cost = estimate_tokens(entry["content"])
+            if used + cost > self.max_tokens:
+                break
+            kept.append(entry)
+            used += cost
+        kept.reverse()
+        if len(kept) < len(history):
+            debug_log(f"Trimmed {len(history) - len(kept)} old messages to stay within {self.max_tokens} tokens")
+        return head + kept + [latest]
+
+    def _refresh(self, new_entries, fold_upto, session_key):
+        if self._task is not None and not self._task.done():
+            return  # one refresh at a time; the next turn picks up the rest
+        generation = self._generation
+        previous = self.summary
+
+        async def run():
+            transcript = "\n".join(
+                f"{'User' if m['role'] == 'user' else 'Assistant'}: {m['content']}" for m in new_entries
+            )
+            try:
+                summary = await ai_client.complete(
+                    [
+                        {"role": "system", "content": SUMMARY_PROMPT},
+                        {"role": "user", "content": f"Previous summary: {previous or '(none)'}\n\nNew messages:\n{transcript}"}
+                    ],
+                    max_tokens=SUMMARY_MAX_TOKENS,
+                    timeout=40,
+                    priority=ai_admission.BACKGROUND,
+                    session_key=session_key,
+                )
+            except Exception as e:
+                debug_log("Summary refresh failed, keeping the old one:", e)
+                return
+            if generation == self._generation:
+                self.summary = summary.strip()
+                self.summarized = fold_upto
+                debug_log(f"Summary now covers {fold_upto} messages")
+
+        self._task = task_runner.spawn(run(), name="chat_summary")
+
+def use_chat_history(keep_turns=KEEP_TURNS, max_tokens=MAX_HISTORY_TOKENS):
+    """Hook returning the ChatHistory for this component instance."""
+    ref = use_ref(None)
+    if ref.current is None:
+        ref.current = ChatHistory(keep_turns, max_tokens)
+    return ref.current
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  CONTEXT EXCERPTS
+# ───────────────────────────────────────────────────────────────────────────────
+
+_WORD = re.compile(r"\w{3,}")
+
+def relevant_excerpt(text, query, max_chars):
+    """
+    Pick the paragraphs of `text` sharing the most words with `query`, up to
+    max_chars, in their original order. The first paragraph (the lead) is
+    always included since it usually defines the topic.
+    """
+    if len(text) <= max_chars:
+        return text
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n|\n(?==)", text) if p.strip()]
+    if not paragraphs:
+        return text[:max_chars]
+    query_words = {w.lower() for w in _WORD.findall(query)}
+
+    def score(idx):
+        words = [w.lower() for w in _WORD.findall(paragraphs[idx])]
+        if not words:
+            return 0.0
+        return sum(1 for w in words if w in query_words) / (len(words) ** 0.5)
+
+    chosen = {0}
+    used = len(paragraphs[0])
+    for idx in sorted(range(1, len(paragraphs)), key=score, reverse=True):
+        if used + len(paragraphs[idx]) > max_chars:
+            continue
+        chosen.add(idx)
+        used += len(paragraphs[idx])
+    return "\n\n".join(paragraphs[i] for i in sorted(chosen))[:max_chars]
@@ -0,0 +1,156 @@
+import asyncio
+import json
+import os
+import time
+import numpy as np
+from components.common import ai_client, pc_catalog, task_runner
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  DEBUG LOGGER
+# ───────────────────────────────────────────────────────────────────────────────
+
+try:
+    from components.common.config import DEBUG_MODE, REACTPY_DEBUG_MODE
+    if REACTPY_DEBUG_MODE:
+        import reactpy
+        reactpy.config.REACTPY_DEBUG_MODE.current = True
+        print("[exchange_rates.py DEBUG] REACTPY_DEBUG_MODE imported from config.py, using value:", REACTPY_DEBUG_MODE)
+    if DEBUG_MODE:
+        print("[exchange_rates.py DEBUG] DEBUG_MODE imported from config.py, using value:", DEBUG_MODE)
+except ImportError:
+    DEBUG_MODE = False
+    print("Warning: DEBUG_MODE not imported from config.py, using default value False.")
+
+def debug_log(*args):
+    if DEBUG_MODE:
+        print("[exchange_rates.py DEBUG]", *args)
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  CONFIGURATION
+# ───────────────────────────────────────────────────────────────────────────────
+
+RATES_URL = "https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@latest/v1/currencies/eur.json"
+SNAPSHOT_PATH = os.path.join(os.path.dirname(__file__), '../../server-assets/persistent/exchange_rates.json')
+REFRESH_INTERVAL = 6 * 3600   # the CDN publishes new rates daily
+RETRY_INTERVAL = 10 * 60      # after a failed refresh
+FETCH_TIMEOUT = 10
+FALLBACK_RATES = {"eur": 1.0, "usd": 1.09}  # only until the first snapshot or fetch succeeds
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  STATE (one table per process, rates are per 1 EUR)
+# ───────────────────────────────────────────────────────────────────────────────
+
+_rates = dict(FALLBACK_RATES)
+_state = {"source": "fallback", "updated_at": None, "version": 0, "failures": 0}
+_column_cache = {}  # (category, currency) -> (version, converted price column)
+_refresher = None
+
+def _install(rates, source, updated_at):
+    global _rates
+    rates = {code: float(rate) for code, rate in rates.items() if isinstance(rate, (int, float)) and rate > 0}
+    rates["eur"] = 1.0
+    _rates = rates
+    _state.update(source=source, updated_at=updated_at, version=_state["version"] + 1)
+    _column_cache.clear()
+    debug_log(f"Installed {len(rates)} rates from {source}")
+
+def _load_snapshot():
+    try:
+        with open(SNAPSHOT_PATH, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        _install(snapshot["rates"], "snapshot", snapshot.get("updated_at"))
+        return True
+    except FileNotFoundError:
+        return False
+    except Exception as e:
+        print(f"Warning: ignoring unreadable exchange rate snapshot: {e}")
+        return False
+
+def _save_snapshot(rates, updated_at):
+    os.makedirs(os.path.dirname(SNAPSHOT_PATH), exist_ok=True)
+    tmp_path = SNAPSHOT_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"updated_at": updated_at, "rates": rates}, f)
+    os.replace(tmp_path, SNAPSHOT_PATH)  # readers never see a half-written file
+
+async def refresh():
+    """Fetch the current table; on success it is served from memory and saved as the snapshot."""
+    try:
+        async with ai_client.session_scope() as session:
+            async with session.get(RATES_URL, timeout=FETCH_TIMEOUT) as resp:
+                if resp.status != 200:
+                    raise RuntimeError(f"rate service returned HTTP {resp.status}")
+                data = await resp.json(content_type=None)
+        rates = data.get("eur")
+        if not isinstance(rates, dict) or "usd" not in rates:
+            raise RuntimeError("rate service returned no EUR table")
+    except Exception as e:
+        _state["failures"] += 1
+        print(f"Warning: exchange rate refresh failed, keeping {_state['source']} rates: {e}")
+        return False
+    updated_at = time.time()
+    _install(rates, "live", updated_at)
+    _state["failures"] = 0
+    try:
+        await task_runner.run_blocking(_save_snapshot, _rates, updated_at)
+    except OSError as e:
+        print(f"Warning: could not save exchange rate snapshot: {e}")
+    return True
+
+async def _refresh_forever():
+    while True:
+        ok = await refresh()
+        await asyncio.sleep(REFRESH_INTERVAL if ok else RETRY_INTERVAL)
+
+def start():
+    """Serve the last snapshot right away and keep the rates fresh in the background (app startup)."""
+    global _refresher
+    _load_snapshot()
+    if _refresher is None or _refresher.done():
+        _refresher = task_runner.start_service(_refresh_forever(), name="exchange_rates")
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  CONVERSION
+# ───────────────────────────────────────────────────────────────────────────────
+
+def rate(currency):
+    """Units of currency per EUR, or None if unknown."""
+    return _rates.get(currency.lower())
+
+def convert(amount, from_currency, to_currency):
+    """
+    Convert a number or an array of numbers. Unknown currencies are passed
+    through unchanged, like the old per-session code did.
+    """
+    from_rate = rate(from_currency) or 1.0
+    to_rate = rate(to_currency) or 1.0
+    if isinstance(amount, np.ndarray):
+        return amount * (to_rate / from_rate)
+    return amount / from_rate * to_rate
+
+def to_eur(amount, from_currency):
+    return convert(amount, from_currency, "eur")
+
+def from_eur(amount_eur, to_currency):
+    return convert(amount_eur, "eur", to_currency)
+
+def catalog_prices(category, currency):
+    """
+    The whole USD price column of a catalog category in currency, rounded to
+    cents (NaN where unpriced). Converted once per rate update and shared.
+    """
+    key = (category, currency)
+    cached = _column_cache.get(key)
+    if cached is not None and cached[0] == _state["version"]:
+        return cached[1]
+    table = pc_catalog.get(category)
+    usd = table.column("price") if "price" in table.numeric else np.full(len(table), np.nan)
+    # Same two steps the UI always showed: USD -> EUR rounded, then EUR -> currency rounded
+    eur = np.round(convert(usd, "usd", "eur"), 2)
+    converted = eur if currency == "eur" else np.round(convert(eur, "eur", currency), 2)
+    converted.flags.writeable = False
+    _column_cache[key] = (_state["version"], converted)
+    return converted
+
+def status():
+    return {"currencies": len(_rates), **_state}
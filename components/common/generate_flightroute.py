@@ -1,15 +1,21 @@
 #!/usr/bin/env python3
 import os
-import json
 import asyncio
-import aiohttp
+import math
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import matplotlib
+matplotlib.use("Agg")  # headless; also what every render worker uses
+import matplotlib.image as mpimg
 import matplotlib.pyplot as plt
-import cartopy
+import numpy as np
 import cartopy.crs as ccrs
-import cartopy.feature as cfeature
-from cartopy.feature import NaturalEarthFeature
-from pyproj import Geod
+from matplotlib.transforms import Bbox
+from PIL import Image
 from pathlib import Path
+from components.common import airport_index, great_circle, map_features
 
 
 # ───────────────────────────────────────────────────────────────────────────────
@@ -33,122 +39,107 @@ def debug_log(*args):
         print("[generate_flightroute.py DEBUG]", *args)
 
 # ───────────────────────────────────────────────────────────────────────────────
-#  CONFIGURATION: set Cartopy data directory and force-download of NE assets
+#  CONFIGURATION (Natural Earth data is handled by components/common/map_features)
 # ───────────────────────────────────────────────────────────────────────────────
 
 # Use project-root-relative paths for assets
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
-CARTOPY_DATA_DIR = BASE_DIR / "server-assets" / "persistent" / "cartopy"
-AIRPORT_CACHE_FILE = BASE_DIR / "server-assets" / "persistent" / "airport_cache.json"
-AIRPORT_PRECACHE_FILE = BASE_DIR / "server-assets" / "airport_precache.json"
-OUTPUT_DIR = BASE_DIR / "static" / "assets" / "flight_routes_temp"
 
-# Ensure the directories exist
-os.makedirs(CARTOPY_DATA_DIR, exist_ok=True)
-os.makedirs(AIRPORT_CACHE_FILE.parent, exist_ok=True)
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+# ───────────────────────────────────────────────────────────────────────────────
+#  AIRPORT COORDINATES (components/common/airport_index)
+# ───────────────────────────────────────────────────────────────────────────────
 
-# Point Cartopy to use this directory
-cartopy.config["data_dir"] = str(CARTOPY_DATA_DIR)
+async def async_get_airport_coordinates(iata_code, session=None):
+    """
+    Returns (longitude, latitude) for the given IATA code from the shared
+    airport index; only codes it doesn't know yet are looked up on Nominatim.
+    session is accepted for old callers; the lookup uses the shared one.
+    """
+    return await airport_index.lookup(iata_code)
 
-# Force-download of Natural Earth features at multiple resolutions
-for scale in ("110m", "50m", "10m"):
-    _ = NaturalEarthFeature("physical", "land", scale)
-    _ = NaturalEarthFeature("physical", "ocean", scale)
-    _ = NaturalEarthFeature("physical", "coastline", scale)
+async def async_get_all_airport_coordinates(airport_codes):
+    """Async batch lookup for a list of IATA codes."""
+    return await airport_index.lookup_all(airport_codes)
 
 # ───────────────────────────────────────────────────────────────────────────────
-#  ASYNC AIRPORT COORDINATE CACHING
+#  RENDER POOL: matplotlib/Cartopy work runs in worker processes, off the event loop
 # ───────────────────────────────────────────────────────────────────────────────
 
-async def async_get_airport_coordinates(
-    iata_code,
-    cache_file=AIRPORT_CACHE_FILE,
-    session=None,
-    max_retries=5,
-    initial_delay=2
-):
+RENDER_WORKERS = 2                 # processes drawing maps in parallel
+MAX_PENDING_RENDERS = 8            # queued + running jobs before new ones are turned away
+RENDER_TIMEOUT = 90                # seconds per map before its worker is killed
+PRELOAD_SCALES = ("110m",)         # Natural Earth geometry each worker parses up front (finer scales on demand)
+
+_pool = None
+_pending_renders = 0
+_render_stats = {"completed": 0, "failed": 0, "timeouts": 0, "rejected": 0}
+
+def _init_worker():
+    """Runs once per render process: parse the world-scale shapes so most jobs only draw."""
+    map_features.preload(PRELOAD_SCALES)
+    debug_log(f"Render worker {os.getpid()} ready")
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=RENDER_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),  # forking a process with a running event loop is unsafe
+            initializer=_init_worker,
+        )
+    return _pool
+
+def _reset_pool(pool):
     """
-    Async version: Returns (longitude, latitude) for the given IATA code. Checks local
-    JSON cache; if not found, checks precache; if not found, queries Nominatim and stores the result in cache.
-    Retries with exponential backoff on 403 errors.
+    Throw away pool after a hung or crashed worker; the next job starts a fresh
+    one. A no-op if pool was already replaced, so a late failure from an old
+    pool can't kill the jobs running in its successor.
     """
-    # Load existing cache (or create an empty dict if file does not exist)
-    if os.path.exists(cache_file):
-        with open(cache_file, "r") as f:
-            cache = json.load(f)
-    else:
-        cache = {}
-
-    # If already cached, return it
-    if iata_code in cache:
-        lon, lat = cache[iata_code]
-        debug_log(f"Cache hit for {iata_code}: ({lon}, {lat})")
-        return (lon, lat)
-
-    # Try the precache file if not found in persistent cache
-    if os.path.exists(AIRPORT_PRECACHE_FILE):
-        with open(AIRPORT_PRECACHE_FILE, "r") as f:
-            precache = json.load(f)
-        if iata_code in precache:
-            lon, lat = precache[iata_code]
-            debug_log(f"Precache hit for {iata_code}: ({lon}, {lat})")
-            # Save to persistent cache for future fast access
-            cache[iata_code] = [lon, lat]
-            with open(cache_file, "w") as f:
-                json.dump(cache, f, indent=2)
-            return (lon, lat)
-
-    # Otherwise, query Nominatim
-    url = f"https://nominatim.openstreetmap.org/search?q={iata_code}+Airport&format=json&limit=1"
-    headers = {"User-Agent": "mihais-ai-playground/hackatron-demo"}
-    debug_log(f"Requesting {url}")
-    close_session = False
-    if session is None:
-        session = aiohttp.ClientSession()
-        close_session = True
-
-    retries = 0
-    delay = initial_delay
-    while retries < max_retries:
-        async with session.get(url, headers=headers) as resp:
-            debug_log(f"Nominatim status: {resp.status}")
-            if resp.status == 403:
-                if retries < max_retries - 1:
-                    debug_log(f"403 Forbidden; retrying after {delay} seconds...")
-                    await asyncio.sleep(delay)
-                    retries += 1
-                    delay *= 2
-                    continue
-                else:
-                    raise Exception(f"Nominatim 403 Forbidden for {iata_code}")
-            data = await resp.json()
-
-        if close_session:
-            await session.close()
-
-        if not data:
-            raise ValueError(f"Airport '{iata_code}' not found by Nominatim.")
-        lon, lat = float(data[0]["lon"]), float(data[0]["lat"])
-        cache[iata_code] = [lon, lat]
-        with open(cache_file, "w") as f:
-            json.dump(cache, f, indent=2)
-        debug_log(f"Cached {iata_code}: ({lon}, {lat})")
-        return (lon, lat)
-
-    raise Exception(f"Nominatim 403 Forbidden for {iata_code} after {max_retries} retries.")
-
-async def async_get_all_airport_coordinates(
-    airport_codes,
-    cache_file=AIRPORT_CACHE_FILE
-):
-    """Async batch lookup for a list of IATA codes."""
-    async with aiohttp.ClientSession() as session:
-        tasks = [
-            async_get_airport_coordinates(code, cache_file, session)
-            for code in airport_codes
-        ]
-        return await asyncio.gather(*tasks)
+    global _pool
+    if pool is None or _pool is not pool:
+        return
+    _pool = None
+    processes = list((getattr(pool, "_processes", None) or {}).values())  # the executor can't stop a busy worker itself
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+
+async def run_in_render_pool(fn, *args):
+    """Run fn(*args) in a render worker and await its result (RuntimeError when busy, slow or crashed)."""
+    global _pending_renders
+    if _pending_renders >= MAX_PENDING_RENDERS:
+        _render_stats["rejected"] += 1
+        raise RuntimeError("The map renderer is busy, please try again in a moment.")
+    _pending_renders += 1
+    pool = None
+    try:
+        pool = _get_pool()
+        result = await asyncio.wait_for(asyncio.wrap_future(pool.submit(fn, *args)), RENDER_TIMEOUT)
+        _render_stats["completed"] += 1
+        return result
+    except asyncio.TimeoutError:
+        _render_stats["timeouts"] += 1
+        _reset_pool(pool)
+        raise RuntimeError(f"Drawing the flight route took longer than {RENDER_TIMEOUT} seconds.")
+    except BrokenProcessPool:
+        _render_stats["failed"] += 1
+        _reset_pool(pool)
+        raise RuntimeError("The map renderer stopped unexpectedly, please try again.")
+    except Exception:
+        _render_stats["failed"] += 1
+        raise
+    finally:
+        _pending_renders -= 1
+
+def shutdown_render_pool():
+    """Stop the render workers (app shutdown)."""
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def render_metrics():
+    return {"workers": RENDER_WORKERS, "pending": _pending_renders, "running": _pool is not None, **_render_stats}
 
 # ───────────────────────────────────────────────────────────────────────────────
 #  MAIN FUNCTION: create_clean_route_map (async version)
@@ -159,48 +150,264 @@ async def create_clean_route_map(
     output_file="flight_route.png",
     extra_lon_margin=0.2,
     extra_lat_margin=0.1,
-    npts=50
+    npts=50,
+    width=None,
+    variants=(),
 ):
     """
     Async version: Draws great-circle flight routes between a sequence of IATA codes.
+    Coordinates are resolved here; the drawing itself runs in the render pool.
 
     Parameters
     ----------
     airport_codes : list of str
         List of IATA codes (e.g., ["OTP", "JFK", "LAX", "SFO"]).
-    output_file : str
-        Filename for the saved PNG (transparent background, bbox_inches="tight").
+    output_file : str or None
+        Filename for the saved map (transparent background, bbox_inches="tight").
+        The suffix picks the format: .png, .webp, .jpg (flattened on white) or
+        .svg (vector routes and labels over the basemap as an embedded image).
     extra_lon_margin : float
         Fractional padding in longitude around the minimal bounding box. E.g., 0.2 → 20%.
     extra_lat_margin : float
         Fractional padding in latitude around the minimal bounding box. E.g., 0.1 → 10%.
     npts : int
-        Number of intermediate points for each great-circle segment.
+        Most intermediate points per great-circle segment; fewer are used when
+        the leg is short enough to look smooth at the output resolution.
+    width : int or None
+        Pixel width of a raster output_file (downscaled, never enlarged).
+    variants : iterable of (filename, width)
+        More outputs of the same map, e.g. from route_variants(); everything
+        is written from a single render.
+
+    The map shows the bounding box plus margins snapped outward to
+    BASEMAP_STEP degrees, whose land/ocean/coastline layer is cached.
     """
+    outputs = [(str(path), size) for path, size in ([(output_file, width)] if output_file else []) + list(variants)]
+    for path, _ in outputs:
+        _output_format(path)  # reject unknown suffixes before any work is done
+
     # 1) Broadcast async fetch of all airport coordinates (with caching)
     coords = await async_get_all_airport_coordinates(airport_codes)
 
-    # 2) Collect all lons/lats seen (airports + intermediate points)
-    all_lons = []
-    all_lats = []
-    for lon, lat in coords:
-        all_lons.append(lon)
-        all_lats.append(lat)
+    # Steps 2-10 (drawing and saving) run in a worker process
+    await run_in_render_pool(
+        _render_route_map, coords, list(airport_codes), outputs, extra_lon_margin, extra_lat_margin, npts
+    )
+    print(f"Clean map saved to {', '.join(path for path, _ in outputs)}")
 
-    # 3) Initialize pyproj.Geod for great-circle calculations (WGS84 ellipsoid)
-    geod = Geod(ellps="WGS84")
+# ───────────────────────────────────────────────────────────────────────────────
+#  OUTPUT VARIANTS: one render, several encodes
+# ───────────────────────────────────────────────────────────────────────────────
 
-    # 4) Create a PlateCarree figure (we will set extent manually)
-    fig = plt.figure(figsize=(16, 12), facecolor="none")
-    ax = fig.add_subplot(1, 1, 1, projection=ccrs.PlateCarree())
+ROUTE_VARIANTS = {      # name -> (filename suffix, pixel width; None keeps the full render)
+    "svg": (".svg", None),              # web view, sharp at any zoom
+    "thumb": ("_320.webp", 320),
+    "web": ("_800.webp", 800),
+    "web2x": ("_1600.webp", 1600),
+    "print": ("_print.jpg", 2000),      # ~300 dpi across the PDF's 500 pt image box
+}
+WEBP_QUALITY = 80
+JPEG_QUALITY = 88
+SVG_IMAGE_DPI = 100     # resolution of the basemap embedded in SVG output (half the raster DPI)
+_FORMATS = {".png": "PNG", ".webp": "WEBP", ".jpg": "JPEG", ".jpeg": "JPEG", ".svg": "SVG"}
+
+def route_variants(base_path):
+    """{name: (filename, width)} for the standard outputs of one route map, named after base_path."""
+    return {name: (f"{base_path}{suffix}", size) for name, (suffix, size) in ROUTE_VARIANTS.items()}
+
+def _output_format(path):
+    fmt = _FORMATS.get(Path(path).suffix.lower())
+    if fmt is None:
+        raise ValueError(f"Unsupported route map format: {path} (use {', '.join(_FORMATS)})")
+    return fmt
+
+def _save_raster(image, path, width):
+    """Encode the composited RGBA map to path, downscaled to width if it is narrower than the render."""
+    picture = Image.fromarray(image, "RGBA")
+    if width and width < picture.width:
+        picture = picture.resize((width, max(1, round(picture.height * width / picture.width))), Image.LANCZOS)
+    fmt = _output_format(path)
+    if fmt == "JPEG":
+        flat = Image.new("RGB", picture.size, "white")  # the PDF page is white
+        flat.paste(picture, mask=picture.getchannel("A"))
+        flat.save(path, "JPEG", quality=JPEG_QUALITY, optimize=True)
+    elif fmt == "WEBP":
+        picture.save(path, "WEBP", quality=WEBP_QUALITY, method=4)
+    else:
+        picture.save(path, "PNG")
 
-    # 5) Remove the default map frame/spines
-    ax.spines["geo"].set_visible(False)
+def _add_basemap_image(fig, base):
+    """Put the basemap raster behind the overlay figure, for vector output."""
+    background = fig.add_axes([0, 0, 1, 1], zorder=-1)  # the raster spans the whole figure
+    background.imshow(base, aspect="auto", interpolation="antialiased")
+    background.set_axis_off()
 
-    # 6) Draw minimal land/ocean/coastline features for context
-    ax.add_feature(cfeature.LAND, facecolor="#f0f0f0", zorder=0)
-    ax.add_feature(cfeature.OCEAN, facecolor="#d0e5ff", zorder=0)
-    ax.add_feature(cfeature.COASTLINE, linewidth=0.7, zorder=0)
+def _save_svg(fig, path, box):
+    """Save the figure as SVG, cropped to box (top, bottom, left, right in render pixels)."""
+    top, bottom, left, right = box
+    height = FIGSIZE[1] * DPI
+    crop = Bbox.from_extents(left / DPI, (height - bottom) / DPI, right / DPI, (height - top) / DPI)
+    fig.savefig(path, format="svg", dpi=SVG_IMAGE_DPI, bbox_inches=crop)
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  BASEMAP CACHE: land/ocean/coastline rasters per quantized extent
+# ───────────────────────────────────────────────────────────────────────────────
+
+BASEMAP_DIR = BASE_DIR / "server-assets" / "persistent" / "basemaps"  # shared by all render workers
+BASEMAP_STEP = 5.0      # extents snap outward to this many degrees, so nearby routes share a basemap
+BASEMAP_MEMORY = 2      # decoded basemaps kept per worker (~30 MB each at FIGSIZE/DPI)
+BASEMAP_DISK_BYTES = 256 * 1024 * 1024  # BASEMAP_DIR cap; least recently used PNGs go first past this
+BASEMAP_STYLE = 2       # bump when the base layer styling changes
+FIGSIZE = (16, 12)
+DPI = 200
+SEGMENT_PX = 8          # target on-screen length of one straight piece of a route arc
+BOUNDS_STEP = 1.0       # degrees between arc points when only the bounding box is needed
+
+_basemaps = OrderedDict()   # key -> RGBA array, least recently used first
+
+def _quantize_extent(lon_min, lon_max, lat_min, lat_max):
+    step = BASEMAP_STEP
+    extent = []
+    for low, high, limit in ((lon_min, lon_max, 180.0), (lat_min, lat_max, 90.0)):
+        low = math.floor(low / step) * step
+        high = max(math.ceil(high / step) * step, low + step)  # a single airport still gets a map
+        extent += [max(low, -limit), min(high, limit)]
+    return extent
+
+def _new_map(extent):
+    """A transparent PlateCarree figure showing extent; base and overlay use identical geometry."""
+    fig = plt.figure(figsize=FIGSIZE, dpi=DPI, facecolor="none")
+    ax = fig.add_subplot(1, 1, 1, projection=ccrs.PlateCarree())
+    ax.spines["geo"].set_visible(False)
+    ax.set_facecolor("none")
+    ax.set_extent(extent, crs=ccrs.PlateCarree())
+    return fig, ax
+
+def _rasterize(fig, close=True):
+    fig.canvas.draw()
+    rgba = np.asarray(fig.canvas.buffer_rgba()).copy()
+    if close:
+        plt.close(fig)
+    return rgba
+
+def _touch_basemap(path):
+    """Mark a basemap file as just used (its mtime orders the disk LRU)."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+def _trim_basemaps(keep):
+    """Delete the least recently used basemap files until BASEMAP_DIR fits BASEMAP_DISK_BYTES."""
+    files = []
+    with os.scandir(BASEMAP_DIR) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".png") or ".tmp." in entry.name:
+                continue
+            try:
+                st = entry.stat()
+            except OSError:
+                continue  # another worker removed it
+            files.append((st.st_mtime, st.st_size, entry.path))
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= BASEMAP_DISK_BYTES:
+            break
+        if path == str(keep):
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total -= size
+        debug_log(f"Basemap {os.path.basename(path)} evicted from disk")
+
+def _basemap(extent):
+    """RGBA raster of the land/ocean/coastline layers for extent (memory, then disk, then drawn)."""
+    key = f"v{BASEMAP_STYLE}_{FIGSIZE[0]}x{FIGSIZE[1]}_{DPI}_" + "_".join(f"{v:g}" for v in extent)
+    path = BASEMAP_DIR / f"{key}.png"
+    rgba = _basemaps.get(key)
+    if rgba is not None:
+        _basemaps.move_to_end(key)
+        _touch_basemap(path)
+        return rgba
+    try:
+        rgba = (mpimg.imread(path) * 255).round().astype(np.uint8)
+        _touch_basemap(path)
+        debug_log(f"Basemap {key} read from disk")
+    except (OSError, ValueError):  # not drawn yet, or evicted by another worker
+        rgba = None
+    if rgba is None:
+        scale, features = map_features.features_for(extent)  # finer coastlines for regional maps
+        fig, ax = _new_map(extent)
+        ax.add_feature(features["land"], facecolor="#f0f0f0", edgecolor="face", zorder=0)
+        ax.add_feature(features["ocean"], facecolor="#d0e5ff", edgecolor="face", zorder=0)
+        ax.add_feature(features["coastline"], facecolor="none", edgecolor="black", linewidth=0.7, zorder=0)
+        rgba = _rasterize(fig)
+        os.makedirs(BASEMAP_DIR, exist_ok=True)
+        tmp_path = BASEMAP_DIR / f"{key}.{os.getpid()}.tmp.png"
+        mpimg.imsave(tmp_path, rgba)
+        os.replace(tmp_path, path)  # another worker may be writing the same key
+        debug_log(f"Basemap {key} drawn at {scale}")
+        _trim_basemaps(keep=path)  # only new files grow the directory
+    _basemaps[key] = rgba
+    while len(_basemaps) > BASEMAP_MEMORY:
+        _basemaps.popitem(last=False)
+    return rgba
+
+def _composite(overlay, base):
+    """Alpha-composite overlay over base (straight RGBA uint8)."""
+    out = base.copy()
+    ys, xs = np.nonzero(overlay[..., 3])  # the overlay is mostly empty: blend only what it covers
+    if ys.size:
+        top = overlay[ys, xs, 3:4].astype(np.float32) / 255
+        under = base[ys, xs].astype(np.float32)
+        bottom = under[:, 3:4] / 255
+        alpha = top + bottom * (1 - top)
+        rgb = (overlay[ys, xs, :3] * top + under[:, :3] * bottom * (1 - top)) / np.maximum(alpha, 1e-6)
+        out[ys, xs, :3] = rgb.round().astype(np.uint8)
+        out[ys, xs, 3] = (alpha[:, 0] * 255).round().astype(np.uint8)
+    return out
+
+def _visible_box(rgba):
+    """(top, bottom, left, right) of the non-transparent pixels: what bbox_inches="tight" keeps."""
+    rows = np.flatnonzero(rgba[..., 3].any(axis=1))
+    cols = np.flatnonzero(rgba[..., 3].any(axis=0))
+    if rows.size == 0:
+        return 0, rgba.shape[0], 0, rgba.shape[1]
+    return rows[0], rows[-1] + 1, cols[0], cols[-1] + 1
+
+def _render_route_map(coords, airport_codes, outputs, extra_lon_margin, extra_lat_margin, npts):
+    """
+    The matplotlib/Cartopy part of create_clean_route_map; runs in a render
+    worker. Only the routes, arrows, markers and labels are drawn per map, on
+    a transparent overlay composited onto the cached basemap. outputs is a
+    list of (filename, width), all encoded from this one drawing.
+    """
+    # 2) All legs in one vectorized pass, coarse: only the bounding box depends on it
+    lons = np.array([lon for lon, _ in coords])
+    lats = np.array([lat for _, lat in coords])
+    arc_lons, arc_lats, _ = great_circle.sample(lons, lats, BOUNDS_STEP)
+
+    # 3) Compute the bounding box of all points (airports + arcs) with separate lon/lat margins
+    all_lons = np.concatenate([lons, arc_lons])
+    all_lats = np.concatenate([lats, arc_lats])
+    min_lon, max_lon = all_lons.min(), all_lons.max()
+    min_lat, max_lat = all_lats.min(), all_lats.max()
+    pad_lon = (max_lon - min_lon) * extra_lon_margin
+    pad_lat = (max_lat - min_lat) * extra_lat_margin
+
+    # 4) Snap it outward to the basemap grid so nearby routes reuse the same base layer
+    extent = _quantize_extent(min_lon - pad_lon, max_lon + pad_lon, min_lat - pad_lat, max_lat + pad_lat)
+    base = _basemap(extent)
+
+    # 5) Resample the arcs so each straight piece is about SEGMENT_PX on screen
+    px_per_degree = min(FIGSIZE[0] * DPI / (extent[1] - extent[0]), FIGSIZE[1] * DPI / (extent[3] - extent[2]))
+    arc_lons, arc_lats, arc_legs = great_circle.sample(lons, lats, SEGMENT_PX / px_per_degree, max_segments=npts + 1)
+    segments = great_circle.legs(arc_lons, arc_lats, arc_legs)
+
+    # 6) Transparent overlay with the same figure geometry as the basemap
+    fig, ax = _new_map(extent)
 
     # 7) Prepare a color palette for multiple segments (highly differentiated)
     colors = [
@@ -221,37 +428,24 @@ async def create_clean_route_map(
         "#e6ab02",
     ]
 
-    # 8) For each consecutive airport pair, compute & plot the great-circle arc + arrow
-    for i in range(len(coords) - 1):
-        start_lon, start_lat = coords[i]
-        end_lon, end_lat = coords[i + 1]
-
-        # 8a) Generate intermediate points along the geodesic
-        intermediate = geod.npts(start_lon, start_lat, end_lon, end_lat, npts)
-
-        # Build lists of lons/lats including both endpoints
-        lons = [start_lon] + [pt[0] for pt in intermediate] + [end_lon]
-        lats = [start_lat] + [pt[1] for pt in intermediate] + [end_lat]
-
-        # 8b) Add these to the “all_lons/all_lats” for bounding-box calculations
-        all_lons.extend(lons)
-        all_lats.extend(lats)
-
-        # 8c) Plot the curved flight path (great-circle)
+    # 8) Plot each curved flight path (already in PlateCarree, so Cartopy does not
+    #    re-project it) with a small arrow at its midpoint
+    data_crs = ccrs.PlateCarree()
+    for i, (seg_lons, seg_lats) in enumerate(segments):
         ax.plot(
-            lons,
-            lats,
+            seg_lons,
+            seg_lats,
             color=colors[i % len(colors)],
             linewidth=3,
-            transform=ccrs.Geodetic(),
+            transform=data_crs,
             zorder=2,
         )
 
-        # 8d) Place a small arrow at the midpoint of that arc
-        mid_idx = len(lons) // 2
-        arrow_lon, arrow_lat = lons[mid_idx], lats[mid_idx]
-        next_idx = min(mid_idx + 1, len(lons) - 1)
-        target_lon, target_lat = lons[next_idx], lats[next_idx]
+        mid_idx = len(seg_lons) // 2
+        if np.isnan(seg_lons[mid_idx:mid_idx + 2]).any():  # the antimeridian break landed mid-leg
+            mid_idx = max(mid_idx - 2, 0)
+        arrow_lon, arrow_lat = seg_lons[mid_idx], seg_lats[mid_idx]
+        target_lon, target_lat = seg_lons[mid_idx + 1], seg_lats[mid_idx + 1]
 
         ax.annotate(
             "",
@@ -263,7 +457,7 @@ async def create_clean_route_map(
                 lw=2,
                 mutation_scale=15,
             ),
-            transform=ccrs.Geodetic(),
+            transform=data_crs,
             zorder=3,
         )
 
@@ -277,7 +471,7 @@ async def create_clean_route_map(
             color=colors[i % len(colors)],
             markeredgecolor="black",
             markeredgewidth=1,
-            transform=ccrs.Geodetic(),
+            transform=data_crs,
             zorder=4,
         )
         ax.text(
@@ -286,7 +480,7 @@ async def create_clean_route_map(
             airport_codes[i],
             fontsize=11,
             weight="bold",
-            transform=ccrs.Geodetic(),
+            transform=data_crs,
             bbox=dict(
                 facecolor="white",
                 alpha=0.8,
@@ -297,33 +491,23 @@ async def create_clean_route_map(
             zorder=5,
         )
 
-    # 10) Compute the bounding box of all points (with separate lon/lat margins)
-    min_lon = min(all_lons)
-    max_lon = max(all_lons)
-    min_lat = min(all_lats)
-    max_lat = max(all_lats)
-
-    lon_range = max_lon - min_lon
-    lat_range = max_lat - min_lat
-
-    # Expand by lon/lat margins on each side
-    pad_lon = lon_range * extra_lon_margin
-    pad_lat = lat_range * extra_lat_margin
-
-    lon_min_display = max(min_lon - pad_lon, -180)
-    lon_max_display = min(max_lon + pad_lon, 180)
-    lat_min_display = max(min_lat - pad_lat, -90)
-    lat_max_display = min(max_lat + pad_lat, 90)
-
-    ax.set_extent(
-        [lon_min_display, lon_max_display, lat_min_display, lat_max_display],
-        crs=ccrs.PlateCarree()
-    )
-
-    # 11) Save as a transparent PNG without extra whitespace
-    plt.savefig(output_file, transparent=True, bbox_inches="tight", pad_inches=0, dpi=200)
-    plt.close()
-    print(f"Clean map saved to {output_file}")
+    # 10) Composite onto the basemap, drop the empty border and encode every requested output
+    image = _composite(_rasterize(fig, close=False), base)
+    box = _visible_box(image)
+    top, bottom, left, right = box
+    image = image[top:bottom, left:right]
+    try:
+        with_basemap = False
+        for path, width in outputs:
+            if _output_format(path) == "SVG":
+                if not with_basemap:
+                    _add_basemap_image(fig, base)
+                    with_basemap = True
+                _save_svg(fig, path, box)
+            else:
+                _save_raster(image, path, width)
+    finally:
+        plt.close(fig)
 
 # ───────────────────────────────────────────────────────────────────────────────
 #  IMPORTABLE ENTRY POINT
@@ -339,6 +523,7 @@ async def main():
         extra_lat_margin=0.70,   # 70% padding in latitude (HEIGHT)
         npts=50
     )
+    shutdown_render_pool()
 
 if __name__ == "__main__":
     asyncio.run(main())
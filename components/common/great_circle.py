@@ -0,0 +1,70 @@
+import numpy as np
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  Great-circle routes in one vectorized pass (NumPy only).
+#
+#  Arcs are spherical (slerp between unit vectors), which differs from the
+#  WGS84 geodesic by well under a pixel on a world map. Points come back as
+#  PlateCarree (lon, lat) with NaN breaks where a leg crosses the
+#  antimeridian, so they can be plotted directly in the map's projection.
+# ───────────────────────────────────────────────────────────────────────────────
+
+MIN_SEGMENTS = 2        # per leg, so even a short hop is drawn as an arc
+MAX_SEGMENTS = 512
+COARSE_SEGMENTS = 16    # first pass, used to find how far a leg bends toward the pole
+MAX_STRETCH_LAT = 80.0  # PlateCarree stretches east-west by 1/cos(lat); cap it near the poles
+
+def _unit_vectors(lons, lats):
+    lon = np.radians(np.asarray(lons, dtype=np.float64))
+    lat = np.radians(np.asarray(lats, dtype=np.float64))
+    return np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=-1)
+
+def _slerp(starts, ends, angles, counts):
+    """Points along every leg: counts[i] segments (counts[i] + 1 points) for leg i, concatenated."""
+    leg = np.repeat(np.arange(len(counts)), counts + 1)
+    first = np.cumsum(counts + 1) - (counts + 1)
+    t = (np.arange(len(leg)) - first[leg]) / counts[leg]
+    omega = angles[leg][:, None]
+    t = t[:, None]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sin_omega = np.sin(omega)
+        a = np.where(sin_omega > 1e-12, np.sin((1 - t) * omega) / sin_omega, 1 - t)
+        b = np.where(sin_omega > 1e-12, np.sin(t * omega) / sin_omega, t)
+    points = a * starts[leg] + b * ends[leg]
+    lon = np.degrees(np.arctan2(points[:, 1], points[:, 0]))
+    lat = np.degrees(np.arcsin(np.clip(points[:, 2] / np.linalg.norm(points, axis=1), -1, 1)))
+    return lon, lat, leg
+
+def sample(lons, lats, step_deg, max_segments=MAX_SEGMENTS):
+    """
+    Great-circle points for the legs between consecutive (lons[i], lats[i]).
+
+    step_deg is the longest a segment may look on a PlateCarree map, in
+    degrees, so the point count follows leg length and output resolution.
+    Returns flat (lon, lat, leg) arrays; each leg starts and ends on its airports.
+    """
+    v = _unit_vectors(lons, lats)
+    if len(v) < 2:
+        empty = np.zeros(0)
+        return empty, empty, empty.astype(int)
+    starts, ends = v[:-1], v[1:]
+    cross = np.linalg.norm(np.cross(starts, ends), axis=1)
+    angles = np.arctan2(cross, np.einsum("ij,ij->i", starts, ends))
+    coarse = np.full(len(angles), COARSE_SEGMENTS)
+    _, lat, leg = _slerp(starts, ends, angles, coarse)
+    peak = np.zeros(len(angles))
+    np.maximum.at(peak, leg, np.abs(lat))
+    stretch = 1 / np.cos(np.radians(np.minimum(peak, MAX_STRETCH_LAT)))
+    counts = np.ceil(np.degrees(angles) * stretch / max(step_deg, 1e-6))
+    counts = np.clip(counts, MIN_SEGMENTS, max(max_segments, MIN_SEGMENTS)).astype(int)
+    return _slerp(starts, ends, angles, counts)
+
+def split_antimeridian(lon, lat):
+    """Insert NaNs where consecutive points jump across the ±180° seam, so lines break there."""
+    jumps = np.flatnonzero(np.abs(np.diff(lon)) > 180) + 1
+    return np.insert(lon, jumps, np.nan), np.insert(lat, jumps, np.nan)
+
+def legs(lon, lat, leg):
+    """Split flat sample() output into per-leg (lon, lat) arrays, ready to plot."""
+    bounds = np.flatnonzero(np.diff(leg)) + 1
+    return [split_antimeridian(x, y) for x, y in zip(np.split(lon, bounds), np.split(lat, bounds))]
@@ -0,0 +1,268 @@
+import re
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  DEBUG LOGGER
+# ───────────────────────────────────────────────────────────────────────────────
+
+try:
+    from components.common.config import DEBUG_MODE, REACTPY_DEBUG_MODE
+    if REACTPY_DEBUG_MODE:
+        import reactpy
+        reactpy.config.REACTPY_DEBUG_MODE.current = True
+        print("[json_stream.py DEBUG] REACTPY_DEBUG_MODE imported from config.py, using value:", REACTPY_DEBUG_MODE)
+    if DEBUG_MODE:
+        print("[json_stream.py DEBUG] DEBUG_MODE imported from config.py, using value:", DEBUG_MODE)
+except ImportError:
+    DEBUG_MODE = False
+    print("Warning: DEBUG_MODE not imported from config.py, using default value False.")
+
+def debug_log(*args):
+    if DEBUG_MODE:
+        print("[json_stream.py DEBUG]", *args)
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  TOKENS
+# ───────────────────────────────────────────────────────────────────────────────
+
+_ESCAPES = {
+    '"': '"', "'": "'", "\\": "\\", "/": "/",
+    "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t",
+}
+# JSON literals plus the Python spellings models like to use
+_LITERALS = {
+    "true": True, "false": False, "null": None,
+    "True": True, "False": False, "None": None,
+}
+_SEPARATORS = re.compile(r"[\s,:]+")  # commas and colons are optional, like whitespace
+_BARE_KEY_STOP = re.compile(r"[\s,:\]}\[{\"']")    # an unquoted key ends at its colon
+_BARE_VALUE_STOP = re.compile(r"[\n,\]}\[{\"']")  # a value may hold colons and spaces: 2:30, 9 am
+_STRING_STOP = {'"': re.compile(r'["\\]'), "'": re.compile(r"['\\]")}
+
+def _bare_value(token):
+    if token in _LITERALS:
+        return _LITERALS[token]
+    try:
+        return int(token)
+    except ValueError:
+        pass
+    try:
+        return float(token)
+    except ValueError:
+        return token  # unquoted word, keep it as a string
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  INCREMENTAL PARSER
+# ───────────────────────────────────────────────────────────────────────────────
+
+class IncrementalParser:
+    """
+    Tolerant JSON parser for model output, fed one chunk at a time.
+
+    Skips anything before the first '{' / '[' (prose, ```json fences) and
+    anything after the root closes. Accepts single-quoted strings, trailing
+    or missing commas, invalid backslash escapes (kept literally), raw
+    newlines in strings, unquoted words and Python True/False/None.
+
+    feed() returns the (path, value) pairs completed by that chunk, e.g.
+    (("daily_plan", 0), {...}) once the first day's object closes, so callers
+    can render array elements and object fields as they arrive.
+    """
+
+    def __init__(self, root=None):
+        self.root_chars = root or "{["
+        self.value = None        # the root container, filled in as parsing goes
+        self.complete = False    # True once the root container has closed
+        self._stack = []         # [container, pending_key, path] per open container
+        self._mode = "seek"      # seek | value | string | bare | done
+        self._chars = []         # current string / bare token
+        self._bare_stop = None   # _BARE_KEY_STOP or _BARE_VALUE_STOP for the current bare token
+        self._quote = None
+        self._escape = None      # None, "\\" after a backslash, or the \u hex digits so far
+
+    # ── public ────────────────────────────────────────────────────────────────
+
+    def feed(self, text):
+        events = []
+        i = 0
+        n = len(text)
+        while i < n and self._mode != "done":
+            mode = self._mode
+            if mode == "string":
+                i = self._feed_string(text, i, events)
+            elif mode == "bare":
+                match = self._bare_stop.search(text, i)
+                end = match.start() if match else n
+                self._chars.append(text[i:end])
+                i = end
+                if match:
+                    self._mode = "value"
+                    self._store("".join(self._chars), events, bare=True)
+            elif mode == "seek":
+                j = min((k for k in (text.find(c, i) for c in self.root_chars) if k != -1), default=-1)
+                if j == -1:
+                    return events
+                self._mode = "value"
+                self._open(text[j], events)
+                i = j + 1
+            else:
+                skip = _SEPARATORS.match(text, i)
+                if skip:
+                    i = skip.end()
+                    continue
+                ch = text[i]
+                i += 1
+                if ch == "{" or ch == "[":
+                    self._open(ch, events)
+                elif ch == "}" or ch == "]":
+                    self._close(events)
+                elif ch == '"' or ch == "'":
+                    self._mode = "string"
+                    self._quote = ch
+                    self._chars = []
+                else:
+                    self._mode = "bare"
+                    self._chars = [ch]
+                    self._bare_stop = _BARE_KEY_STOP if self._at_key() else _BARE_VALUE_STOP
+        return events
+
+    def close(self):
+        """Finish parsing and return the root value. Truncated output is closed off as-is."""
+        events = []
+        if self._mode == "string":
+            if self._escape == "\\":
+                self._chars.append("\\")
+            self._mode = "value"
+            self._store(self._join_string(), events)
+        elif self._mode == "bare":
+            self._mode = "value"
+            self._store("".join(self._chars), events, bare=True)
+        if self.value is None:
+            raise ValueError("No JSON object found in AI response")
+        if not self.complete:
+            debug_log("Closing truncated JSON, open containers:", len(self._stack))
+            while self._stack:
+                self._close(events)
+        return self.value
+
+    # ── internals ─────────────────────────────────────────────────────────────
+
+    def _feed_string(self, text, i, events):
+        n = len(text)
+        while i < n:
+            if self._escape is not None:
+                i = self._feed_escape(text, i)
+                continue
+            match = _STRING_STOP[self._quote].search(text, i)
+            if match is None:
+                self._chars.append(text[i:])
+                return n
+            j = match.start()
+            if j > i:
+                self._chars.append(text[i:j])
+            if text[j] == "\\":
+                self._escape = "\\"
+                i = j + 1
+                continue
+            self._mode = "value"
+            self._store(self._join_string(), events)
+            return j + 1
+        return i
+
+    def _feed_escape(self, text, i):
+        if self._escape == "\\":
+            ch = text[i]
+            if ch == "u":
+                self._escape = ""
+            else:
+                # Invalid escapes like "\," are kept literally instead of failing
+                self._chars.append(_ESCAPES.get(ch, "\\" + ch))
+                self._escape = None
+            return i + 1
+        while i < len(text) and len(self._escape) < 4:
+            self._escape += text[i]
+            i += 1
+        if len(self._escape) == 4:
+            try:
+                self._chars.append(chr(int(self._escape, 16)))
+            except ValueError:
+                self._chars.append("\\u" + self._escape)
+            self._escape = None
+        return i
+
+    def _join_string(self):
+        s = "".join(self._chars)
+        try:
+            return s.encode("utf-16", "surrogatepass").decode("utf-16")  # rejoin escaped surrogate pairs (emoji)
+        except UnicodeError:
+            return s
+
+    def _at_key(self):
+        return bool(self._stack) and isinstance(self._stack[-1][0], dict) and self._stack[-1][1] is None
+
+    def _slot(self):
+        """Key/index the next value goes into, and its path."""
+        container, key, path = self._stack[-1]
+        if isinstance(container, list):
+            key = len(container)
+        if path is None:
+            return container, key, None  # inside a discarded container
+        return container, key, path + (key,)
+
+    def _open(self, ch, events):
+        new = {} if ch == "{" else []
+        if not self._stack:
+            self.value = new
+            self._stack.append([new, None, ()])
+            return
+        container, key, path = self._slot()
+        if isinstance(container, dict) and key is None:
+            path = None  # a container where an object key belongs; parse it and throw it away
+        elif isinstance(container, dict):
+            container[key] = new
+            self._stack[-1][1] = None
+        else:
+            container.append(new)
+        self._stack.append([new, None, path])
+
+    def _close(self, events):
+        if not self._stack:
+            return
+        container, _, path = self._stack.pop()
+        if not self._stack:
+            self.complete = True
+            self._mode = "done"
+        if path is not None:
+            events.append((path, container))
+
+    def _store(self, raw, events, bare=False):
+        if bare:
+            raw = raw.rstrip()
+        value = _bare_value(raw) if bare else raw
+        if not self._stack:
+            return
+        container, key, path = self._slot()
+        if path is None:
+            return
+        if isinstance(container, dict) and key is None:
+            self._stack[-1][1] = value if isinstance(value, str) else str(raw)
+            return
+        if isinstance(container, dict):
+            container[key] = value
+            self._stack[-1][1] = None
+        else:
+            container.append(value)
+        events.append((path, value))
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  PUBLIC API
+# ───────────────────────────────────────────────────────────────────────────────
+
+def loads(text, root=None):
+    """
+    Parse the first JSON object/array in a complete AI response.
+    root: "{" or "[" to only accept that kind of top-level value.
+    Raises ValueError if there is none.
+    """
+    parser = IncrementalParser(root)
+    parser.feed(text)
+    return parser.close()
@@ -0,0 +1,124 @@
+import os
+from pathlib import Path
+import cartopy
+import cartopy.crs as ccrs
+import cartopy.feature as cfeature
+from cartopy.io import Downloader
+from cartopy.io import shapereader
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  DEBUG LOGGER
+# ───────────────────────────────────────────────────────────────────────────────
+
+try:
+    from components.common.config import DEBUG_MODE, REACTPY_DEBUG_MODE
+    if REACTPY_DEBUG_MODE:
+        import reactpy
+        reactpy.config.REACTPY_DEBUG_MODE.current = True
+        print("[map_features.py DEBUG] REACTPY_DEBUG_MODE imported from config.py, using value:", REACTPY_DEBUG_MODE)
+    if DEBUG_MODE:
+        print("[map_features.py DEBUG] DEBUG_MODE imported from config.py, using value:", DEBUG_MODE)
+except ImportError:
+    DEBUG_MODE = False
+    print("Warning: DEBUG_MODE not imported from config.py, using default value False.")
+
+def debug_log(*args):
+    if DEBUG_MODE:
+        print("[map_features.py DEBUG]", *args)
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  CONFIGURATION
+# ───────────────────────────────────────────────────────────────────────────────
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+BUNDLED_DATA_DIR = BASE_DIR / "server-assets" / "cartopy"                 # filled at image build time
+CARTOPY_DATA_DIR = BASE_DIR / "server-assets" / "persistent" / "cartopy"  # anything missing is downloaded here
+
+SCALES = ("110m", "50m", "10m")
+LAYERS = ("land", "ocean", "coastline")
+SCALE_SPANS = (("10m", 15.0), ("50m", 50.0))  # finest scale first, used while the extent's larger side is below it
+
+# Cartopy looks in the bundled directory first; the persistent volume is mounted
+# over server-assets/persistent at runtime, so build-time downloads can't go there.
+cartopy.config["pre_existing_data_dir"] = str(BUNDLED_DATA_DIR)
+cartopy.config["data_dir"] = str(CARTOPY_DATA_DIR)
+
+_features = {}  # (layer, scale) -> ShapelyFeature over the parsed geometries
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  FEATURES
+# ───────────────────────────────────────────────────────────────────────────────
+
+def scale_for_extent(extent):
+    """Natural Earth scale for a [lon_min, lon_max, lat_min, lat_max] map: 110m for the world, finer for regions."""
+    span = max(extent[1] - extent[0], extent[3] - extent[2])
+    for scale, limit in SCALE_SPANS:
+        if span < limit:
+            return scale
+    return "110m"
+
+def feature(layer, scale):
+    """A Cartopy feature for one Natural Earth physical layer; the shapefile is read on first use only."""
+    key = (layer, scale)
+    cached = _features.get(key)
+    if cached is None:
+        os.makedirs(CARTOPY_DATA_DIR, exist_ok=True)
+        geometries = list(shapereader.Reader(shapereader.natural_earth(scale, "physical", layer)).geometries())
+        cached = _features[key] = cfeature.ShapelyFeature(geometries, ccrs.PlateCarree())
+        debug_log(f"Loaded {layer} {scale}: {len(geometries)} shapes")
+    return cached
+
+def features_for(extent):
+    """(scale, {layer: feature}) for drawing a map of extent."""
+    scale = scale_for_extent(extent)
+    return scale, {layer: feature(layer, scale) for layer in LAYERS}
+
+def preload(scales):
+    """Parse every layer at these scales now (render worker start-up)."""
+    for scale in scales:
+        for layer in LAYERS:
+            feature(layer, scale)
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  PREFETCH (dev-scripts/prefetch_map_data.py)
+# ───────────────────────────────────────────────────────────────────────────────
+
+def _downloader(layer, scale):
+    spec = {"config": cartopy.config, "category": "physical", "name": layer, "resolution": scale}
+    return Downloader.from_config(("shapefiles", "natural_earth", scale, "physical", layer)), spec
+
+def local_path(layer, scale):
+    """Where the layer's shapefile already is (bundled or persistent), or None without downloading."""
+    downloader, spec = _downloader(layer, scale)
+    for path in (downloader.pre_downloaded_path(spec), downloader.target_path(spec)):
+        if path is not None and Path(path).exists():
+            return Path(path)
+    return None
+
+def prefetch(scales=SCALES, verify_only=False):
+    """
+    Make sure every layer at these scales is on disk and readable. Missing
+    files are downloaded into BUNDLED_DATA_DIR unless verify_only is set.
+    Returns a list of problems (empty when everything is usable).
+    """
+    problems = []
+    for scale in scales:
+        for layer in LAYERS:
+            path = local_path(layer, scale)
+            if path is None and not verify_only:
+                downloader, spec = _downloader(layer, scale)
+                bundled = dict(spec, config=dict(cartopy.config, data_dir=str(BUNDLED_DATA_DIR)))
+                try:
+                    path = Path(downloader.path(bundled))
+                except Exception as e:
+                    problems.append(f"{layer} {scale}: download failed: {e}")
+                    continue
+            if path is None:
+                problems.append(f"{layer} {scale}: missing")
+                continue
+            try:
+                if next(iter(shapereader.Reader(str(path)).geometries()), None) is None:
+                    problems.append(f"{layer} {scale}: {path} has no shapes")
+            except Exception as e:
+                problems.append(f"{layer} {scale}: {path} is unreadable: {e}")
+    return problems
@@ -0,0 +1,362 @@
+import hashlib
+import math
+import re
+import threading
+import numpy as np
+from components.common import pc_catalog
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  DEBUG LOGGER
+# ───────────────────────────────────────────────────────────────────────────────
+
+try:
+    from components.common.config import DEBUG_MODE, REACTPY_DEBUG_MODE
+    if REACTPY_DEBUG_MODE:
+        import reactpy
+        reactpy.config.REACTPY_DEBUG_MODE.current = True
+        print("[part_index.py DEBUG] REACTPY_DEBUG_MODE imported from config.py, using value:", REACTPY_DEBUG_MODE)
+    if DEBUG_MODE:
+        print("[part_index.py DEBUG] DEBUG_MODE imported from config.py, using value:", DEBUG_MODE)
+except ImportError:
+    DEBUG_MODE = False
+    print("Warning: DEBUG_MODE not imported from config.py, using default value False.")
+
+def debug_log(*args):
+    if DEBUG_MODE:
+        print("[part_index.py DEBUG]", *args)
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  CONFIGURATION
+# ───────────────────────────────────────────────────────────────────────────────
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+MODEL_BOOST = 1.5         # tokens with digits ("3060", "i7", "b650") identify the model
+BRAND_WEIGHT = 0.3        # a brand word found elsewhere in a name counts less ("NVIDIA" in a chipset)...
+BRAND_BOOST = 1.0         # ...than on parts whose name starts with it
+PRICED_BONUS = 0.5        # prefer parts with a known price when scores are close (build totals need it)
+COMMON_IDF = math.log(2)  # words in over half the parts ("gb", "ddr") are skipped when rarer ones exist
+MIN_COVERAGE = 0.5        # share of the query's weight the best part must match
+MIN_TYPO_SIMILARITY = 0.5 # trigram Jaccard needed to treat an unknown word as a typo
+
+# Words the AI uses that the datasets spell differently (only used if the word itself is unknown)
+ALIASES = {
+    "nvidia": ["geforce"],
+    "amd": ["radeon", "ryzen"],
+    "wd": ["western", "digital"],
+    "gskill": ["g", "skill"],
+}
+
+# Suffixes that make a different product ("3060" is not a "3060 Ti"); parts carrying one the
+# query didn't ask for rank below all parts that don't
+VARIANTS = {
+    "gpu": {"ti", "super", "xt", "xtx", "gre", "pro"},
+    "cpu": {"x", "x3d", "f", "k", "kf", "ks", "g", "t"},
+}
+VARIANT_PENALTY = 1000.0
+
+def _extra_text(table, i):
+    """Searchable text besides the name, e.g. the GPU chipset or RAM generation."""
+    category = table.category
+    if category == "gpu":
+        return table.value("chipset", i) or ""
+    if category == "ram":
+        gen, mhz = table.value("ddr_generation", i), table.value("speed_mhz", i)
+        count, gb = table.value("module_count", i), table.value("module_gb", i)
+        text = f"ddr{gen} {mhz}mhz" if gen and mhz else ""
+        return text + (f" {count * gb}gb {count}x{gb}gb" if count and gb else "")
+    if category == "storage":
+        gb = table.value("capacity", i)
+        if not gb:
+            return ""
+        return f"{gb}gb {gb // 1000}tb" if isinstance(gb, int) and gb % 1000 == 0 else f"{gb}gb"
+    if category == "psu":
+        watts = table.value("wattage", i)
+        return f"{watts}w {table.value('efficiency', i) or ''}" if watts else ""
+    return ""
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  TOKENIZING
+# ───────────────────────────────────────────────────────────────────────────────
+
+_WORD = re.compile(r"[a-z0-9]+")
+_ALNUM_PART = re.compile(r"[a-z]+|[0-9]+")
+
+def tokenize(text):
+    """Lower-case alphanumeric words; mixed ones like "rtx3060" also yield "rtx" and "3060"."""
+    tokens = []
+    for word in _WORD.findall(text.lower()):
+        tokens.append(word)
+        parts = _ALNUM_PART.findall(word)
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+def _is_model(token):
+    return any(c.isdigit() for c in token) and (len(token) >= 3 or not token.isdigit())
+
+def _trigrams(token):
+    padded = f" {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  INDEX
+# ───────────────────────────────────────────────────────────────────────────────
+
+def _name_hash(name):
+    return int.from_bytes(hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest(), "little")
+
+def _csr(keys, groups, dtype):
+    """Flatten {key: [values]} (keys in order) into (offsets, values) arrays."""
+    offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(groups.get(k, ())) for k in keys])
+    values = np.fromiter((v for k in keys for v in groups.get(k, ())), dtype=dtype, count=int(offsets[-1]))
+    return offsets, values
+
+class PartIndex:
+    """
+    BM25 index over one catalog category: token -> posting list of rows with a
+    precomputed per-row weight, plus character trigrams over the vocabulary so
+    misspelled words still find their token.
+
+    Everything lives in flat arrays (sorted vocabulary, CSR posting lists) so
+    the compiled catalog can store the index and map it back in without a build.
+    """
+
+    _ARRAYS = (
+        "tokens", "idf", "post_offsets", "post_rows", "post_weights", "brand_offsets", "brand_rows",
+        "variants", "priced", "grams", "gram_offsets", "gram_tids", "exact_hashes", "exact_rows",
+    )
+
+    def __init__(self, table):
+        self.table = table
+        n = len(table)
+        exact = {}
+        postings = {}
+        doc_tokens = []
+        for i, name in enumerate(table.lower_names):
+            exact.setdefault(name.strip(), i)
+            tokens = tokenize(name + " " + _extra_text(table, i))
+            doc_tokens.append(tokens)
+            counts = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, tf in counts.items():
+                postings.setdefault(token, []).append((i, tf))
+
+        vocab = sorted(postings)  # tid = position, looked up by binary search
+        tid_of = {token: tid for tid, token in enumerate(vocab)}
+        lengths = np.array([len(t) for t in doc_tokens], dtype=np.float32)
+        avg_len = float(lengths.mean()) if n else 1.0
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / max(avg_len, 1.0))
+        post_offsets, post_rows = _csr(vocab, {t: [i for i, _ in p] for t, p in postings.items()}, np.int32)
+        _, tf = _csr(vocab, {t: [tf for _, tf in p] for t, p in postings.items()}, np.float32)
+        df = np.diff(post_offsets)
+        idf = np.log(1 + (n - df + 0.5) / (df + 0.5)).astype(np.float32)
+
+        # Brand = first word of the name
+        brands = {}
+        for i, tokens in enumerate(doc_tokens):
+            if tokens:
+                brands.setdefault(tid_of[tokens[0]], []).append(i)
+        brand_offsets, brand_rows = _csr(range(len(vocab)), brands, np.int32)
+
+        trigrams = {}
+        for token, tid in tid_of.items():
+            if len(token) >= 3 and not token.isdigit():
+                for gram in _trigrams(token):
+                    trigrams.setdefault(gram, []).append(tid)
+        grams = sorted(trigrams)
+        gram_offsets, gram_tids = _csr(grams, trigrams, np.int32)
+
+        hashes = {}
+        for name, i in exact.items():
+            hashes.setdefault(_name_hash(name), i)
+        exact_hashes = np.array(sorted(hashes), dtype=np.uint64)
+
+        self._assign({
+            "tokens": np.array([t.encode("ascii") for t in vocab], dtype="S"),
+            "idf": idf,
+            "post_offsets": post_offsets,
+            "post_rows": post_rows,
+            # idf * BM25 term-frequency factor, per posting
+            "post_weights": (np.repeat(idf, np.diff(post_offsets)) * tf * (BM25_K1 + 1) / (tf + norm[post_rows])).astype(np.float32),
+            "brand_offsets": brand_offsets,
+            "brand_rows": brand_rows,
+            "variants": np.array([tid_of[v] for v in VARIANTS.get(table.category, ()) if v in tid_of], dtype=np.int32),
+            "priced": ~np.isnan(table.column("price")) if "price" in table.numeric else np.zeros(n, dtype=bool),
+            "grams": np.array([g.encode("ascii") for g in grams], dtype="S3"),
+            "gram_offsets": gram_offsets,
+            "gram_tids": gram_tids,
+            "exact_hashes": exact_hashes,
+            "exact_rows": np.array([hashes[h] for h in exact_hashes.tolist()], dtype=np.int32),
+        })
+
+    def _assign(self, arrays):
+        for name in self._ARRAYS:
+            setattr(self, name, arrays[name])
+
+    def to_arrays(self):
+        return {name: getattr(self, name) for name in self._ARRAYS}
+
+    @classmethod
+    def from_arrays(cls, table, arrays):
+        """An index over table from arrays stored in the compiled catalog."""
+        index = cls.__new__(cls)
+        index.table = table
+        index._assign(arrays)
+        return index
+
+    @staticmethod
+    def _find(sorted_array, key):
+        i = int(np.searchsorted(sorted_array, key))
+        return i if i < len(sorted_array) and sorted_array[i] == key else None
+
+    def _tid(self, token):
+        return self._find(self.tokens, token.encode("ascii"))
+
+    def _postings(self, tid):
+        start, end = self.post_offsets[tid], self.post_offsets[tid + 1]
+        return self.post_rows[start:end], self.post_weights[start:end]
+
+    def _brand(self, tid):
+        """Rows whose name starts with this token, or None if it is not a brand."""
+        start, end = self.brand_offsets[tid], self.brand_offsets[tid + 1]
+        return self.brand_rows[start:end] if end > start else None
+
+    def _exact(self, name):
+        i = self._find(self.exact_hashes, np.uint64(_name_hash(name)))
+        if i is None:
+            return None
+        row = int(self.exact_rows[i])
+        return row if self.table.names[row].lower().strip() == name else None
+
+    def _closest(self, token):
+        """Best vocabulary token for an unknown word, as (tid, similarity), or None."""
+        grams = _trigrams(token)
+        shared = {}
+        for gram in grams:
+            g = self._find(self.grams, gram.encode("ascii"))
+            if g is not None:
+                for tid in self.gram_tids[self.gram_offsets[g]:self.gram_offsets[g + 1]].tolist():
+                    shared[tid] = shared.get(tid, 0) + 1
+        best = None
+        for tid, count in shared.items():
+            similarity = count / (len(grams) + len(_trigrams(self.tokens[tid].decode("ascii"))) - count)
+            if similarity >= MIN_TYPO_SIMILARITY and (best is None or similarity > best[1]):
+                best = (tid, similarity)
+        return best
+
+    def _query_terms(self, name):
+        """(tid, weight, is_model) for each query word we can place in the vocabulary."""
+        terms = {}
+        unknown_model = False
+        for token in dict.fromkeys(tokenize(name)):
+            model = _is_model(token)
+            tid = self._tid(token)
+            if tid is not None:
+                candidates = [(tid, 1.0)]
+            elif token in ALIASES:
+                candidates = [(t, 1.0) for t in map(self._tid, ALIASES[token]) if t is not None]
+            elif len(token) >= 4 and not token.isdigit():
+                closest = self._closest(token)
+                candidates = [closest] if closest else []
+            else:
+                candidates = []
+            if not candidates and model:
+                unknown_model = True
+            for tid, similarity in candidates:
+                weight = similarity * (MODEL_BOOST if model else BRAND_WEIGHT if self._brand(tid) is not None else 1.0)
+                if weight > terms.get(tid, (0, False))[0]:
+                    terms[tid] = (weight, model)
+        return [(tid, w, m) for tid, (w, m) in terms.items()], unknown_model
+
+    def search(self, name, limit=5):
+        """Top matches as [(row, score)], best first."""
+        n = len(self.table)
+        if not isinstance(name, str) or not name.strip() or not n:
+            return []
+        exact = self._exact(name.strip().lower())
+        if exact is not None:
+            return [(exact, float("inf"))]
+        terms, unknown_model = self._query_terms(name)
+        terms = [t for t in terms if self.idf[t[0]] >= COMMON_IDF] or terms
+        if not terms:
+            return []
+        scores = np.zeros(n, dtype=np.float32)
+        covered = np.zeros(n, dtype=np.float32)
+        model_hit = np.zeros(n, dtype=bool)
+        total = 0.0
+        has_model = False
+        for tid, weight, model in terms:
+            rows, weights = self._postings(tid)
+            idf = self.idf[tid]
+            scores[rows] += weight * weights
+            covered[rows] += weight * idf
+            total += weight * idf
+            if model:
+                model_hit[rows] = True
+                has_model = True
+            brand_rows = self._brand(tid)
+            if brand_rows is not None:
+                scores[brand_rows] += BRAND_BOOST * idf
+        asked = {tid for tid, _, _ in terms}
+        for tid in self.variants.tolist():
+            if tid not in asked:
+                scores[self._postings(tid)[0]] -= VARIANT_PENALTY
+        # A named model number has to match, or "RTX 5090" would settle for any RTX card
+        eligible = covered >= MIN_COVERAGE * total
+        if has_model or unknown_model:
+            eligible &= model_hit
+        if not eligible.any():
+            return []
+        ranked = np.where(eligible, scores + PRICED_BONUS * self.priced, -np.inf)
+        limit = min(limit, int(eligible.sum()))
+        top = np.argpartition(-ranked, limit - 1)[:limit] if limit < n else np.arange(n)
+        # Stable sort so equal scores keep catalog order (roughly popularity)
+        top = sorted(top.tolist(), key=lambda i: (-ranked[i], i))[:limit]
+        return [(i, float(ranked[i])) for i in top]
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  PUBLIC API
+# ───────────────────────────────────────────────────────────────────────────────
+
+_indexes = {}
+_lock = threading.Lock()
+
+def get(category):
+    """The shared index for a catalog category, built on first use."""
+    index = _indexes.get(category)
+    if index is None:
+        with _lock:
+            index = _indexes.get(category)
+            if index is None:
+                table = pc_catalog.get(category)
+                packed = pc_catalog.compiled_section(category, "index")
+                if packed is not None:
+                    index = _indexes[category] = PartIndex.from_arrays(table, packed[1])
+                    debug_log(f"Mapped {category} name index, {len(index.tokens)} tokens")
+                else:
+                    index = _indexes[category] = PartIndex(table)
+                    debug_log(f"Indexed {len(index.table)} {category} parts, {len(index.tokens)} tokens")
+    return index
+
+def build_all():
+    """Load the catalog and build every index (startup, off the event loop)."""
+    for category in pc_catalog.CATEGORIES:
+        get(category)
+
+def is_ready():
+    return len(_indexes) == len(pc_catalog.CATEGORIES)
+
+def find_row(category, name):
+    """Row number of the best-scoring part for an AI-suggested name, or None."""
+    if category not in pc_catalog.CATEGORIES:
+        return None
+    hits = get(category).search(name, limit=1)
+    return hits[0][0] if hits else None
+
+def find(category, name):
+    """Best-scoring part for an AI-suggested name as a row dict, or None."""
+    row = find_row(category, name)
+    return None if row is None else pc_catalog.get(category).row(row)
@@ -0,0 +1,485 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+import numpy as np
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  DEBUG LOGGER
+# ───────────────────────────────────────────────────────────────────────────────
+
+try:
+    from components.common.config import DEBUG_MODE, REACTPY_DEBUG_MODE
+    if REACTPY_DEBUG_MODE:
+        import reactpy
+        reactpy.config.REACTPY_DEBUG_MODE.current = True
+        print("[pc_catalog.py DEBUG] REACTPY_DEBUG_MODE imported from config.py, using value:", REACTPY_DEBUG_MODE)
+    if DEBUG_MODE:
+        print("[pc_catalog.py DEBUG] DEBUG_MODE imported from config.py, using value:", DEBUG_MODE)
+except ImportError:
+    DEBUG_MODE = False
+    print("Warning: DEBUG_MODE not imported from config.py, using default value False.")
+
+def debug_log(*args):
+    if DEBUG_MODE:
+        print("[pc_catalog.py DEBUG]", *args)
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  CONFIGURATION
+# ───────────────────────────────────────────────────────────────────────────────
+
+DATA_PATH = "static/assets/pc_parts"
+COMPILED_PATH = "server-assets/pc_catalog.bin"  # built by dev-scripts/build_pc_catalog.py (and at startup if stale)
+FORMAT_VERSION = 1                              # bump when the binary layout changes
+
+CATEGORIES = {
+    "cpu": "cpu.json",
+    "gpu": "video-card.json",
+    "motherboard": "motherboard.json",
+    "ram": "memory.json",
+    "storage": "internal-hard-drive.json",
+    "psu": "power-supply.json",
+    "case": "case.json",
+}
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  COLUMNAR TABLE
+# ───────────────────────────────────────────────────────────────────────────────
+
+def _is_number(value):
+    return value is None or (isinstance(value, (int, float)) and not isinstance(value, bool))
+
+def _freeze(value):
+    return tuple(value) if isinstance(value, list) else value
+
+def _thaw(value):
+    return list(value) if isinstance(value, tuple) else value
+
+def _ram_columns(rows):
+    """Derived numeric RAM columns; speed is [ddr_gen, mhz] and modules [count, gb]."""
+    def pair(value, i):
+        if isinstance(value, list) and len(value) == 2:
+            return value[i]
+        return None
+    return {
+        "ddr_generation": [pair(r.get("speed"), 0) for r in rows],
+        "speed_mhz": [pair(r.get("speed"), 1) for r in rows],
+        "module_count": [pair(r.get("modules"), 0) for r in rows],
+        "module_gb": [pair(r.get("modules"), 1) for r in rows],
+    }
+
+_DERIVED = {"ram": _ram_columns}
+
+class PartTable:
+    """
+    One part category stored column by column. Numeric fields are float64
+    arrays (NaN for missing), everything else is dictionary-encoded: a tuple
+    of distinct interned values plus an array of small integer codes. Rows are
+    only turned back into dicts when asked for, and those are fresh copies, so
+    the table itself is never mutated and is shared by every session.
+    """
+
+    def __init__(self, category, rows):
+        self.category = category
+        self.fields = []           # original field order, used to rebuild rows
+        self.numeric = {}          # field -> float64 array
+        self.integral = set()      # numeric fields whose values were all ints
+        self.codes = {}            # field -> code array
+        self.levels = {}           # field -> tuple of distinct values
+        for row in rows:
+            for key in row:
+                if key not in self.fields:
+                    self.fields.append(key)
+        for field in self.fields:
+            self._add_column(field, [row.get(field) for row in rows])
+        for field, values in _DERIVED.get(category, lambda _: {})(rows).items():
+            self._add_column(field, values)
+        self._size = len(rows)
+        self.names = self.values("name") if "name" in self.levels else [""] * len(rows)
+        self._lower_names = None
+        for array in list(self.numeric.values()) + list(self.codes.values()):
+            array.flags.writeable = False
+
+    @property
+    def lower_names(self):
+        """Lower-cased names, only built when something needs them (the name index build)."""
+        if self._lower_names is None:
+            self._lower_names = [sys.intern(n.lower()) for n in self.names]
+        return self._lower_names
+
+    def _add_column(self, field, values):
+        if all(_is_number(v) for v in values):
+            self.numeric[field] = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+            if all(v is None or isinstance(v, int) for v in values):
+                self.integral.add(field)
+            return
+        index = {}
+        levels = []
+        codes = []
+        for value in values:
+            value = _freeze(value)
+            key = (type(value), value)  # keeps True / 1 / 1.0 apart
+            code = index.get(key)
+            if code is None:
+                code = index[key] = len(levels)
+                levels.append(sys.intern(value) if isinstance(value, str) else value)
+            codes.append(code)
+        dtype = np.uint16 if len(levels) < 2 ** 16 else np.uint32
+        self.codes[field] = np.array(codes, dtype=dtype)
+        self.levels[field] = tuple(levels)
+
+    def __len__(self):
+        return self._size
+
+    def column(self, field):
+        """Numeric column as a read-only float64 array (NaN = missing)."""
+        return self.numeric[field]
+
+    def values(self, field):
+        """All values of a field as a Python list."""
+        if field in self.numeric:
+            return [self.value(field, i) for i in range(self._size)]
+        levels = self.levels[field]
+        return [_thaw(levels[c]) for c in self.codes[field].tolist()]
+
+    def value(self, field, i):
+        if field in self.numeric:
+            v = self.numeric[field][i]
+            if np.isnan(v):
+                return None
+            return int(v) if field in self.integral or float(v).is_integer() else float(v)
+        if field in self.codes:
+            return _thaw(self.levels[field][self.codes[field][i]])
+        return None
+
+    def row(self, i):
+        """Row i as a new dict with the original JSON fields."""
+        return {field: self.value(field, i) for field in self.fields}
+
+    def head(self, n):
+        return [self.row(i) for i in range(min(n, self._size))]
+
+    def nbytes(self):
+        """Approximate memory held by this table."""
+        total = sum(a.nbytes for a in self.numeric.values()) + sum(a.nbytes for a in self.codes.values())
+        for level in self.levels.values():
+            if isinstance(level, StringTable):
+                total += level.nbytes()
+            else:
+                total += sys.getsizeof(level) + sum(sys.getsizeof(v) for v in level)
+        if self._lower_names is not None:
+            total += sys.getsizeof(self._lower_names) + sum(sys.getsizeof(n) for n in self._lower_names)
+        return total
+
+    def to_arrays(self):
+        """(meta, arrays) for the compiled catalog; string levels go into packed string tables."""
+        arrays = {}
+        levels = {}
+        for field, values in self.levels.items():
+            strings = [v for v in values if v is not None]
+            if all(isinstance(v, str) for v in strings):
+                arrays[f"levels/{field}/blob"], arrays[f"levels/{field}/offsets"] = StringTable.pack(
+                    ["" if v is None else v for v in values])
+                levels[field] = {"strings": True, "none": values.index(None) if None in values else -1}
+            else:
+                levels[field] = {"strings": False, "values": [_thaw(v) for v in values]}
+        for field, array in self.numeric.items():
+            arrays[f"numeric/{field}"] = array
+        for field, array in self.codes.items():
+            arrays[f"codes/{field}"] = array
+        meta = {
+            "size": self._size,
+            "fields": self.fields,
+            "integral": sorted(self.integral),
+            "numeric": list(self.numeric),
+            "levels": levels,
+        }
+        return meta, arrays
+
+    @classmethod
+    def from_arrays(cls, category, meta, arrays):
+        """A table backed by arrays from the compiled catalog (normally memory-mapped)."""
+        table = cls.__new__(cls)
+        table.category = category
+        table.fields = meta["fields"]
+        table.integral = set(meta["integral"])
+        table.numeric = {field: arrays[f"numeric/{field}"] for field in meta["numeric"]}
+        table.codes = {}
+        table.levels = {}
+        for field, info in meta["levels"].items():
+            table.codes[field] = arrays[f"codes/{field}"]
+            if info["strings"]:
+                table.levels[field] = StringTable(arrays[f"levels/{field}/blob"], arrays[f"levels/{field}/offsets"], info["none"])
+            else:
+                table.levels[field] = tuple(_freeze(v) for v in info["values"])
+        table._size = meta["size"]
+        table.names = _Lookup(table.levels["name"], table.codes["name"]) if "name" in table.levels else [""] * table._size
+        table._lower_names = None
+        return table
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  PACKED STRINGS
+# ───────────────────────────────────────────────────────────────────────────────
+
+class StringTable:
+    """
+    Read-only sequence of strings stored as one UTF-8 buffer plus offsets, so
+    it can live in a memory map; entries are decoded on first access.
+    """
+
+    def __init__(self, blob, offsets, none_at=-1):
+        self.blob = blob
+        self.offsets = offsets
+        self.none_at = none_at
+        self._decoded = [None] * (len(offsets) - 1)
+
+    @staticmethod
+    def pack(strings):
+        encoded = [s.encode("utf-8") for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.uint32)
+        offsets[1:] = np.cumsum([len(b) for b in encoded], dtype=np.uint64)
+        return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+    def __len__(self):
+        return len(self._decoded)
+
+    def __getitem__(self, i):
+        i = int(i)
+        if i == self.none_at:
+            return None
+        value = self._decoded[i]
+        if value is None:
+            value = self._decoded[i] = self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes().decode("utf-8")
+        return value
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def __contains__(self, value):
+        return any(v == value for v in self)
+
+    def nbytes(self):
+        return self.blob.nbytes + self.offsets.nbytes
+
+class _Lookup:
+    """Row-ordered view of a dictionary-encoded column (levels[codes[i]])."""
+
+    def __init__(self, levels, codes):
+        self.levels = levels
+        self.codes = codes
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, i):
+        return self.levels[self.codes[i]]
+
+    def __iter__(self):
+        levels = self.levels
+        return (levels[c] for c in self.codes.tolist())
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  PROCESS-WIDE CATALOG
+# ───────────────────────────────────────────────────────────────────────────────
+
+_tables = {}
+_lock = threading.Lock()
+EMPTY = PartTable("empty", [])
+
+def _read_rows(category):
+    path = os.path.join(DATA_PATH, CATEGORIES[category])
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Warning: could not load PC part dataset {path}: {e}")
+        return []
+
+def _load(category):
+    packed = compiled_section(category, "table")
+    if packed is not None:
+        table = PartTable.from_arrays(category, *packed)
+        debug_log(f"Mapped {len(table)} {category} parts from {COMPILED_PATH}")
+        return table
+    table = PartTable(category, _read_rows(category))
+    debug_log(f"Loaded {len(table)} {category} parts ({table.nbytes() / 1e6:.1f} MB)")
+    return table
+
+def get(category):
+    """The shared table for a category, loaded on first use. Unknown categories give an empty table."""
+    if category not in CATEGORIES:
+        return EMPTY
+    table = _tables.get(category)
+    if table is None:
+        with _lock:
+            table = _tables.get(category)
+            if table is None:
+                table = _tables[category] = _load(category)
+    return table
+
+def load_all():
+    """Load every category (called once at startup, off the event loop)."""
+    for category in CATEGORIES:
+        get(category)
+
+def is_loaded():
+    return len(_tables) == len(CATEGORIES)
+
+def stats():
+    return {
+        category: {"parts": len(table), "bytes": table.nbytes()}
+        for category, table in _tables.items()
+    }
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  COMPILED CATALOG
+#
+#  One file holding every category's columns, packed string tables and name
+#  index as aligned raw arrays behind a small JSON header. Loading it is a
+#  memory map: no JSON parsing, and the pages are shared between processes.
+#  The header records the JSON it was built from, so a changed dataset makes
+#  it stale and we fall back to the JSON until it is rebuilt.
+# ───────────────────────────────────────────────────────────────────────────────
+
+_MAGIC = b"PCCATLG\0"
+_ALIGN = 64
+_UNSET = object()
+_pack = _UNSET             # (header, arrays), None if missing or stale
+_pack_lock = threading.Lock()
+
+def _align(n):
+    return -(-n // _ALIGN) * _ALIGN
+
+def source_fingerprint():
+    """{file: [size, mtime_ns]} of the JSON datasets (cheap staleness check)."""
+    fingerprint = {}
+    for filename in CATEGORIES.values():
+        try:
+            st = os.stat(os.path.join(DATA_PATH, filename))
+            fingerprint[filename] = [st.st_size, st.st_mtime_ns]
+        except OSError:
+            fingerprint[filename] = [-1, 0]
+    return fingerprint
+
+def source_hash():
+    """SHA-256 over the JSON datasets; decides whether the compiled catalog is current."""
+    digest = hashlib.sha256()
+    for filename in CATEGORIES.values():
+        digest.update(filename.encode() + b"\0")
+        try:
+            with open(os.path.join(DATA_PATH, filename), "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+        except OSError:
+            digest.update(b"<missing>")
+    return digest.hexdigest()
+
+def _write_pack(path, header, arrays):
+    directory = {}
+    offset = 0
+    for name, array in arrays.items():
+        directory[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += _align(array.nbytes)
+    header = dict(header, arrays=directory)
+    encoded = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    data_start = _align(len(_MAGIC) + 8 + len(encoded))
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_MAGIC + len(encoded).to_bytes(8, "little") + encoded)
+        f.write(b"\0" * (data_start - f.tell()))
+        for array in arrays.values():
+            data = np.ascontiguousarray(array).tobytes()
+            f.write(data + b"\0" * (_align(len(data)) - len(data)))
+    os.replace(tmp_path, path)  # a running process keeps its mapping of the old file
+
+def _read_pack(path):
+    with open(path, "rb") as f:
+        if f.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f"{path} is not a compiled PC catalog")
+        length = int.from_bytes(f.read(8), "little")
+        header = json.loads(f.read(length))
+    data_start = _align(len(_MAGIC) + 8 + length)
+    buffer = np.memmap(path, dtype=np.uint8, mode="r")
+    arrays = {
+        name: np.ndarray(tuple(info["shape"]), dtype=np.dtype(info["dtype"]), buffer=buffer, offset=data_start + info["offset"])
+        for name, info in header["arrays"].items()
+    }
+    return header, arrays
+
+def _is_current(header):
+    if header.get("format") != FORMAT_VERSION or set(header.get("categories", ())) != set(CATEGORIES):
+        return False
+    # Same sizes and mtimes: trust it; otherwise (e.g. fresh checkout) compare contents
+    return header.get("sources") == source_fingerprint() or header.get("source_hash") == source_hash()
+
+def _compiled():
+    global _pack
+    if _pack is _UNSET:
+        with _pack_lock:
+            if _pack is _UNSET:
+                pack = None
+                if os.path.exists(COMPILED_PATH):
+                    try:
+                        header, arrays = _read_pack(COMPILED_PATH)
+                        if _is_current(header):
+                            pack = (header, arrays)
+                        else:
+                            print(f"Warning: {COMPILED_PATH} is out of date, loading the PC part JSON instead")
+                    except Exception as e:
+                        print(f"Warning: could not read compiled PC catalog {COMPILED_PATH}: {e}")
+                _pack = pack
+    return _pack
+
+def compiled_section(category, section):
+    """(meta, arrays) of a category's "table" or "index" section, or None without a current compiled catalog."""
+    pack = _compiled()
+    if pack is None:
+        return None
+    header, arrays = pack
+    prefix = f"{category}/{section}/"
+    return header["categories"][category][section], {
+        name[len(prefix):]: array for name, array in arrays.items() if name.startswith(prefix)
+    }
+
+def build_compiled(path=None):
+    """Build the compiled catalog (tables and name indexes) from the JSON datasets."""
+    global _pack
+    path = path or COMPILED_PATH
+    from components.common import part_index  # it imports this module
+    header = {
+        "format": FORMAT_VERSION,
+        "source_hash": source_hash(),
+        "sources": source_fingerprint(),
+        "categories": {},
+    }
+    arrays = {}
+    for category in CATEGORIES:
+        table = PartTable(category, _read_rows(category))
+        meta, table_arrays = table.to_arrays()
+        index_arrays = part_index.PartIndex(table).to_arrays()
+        header["categories"][category] = {"table": meta, "index": {}}
+        arrays.update({f"{category}/table/{name}": a for name, a in table_arrays.items()})
+        arrays.update({f"{category}/index/{name}": a for name, a in index_arrays.items()})
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    _write_pack(path, header, arrays)
+    if path == COMPILED_PATH:
+        with _pack_lock:
+            _pack = _UNSET
+    debug_log(f"Compiled PC catalog to {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+    return path
+
+def is_compiled():
+    """True if a compiled catalog matching the current JSON is available."""
+    return _compiled() is not None
+
+def ensure_compiled():
+    """Rebuild the compiled catalog if it is missing or stale. Returns True if it was rebuilt."""
+    if is_compiled():
+        return False
+    try:
+        build_compiled()
+    except OSError as e:
+        print(f"Warning: could not write compiled PC catalog, using the JSON datasets: {e}")
+        return False
+    return True
@@ -0,0 +1,439 @@
+import re
+import threading
+import numpy as np
+from components.common import part_index, pc_catalog
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  DEBUG LOGGER
+# ───────────────────────────────────────────────────────────────────────────────
+
+try:
+    from components.common.config import DEBUG_MODE, REACTPY_DEBUG_MODE
+    if REACTPY_DEBUG_MODE:
+        import reactpy
+        reactpy.config.REACTPY_DEBUG_MODE.current = True
+        print("[pc_solver.py DEBUG] REACTPY_DEBUG_MODE imported from config.py, using value:", REACTPY_DEBUG_MODE)
+    if DEBUG_MODE:
+        print("[pc_solver.py DEBUG] DEBUG_MODE imported from config.py, using value:", DEBUG_MODE)
+except ImportError:
+    DEBUG_MODE = False
+    print("Warning: DEBUG_MODE not imported from config.py, using default value False.")
+
+def debug_log(*args):
+    if DEBUG_MODE:
+        print("[pc_solver.py DEBUG]", *args)
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  CONFIGURATION
+# ───────────────────────────────────────────────────────────────────────────────
+
+# Each part is checked against the ones before it, so this is also the repair order
+PART_ORDER = ["cpu", "motherboard", "ram", "gpu", "storage", "psu", "case"]
+
+BASE_SYSTEM_WATTS = 80      # board, RAM, drives and fans
+PSU_HEADROOM = 1.3          # recommended PSU = estimated draw * headroom
+BUDGET_SLACK = 1.05         # builds up to 5% over budget are left alone
+MODERN_SOCKETS = {"AM5", "AM4", "LGA1700", "LGA1851", "LGA1200"}  # sockets the solver picks CPUs from
+POPULAR_POOL = 40           # value picks come from the N most popular fitting parts (datasets are popularity-ordered)
+SUPPORT_PARTS = ["motherboard", "ram", "storage", "psu", "case"]
+
+# Share of the budget the performance parts may take when the solver has to pick them
+PERFORMANCE_SHARE = {
+    "Gaming": {"cpu": 0.22, "gpu": 0.42},
+    "Content Creation": {"cpu": 0.32, "gpu": 0.30},
+    "Streaming": {"cpu": 0.30, "gpu": 0.32},
+    "Office/School": {"cpu": 0.35, "gpu": 0.15},
+    "General Use": {"cpu": 0.30, "gpu": 0.25},
+}
+RAM_TARGET_GB = {"Low": 16, "Medium": 16, "High": 32, "Ultra": 32}
+STORAGE_TARGET_GB = {"Low": 500, "Medium": 1000, "High": 1000, "Ultra": 2000}
+
+# (chipset, board power in W, rough relative performance); longest names are tried first
+GPU_CHIPS = [
+    ("rtx 4090", 450, 100), ("rtx 4080 super", 320, 82), ("rtx 4080", 320, 80),
+    ("rtx 4070 ti super", 285, 70), ("rtx 4070 ti", 285, 66), ("rtx 4070 super", 220, 60),
+    ("rtx 4070", 200, 53), ("rtx 4060 ti", 160, 40), ("rtx 4060", 115, 33),
+    ("rtx 3090 ti", 450, 64), ("rtx 3090", 350, 58), ("rtx 3080 ti", 350, 56), ("rtx 3080", 320, 52),
+    ("rtx 3070 ti", 290, 45), ("rtx 3070", 220, 42), ("rtx 3060 ti", 200, 37), ("rtx 3060", 170, 29),
+    ("rtx 3050", 130, 20), ("rtx 2080 ti", 250, 40), ("rtx 2080 super", 250, 35), ("rtx 2080", 215, 33),
+    ("rtx 2070 super", 215, 31), ("rtx 2070", 175, 27), ("rtx 2060 super", 175, 25), ("rtx 2060", 160, 22),
+    ("gtx 1660 super", 125, 19), ("gtx 1660 ti", 120, 19), ("gtx 1660", 120, 17),
+    ("gtx 1650 super", 100, 14), ("gtx 1650", 75, 11), ("gtx 1080 ti", 250, 30), ("gtx 1080", 180, 24),
+    ("gtx 1070 ti", 180, 22), ("gtx 1070", 150, 20), ("gtx 1060", 120, 14), ("gtx 1050 ti", 75, 8),
+    ("rx 7900 xtx", 355, 85), ("rx 7900 xt", 315, 74), ("rx 7900 gre", 260, 62), ("rx 7800 xt", 263, 58),
+    ("rx 7700 xt", 245, 50), ("rx 7600 xt", 190, 35), ("rx 7600", 165, 33),
+    ("rx 6950 xt", 335, 63), ("rx 6900 xt", 300, 60), ("rx 6800 xt", 300, 57), ("rx 6800", 250, 49),
+    ("rx 6750 xt", 250, 42), ("rx 6700 xt", 230, 40), ("rx 6700", 175, 36), ("rx 6650 xt", 180, 33),
+    ("rx 6600 xt", 160, 32), ("rx 6600", 132, 28), ("rx 6500 xt", 107, 15), ("rx 6400", 53, 11),
+    ("rx 5700 xt", 225, 30), ("rx 5700", 180, 27), ("rx 5600 xt", 150, 24), ("rx 5500 xt", 130, 16),
+    ("rx 590", 225, 15), ("rx 580", 185, 14), ("rx 570", 150, 12),
+    ("arc a770", 225, 36), ("arc a750", 225, 33), ("arc a580", 185, 28), ("arc a380", 75, 12),
+]
+GPU_CHIPS.sort(key=lambda chip: -len(chip[0]))
+
+# CPU generations: instructions per clock relative to Zen 3 / Rocket Lake, by socket
+SOCKET_IPC = {"AM5": 1.25, "LGA1851": 1.25, "LGA1700": 1.2, "AM4": 1.0, "LGA1200": 0.85}
+
+# Memory generation per board socket (LGA1700 boards are DDR5 unless their name says DDR4)
+SOCKET_DDR = {
+    "AM5": 5, "LGA1851": 5, "AM4": 4, "LGA1200": 4, "LGA1151": 4, "LGA1151-v2": 4, "LGA2066": 4,
+    "LGA2011-3": 4, "LGA1150": 3, "LGA1155": 3, "AM3+": 3, "FM2+": 3,
+}
+
+# Board sizes and the largest board each case takes: 1 = Mini ITX, 2 = Micro ATX, 3 = ATX, 4 = E-ATX
+BOARD_SIZE = {
+    "Mini ITX": 1, "Thin Mini ITX": 1, "Mini DTX": 1, "Micro ATX": 2, "Flex ATX": 2,
+    "ATX": 3, "EATX": 4, "XL ATX": 4, "SSI EEB": 4, "SSI CEB": 4, "HPTX": 4,
+}
+SMALL_PSU_TYPES = {"SFX", "TFX", "Flex ATX", "Mini ITX"}
+SMALL_CASES = {"Mini ITX Desktop", "HTPC", "MicroATX Slim", "MicroATX Desktop"}  # need a small PSU
+
+def _case_size(case_type):
+    if case_type.startswith("Mini ITX"):
+        return 1
+    if case_type.startswith("MicroATX") or case_type == "HTPC":
+        return 2
+    if case_type == "ATX Full Tower":
+        return 4
+    return 3 if case_type.startswith("ATX") else 0
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  DERIVED COLUMNS (computed once per category from the shared catalog)
+# ───────────────────────────────────────────────────────────────────────────────
+
+_RYZEN = re.compile(r"ryzen [3579] (?:pro )?(\d)\d{3}")
+_INTEL_CORE = re.compile(r"core i[3579]-(\d{4,5})([a-z]*)")
+_INTEL_ULTRA = re.compile(r"core ultra [579] 2\d\d")
+_INTEL_PENTIUM = re.compile(r"(?:pentium gold|celeron) g(\d)(\d)")
+_CHIPSET = re.compile(r"\b[abhqxz]([1-8])\d{2}[a-z]?\b")
+
+def cpu_socket(name):
+    """Socket of a desktop CPU from its name, or "" when unsure.
+    LGA1151 is split in two: 8th/9th gen Core CPUs ("LGA1151-v2") need a 300-series board."""
+    name = name.lower()
+    m = _RYZEN.search(name)
+    if m:
+        return "AM5" if int(m.group(1)) >= 7 else "AM4"
+    if re.search(r"athlon (?:gold |silver )?(?:3000g|\d{3}ge)", name):
+        return "AM4"
+    if _INTEL_ULTRA.search(name):
+        return "LGA1851"
+    m = _INTEL_CORE.search(name)
+    if m:
+        number, suffix = m.groups()
+        gen = int(number[:2]) if len(number) == 5 else int(number[0])
+        if "x" in suffix and "k" not in suffix:
+            return "LGA2066" if gen in (7, 9, 10) else ""
+        return {14: "LGA1700", 13: "LGA1700", 12: "LGA1700", 11: "LGA1200", 10: "LGA1200",
+                9: "LGA1151-v2", 8: "LGA1151-v2", 7: "LGA1151", 6: "LGA1151",
+                5: "LGA1150", 4: "LGA1150", 3: "LGA1155", 2: "LGA1155"}.get(gen, "")
+    m = _INTEL_PENTIUM.search(name)
+    if m:
+        series, sub = int(m.group(1)), int(m.group(2))
+        if series == 7:
+            return "LGA1700"
+        if series == 6:
+            return "LGA1200"
+        if series == 5 or (series == 4 and sub >= 9):
+            return "LGA1151-v2"
+        return "LGA1151" if series == 4 else ""
+    return ""
+
+def board_socket(socket, name):
+    """Board socket with LGA1151 split by chipset; "LGA1151" stays ambiguous if the name has no chipset."""
+    if socket != "LGA1151":
+        return socket
+    m = _CHIPSET.search(name.lower())
+    if m is None:
+        return "LGA1151?"
+    return "LGA1151-v2" if m.group(1) == "3" else "LGA1151"
+
+def gpu_power_and_score(chipset, memory_gb):
+    chipset = (chipset or "").lower()
+    for chip, watts, score in GPU_CHIPS:
+        if chip in chipset:
+            return watts, score
+    memory_gb = memory_gb or 0
+    watts = 75 if memory_gb <= 2 else 100 if memory_gb <= 4 else 180 if memory_gb <= 8 else 230 if memory_gb <= 12 else 300
+    return watts, 0.0  # unknown chip: power is a guess and the solver won't pick it for performance
+
+_derived = {}
+_lock = threading.Lock()
+
+def _derive(category):
+    table = pc_catalog.get(category)
+    n = len(table)
+    names = table.names
+    price = table.column("price") if "price" in table.numeric else np.full(n, np.nan)
+    cols = {"price": price, "priced": ~np.isnan(price)}
+    if category == "cpu":
+        sockets = [cpu_socket(name) for name in names]
+        boost = np.where(np.isnan(table.column("boost_clock")), table.column("core_clock"), table.column("boost_clock"))
+        ipc = np.array([SOCKET_IPC.get(s, 0.0) for s in sockets])
+        cols["socket"] = np.array(sockets, dtype="U12")
+        cols["tdp"] = table.column("tdp")
+        cols["score"] = table.column("core_count") ** 0.6 * boost * ipc
+        cols["modern"] = np.isin(cols["socket"], list(MODERN_SOCKETS))
+    elif category == "motherboard":
+        sockets = [board_socket(s, name) for s, name in zip(table.values("socket"), names)]
+        ddr = []
+        for socket, name in zip(sockets, names):
+            lower = name.lower()
+            if socket == "LGA1700":
+                ddr.append(4 if "ddr4" in lower or " d4" in lower else 5)
+            else:
+                ddr.append(SOCKET_DDR.get(socket.rstrip("?"), np.nan))
+        cols["socket"] = np.array(sockets, dtype="U12")
+        cols["ddr"] = np.array(ddr, dtype=np.float64)
+        cols["size"] = np.array([BOARD_SIZE.get(f, 3) for f in table.values("form_factor")])
+        cols["slots"] = table.column("memory_slots")
+        cols["max_memory"] = table.column("max_memory")
+    elif category == "ram":
+        cols["ddr"] = table.column("ddr_generation")
+        cols["modules"] = table.column("module_count")
+        cols["capacity"] = table.column("module_count") * table.column("module_gb")
+        cols["speed"] = table.column("speed_mhz")
+    elif category == "gpu":
+        power = [gpu_power_and_score(c, m) for c, m in zip(table.values("chipset"), table.values("memory"))]
+        cols["watts"] = np.array([p[0] for p in power], dtype=np.float64)
+        cols["score"] = np.array([p[1] for p in power], dtype=np.float64)
+    elif category == "storage":
+        cols["capacity"] = table.column("capacity")
+        cols["ssd"] = np.array([t == "SSD" for t in table.values("type")])
+    elif category == "psu":
+        cols["wattage"] = table.column("wattage")
+        cols["small"] = np.array([t in SMALL_PSU_TYPES for t in table.values("type")])
+    elif category == "case":
+        types = table.values("type")
+        cols["size"] = np.array([_case_size(t) for t in types])
+        cols["small"] = np.array([t in SMALL_CASES for t in types])
+    return cols
+
+def columns(category):
+    cols = _derived.get(category)
+    if cols is None:
+        with _lock:
+            cols = _derived.get(category)
+            if cols is None:
+                cols = _derived[category] = _derive(category)
+    return cols
+
+def prepare():
+    """Load the catalog, build the name indexes and the derived columns (startup, off the event loop)."""
+    pc_catalog.ensure_compiled()
+    part_index.build_all()
+    for category in PART_ORDER:
+        columns(category)
+
+def is_ready():
+    return part_index.is_ready() and len(_derived) == len(PART_ORDER)
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  CONSTRAINTS
+# ───────────────────────────────────────────────────────────────────────────────
+
+def _get(category, build, key):
+    """A derived value of the part chosen for category, or None if there is none."""
+    row = build.get(category)
+    if row is None:
+        return None
+    value = columns(category)[key][row]
+    if isinstance(value, (float, np.floating)) and np.isnan(value):
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+def _sockets_match(cpu_sockets, board_sockets):
+    ambiguous = (board_sockets == "LGA1151?") & np.char.startswith(cpu_sockets, "LGA1151")
+    return (cpu_sockets == board_sockets) | ambiguous | (cpu_sockets == "")  # unknown CPU socket: can't tell
+
+def required_psu_watts(build):
+    cpu_watts = _get("cpu", build, "tdp") or 65
+    gpu_watts = _get("gpu", build, "watts") or 0
+    return (cpu_watts + gpu_watts + BASE_SYSTEM_WATTS) * PSU_HEADROOM
+
+def constraints(category, build):
+    """
+    Mask of the parts in category that fit the parts already in build, plus a
+    reason string for each rule, as [(mask, reason)].
+    """
+    cols = columns(category)
+    n = len(cols["price"])
+    rules = []
+    if category == "cpu":
+        board = _get("motherboard", build, "socket")
+        if board:
+            rules.append((_sockets_match(cols["socket"], np.array([board])), f"does not fit the {board.rstrip('?')} motherboard"))
+    elif category == "motherboard":
+        socket = _get("cpu", build, "socket")
+        if socket:
+            rules.append((_sockets_match(np.array([socket]), cols["socket"]), f"does not take the CPU's {socket} socket"))
+        case_size = _get("case", build, "size")
+        if case_size:
+            rules.append((cols["size"] <= case_size, "is too large for the case"))
+    elif category == "ram":
+        ddr = _get("motherboard", build, "ddr")
+        if ddr:
+            rules.append((cols["ddr"] == ddr, f"is not DDR{int(ddr)} like the motherboard"))
+        slots = _get("motherboard", build, "slots")
+        if slots:
+            rules.append((cols["modules"] <= slots, f"has more modules than the motherboard's {int(slots)} slots"))
+        max_memory = _get("motherboard", build, "max_memory")
+        if max_memory:
+            rules.append((cols["capacity"] <= max_memory, f"exceeds the motherboard's {int(max_memory)} GB limit"))
+    elif category == "psu":
+        needed = required_psu_watts(build)
+        rules.append((cols["wattage"] >= needed, f"is below the recommended {int(round(needed, -1))} W"))
+        if _get("case", build, "small"):
+            rules.append((cols["small"], "is too big for the small case"))
+    elif category == "case":
+        board_size = _get("motherboard", build, "size")
+        if board_size:
+            rules.append((cols["size"] >= board_size, "cannot fit the motherboard"))
+        if build.get("psu") is not None and not _get("psu", build, "small"):
+            rules.append((~cols["small"], "needs an SFX power supply"))
+    return [(np.broadcast_to(mask, (n,)), reason) for mask, reason in rules]
+
+def _fits(category, build):
+    mask = np.ones(len(columns(category)["price"]), dtype=bool)
+    for rule, _ in constraints(category, build):
+        mask &= rule
+    return mask
+
+def check(build):
+    """Compatibility problems of a complete build as ["MOTHERBOARD ... because ...", ...]."""
+    issues = []
+    for category in PART_ORDER:
+        row = build.get(category)
+        if row is None:
+            continue
+        others = {c: r for c, r in build.items() if c != category}
+        for mask, reason in constraints(category, others):
+            if not mask[row]:
+                issues.append(f"{pc_catalog.get(category).names[row]} {reason}")
+    return issues
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  SOLVER
+# ───────────────────────────────────────────────────────────────────────────────
+
+def _pick(category, build, allowance, use_case, perf_level):
+    """Best part that fits build and costs at most allowance (USD), or None."""
+    cols = columns(category)
+    mask = _fits(category, build) & cols["priced"]
+    if category in ("cpu", "gpu"):
+        if category == "cpu":
+            mask &= cols["modern"]
+        elif use_case in ("Gaming", "Content Creation", "Streaming"):
+            mask &= cols["score"] > 0
+        affordable = mask & (cols["price"] <= allowance)
+        if affordable.any():
+            # Highest score, then cheapest
+            candidates = np.flatnonzero(affordable)
+            order = np.lexsort((cols["price"][candidates], -cols["score"][candidates]))
+            return int(candidates[order[0]])
+    else:
+        target = None
+        if category == "ram":
+            target = cols["capacity"] >= RAM_TARGET_GB.get(perf_level, 16)
+        elif category == "storage":
+            target = cols["ssd"] & (cols["capacity"] >= STORAGE_TARGET_GB.get(perf_level, 1000))
+        if target is not None and (mask & target & (cols["price"] <= allowance)).any():
+            mask &= target
+    candidates = np.flatnonzero(mask & (cols["price"] <= allowance))
+    if not len(candidates):
+        candidates = np.flatnonzero(mask)
+    if not len(candidates):
+        return None
+    # Cheapest of the popular ones, so value picks aren't obscure server or no-name parts
+    candidates = candidates[:POPULAR_POOL]
+    return int(candidates[np.argmin(cols["price"][candidates])])
+
+def _cost(build):
+    return sum(_price(category, build) for category in build)
+
+def _cheapest(category):
+    cols = columns(category)
+    return float(np.nanmin(cols["price"])) if cols["priced"].any() else 0.0
+
+def _price(category, build):
+    row = build.get(category)
+    if row is None:
+        return 0.0
+    price = columns(category)["price"][row]
+    return 0.0 if np.isnan(price) else float(price)
+
+def _downgrade(category, build, allowance, use_case, perf_level, notes):
+    """Swap build[category] for a cheaper pick if one fits; True if it changed."""
+    old = build.get(category)
+    if old is None:
+        return False
+    rest = {c: r for c, r in build.items() if c != category}
+    new_row = _pick(category, rest, allowance, use_case, perf_level)
+    if new_row is None or _price(category, {category: new_row}) >= _price(category, build):
+        return False
+    build[category] = new_row
+    if check(build):
+        build[category] = old  # e.g. a smaller board that no longer takes the RAM kit
+        return False
+    names = pc_catalog.get(category).names
+    notes.append(f"Replaced {names[old]} with {names[new_row]} to stay within budget")
+    return True
+
+def solve(choices, budget_usd, use_case="Gaming", perf_level="Medium"):
+    """
+    Turn the AI's suggestion into a complete, compatible build.
+
+    choices: {category: catalog row or None} from matching the AI's names.
+    Parts are checked in PART_ORDER against the ones kept before them; a missing
+    or incompatible part is replaced by the best compatible one the remaining
+    budget allows. A build that ends up over budget first gets value picks for
+    its supporting parts, then a cheaper GPU / CPU. Returns (build, notes)
+    where notes explain every change.
+    """
+    shares = PERFORMANCE_SHARE.get(use_case, PERFORMANCE_SHARE["General Use"])
+    build = {}
+    notes = []
+    for position, category in enumerate(PART_ORDER):
+        row = choices.get(category)
+        names = pc_catalog.get(category).names
+        if row is not None:
+            failed = [reason for mask, reason in constraints(category, build) if not mask[row]]
+            if not failed:
+                build[category] = row
+                continue
+        reserve = sum(_cheapest(c) for c in PART_ORDER[position + 1:])
+        allowance = budget_usd - _cost(build) - reserve
+        if category in shares:
+            allowance = min(allowance, shares[category] * budget_usd * 1.25)
+        new_row = _pick(category, build, allowance, use_case, perf_level)
+        if new_row is None:
+            notes.append(f"No compatible {category} found" + (f"; kept {names[row]}" if row is not None else ""))
+            if row is not None:
+                build[category] = row
+            continue
+        build[category] = new_row
+        if row is None:
+            notes.append(f"Added {names[new_row]} as the {category}")
+        else:
+            notes.append(f"Replaced {names[row]} with {names[new_row]}: it {'; '.join(failed)}")
+
+    # Over budget: first swap pricey supporting parts for value picks, then trade down GPU / CPU
+    for category in sorted(SUPPORT_PARTS, key=lambda c: -_price(c, build)):
+        over = _cost(build) - budget_usd * BUDGET_SLACK
+        if over <= 0:
+            break
+        _downgrade(category, build, float("inf"), use_case, perf_level, notes)
+    for category in sorted(("gpu", "cpu"), key=lambda c: -_price(c, build)):
+        over = _cost(build) - budget_usd * BUDGET_SLACK
+        if over <= 0:
+            break
+        _downgrade(category, build, _price(category, build) - over, use_case, perf_level, notes)
+    debug_log(f"Solved build for {budget_usd:.0f} USD: {len(notes)} changes, {_cost(build):.0f} USD")
+    return build, notes
+
+def estimated_power(build):
+    """Estimated peak draw in W (without the PSU headroom)."""
+    return required_psu_watts(build) / PSU_HEADROOM
+
+def total_price(build):
+    return _cost(build)
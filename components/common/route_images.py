@@ -0,0 +1,197 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+from components.common import airport_index, artifact_store, generate_flightroute, task_runner
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  DEBUG LOGGER
+# ───────────────────────────────────────────────────────────────────────────────
+
+try:
+    from components.common.config import DEBUG_MODE, REACTPY_DEBUG_MODE
+    if REACTPY_DEBUG_MODE:
+        import reactpy
+        reactpy.config.REACTPY_DEBUG_MODE.current = True
+        print("[route_images.py DEBUG] REACTPY_DEBUG_MODE imported from config.py, using value:", REACTPY_DEBUG_MODE)
+    if DEBUG_MODE:
+        print("[route_images.py DEBUG] DEBUG_MODE imported from config.py, using value:", DEBUG_MODE)
+except ImportError:
+    DEBUG_MODE = False
+    print("Warning: DEBUG_MODE not imported from config.py, using default value False.")
+
+def debug_log(*args):
+    if DEBUG_MODE:
+        print("[route_images.py DEBUG]", *args)
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  CONFIGURATION
+# ───────────────────────────────────────────────────────────────────────────────
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+CACHE_DIR = artifact_store.KINDS["route"][0]  # blobs and index files expire through the artifact store
+BLOB_DIR = CACHE_DIR / "blobs"    # <sha256><ext>: every distinct image once
+INDEX_DIR = CACHE_DIR / "index"   # <route key>.json: variant -> blob hash
+
+URL_PREFIX = "/routes/"
+MAX_STOPS = 12
+LON_MARGIN, LAT_MARGIN = 0.30, 0.70   # what the Trip Planner has always used
+NPTS = 50
+ROUTE_STYLE = 1   # bump when the route drawing changes (BASEMAP_STYLE is part of the key already)
+CACHE_IMMUTABLE = "public, max-age=31536000, immutable"  # URL names the exact content (?v= matches)
+CACHE_REVALIDATE = "no-cache"                            # bare or stale ?v=: the bytes behind it can change
+MEDIA_TYPES = {".svg": "image/svg+xml", ".webp": "image/webp", ".jpg": "image/jpeg", ".png": "image/png"}
+
+_CODES = re.compile(r"^[A-Z0-9]{3}(-[A-Z0-9]{3})+$")
+_entries = {}   # route key -> {variant: blob hash}
+_pending = {}   # route key -> Task of an in-flight render
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  NAMES AND KEYS
+# ───────────────────────────────────────────────────────────────────────────────
+
+def parse(name):
+    """("OTP-JFK_800.webp") -> (["OTP", "JFK"], "web"); ValueError for anything else."""
+    for variant, (suffix, _) in sorted(generate_flightroute.ROUTE_VARIANTS.items(), key=lambda v: -len(v[1][0])):
+        if name.lower().endswith(suffix):
+            codes = name[:-len(suffix)].upper()
+            if _CODES.match(codes) and codes.count("-") < MAX_STOPS:
+                return codes.split("-"), variant
+            break
+    raise ValueError(f"Not a route image: {name}")
+
+def version(entry, variant):
+    """The ?v= value naming this variant's current content."""
+    return entry[variant][:16]
+
+def urls(codes, entry):
+    """{variant: URL} for a rendered route; the content hash in the query keeps immutable caching correct."""
+    base = URL_PREFIX + "-".join(codes)
+    return {
+        variant: f"{path}?v={version(entry, variant)}"
+        for variant, (path, _) in generate_flightroute.route_variants(base).items()
+    }
+
+def cache_control(entry, variant, requested_version):
+    """Immutable only when the request's ?v= is the current content; anything else must revalidate."""
+    return CACHE_IMMUTABLE if requested_version == version(entry, variant) else CACHE_REVALIDATE
+
+def _extension(variant):
+    return "." + generate_flightroute.ROUTE_VARIANTS[variant][0].rsplit(".", 1)[1]
+
+def media_type(variant):
+    return MEDIA_TYPES[_extension(variant)]
+
+def blob_path(entry, variant):
+    return BLOB_DIR / f"{entry[variant]}{_extension(variant)}"
+
+def etag(entry, variant):
+    return f'"{entry[variant]}"'
+
+def not_modified(if_none_match, tag):
+    """True if an If-None-Match header already names this strong ETag."""
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return "*" in candidates or tag in candidates or f"W/{tag}" in candidates
+
+def _key(codes, coords):
+    spec = [
+        ROUTE_STYLE, generate_flightroute.BASEMAP_STYLE, sorted(generate_flightroute.ROUTE_VARIANTS.items()),
+        codes, [[round(lon, 5), round(lat, 5)] for lon, lat in coords], LON_MARGIN, LAT_MARGIN, NPTS,
+    ]
+    return hashlib.sha256(json.dumps(spec).encode()).hexdigest()
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  CACHE
+# ───────────────────────────────────────────────────────────────────────────────
+
+def _available(entry):
+    return all(artifact_store.contains(blob_path(entry, variant)) for variant in entry)
+
+def _read_entry(key):
+    index_path = INDEX_DIR / f"{key}.json"
+    if not artifact_store.contains(index_path):
+        return None
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if set(entry) != set(generate_flightroute.ROUTE_VARIANTS) or not _available(entry):
+        return None
+    return entry
+
+def _store(key, files):
+    """Move freshly rendered files into the blob store and record them under key."""
+    os.makedirs(BLOB_DIR, exist_ok=True)
+    os.makedirs(INDEX_DIR, exist_ok=True)
+    entry = {}
+    for variant, path in files.items():
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        entry[variant] = digest
+        os.replace(path, blob_path(entry, variant))  # identical bytes land on the same name
+        artifact_store.register(blob_path(entry, variant), "route")
+    tmp_path = INDEX_DIR / f"{key}.json.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+    os.replace(tmp_path, INDEX_DIR / f"{key}.json")
+    artifact_store.register(INDEX_DIR / f"{key}.json", "route")
+    return entry
+
+def _touch(key, entry):
+    artifact_store.touch(INDEX_DIR / f"{key}.json")
+    for variant in entry:
+        artifact_store.touch(blob_path(entry, variant))
+
+async def _render(key, codes):
+    work_dir = CACHE_DIR / f"tmp-{key}"
+    os.makedirs(work_dir, exist_ok=True)
+    try:
+        variants = generate_flightroute.route_variants(str(work_dir / "route"))
+        await generate_flightroute.create_clean_route_map(
+            codes, None, extra_lon_margin=LON_MARGIN, extra_lat_margin=LAT_MARGIN, npts=NPTS,
+            variants=variants.values(),
+        )
+        entry = await task_runner.run_blocking(_store, key, {variant: path for variant, (path, _) in variants.items()})
+        debug_log(f"Rendered {'-'.join(codes)} as {key[:12]}")
+        return entry
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+async def ensure(codes, allow_lookup=False):
+    """
+    The cache entry for a route, rendering it first if needed. Concurrent
+    requests for the same route share one render. Without allow_lookup only
+    airports already known locally are accepted (ValueError otherwise).
+    """
+    codes = [str(code).upper() for code in codes]
+    if not 2 <= len(codes) <= MAX_STOPS:
+        raise ValueError(f"A route image needs 2 to {MAX_STOPS} airports, got {len(codes)}")
+    if allow_lookup:
+        coords = await airport_index.lookup_all(codes)
+    else:
+        coords = [airport_index.get(code) for code in codes]
+        unknown = [code for code, c in zip(codes, coords) if c is None]
+        if unknown:
+            raise ValueError(f"Unknown airport code(s): {', '.join(unknown)}")
+    key = _key(codes, coords)
+    entry = _entries.get(key)
+    if entry is None or not _available(entry):  # blobs can expire or be evicted under the quota
+        entry = _read_entry(key)
+    if entry is not None:
+        _entries[key] = entry
+        _touch(key, entry)
+        return entry
+    # The render runs as its own task, so a client that disconnects doesn't cancel it for the others
+    task = _pending.get(key)
+    if task is None:
+        task = _pending[key] = task_runner.spawn(_render(key, codes), name=f"route_image_{key[:12]}")
+        task.add_done_callback(lambda _: _pending.pop(key, None))
+    entry = _entries[key] = await asyncio.shield(task)
+    _touch(key, entry)
+    return entry
@@ -0,0 +1,161 @@
+import asyncio
+from reactpy import use_effect, use_ref
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  DEBUG LOGGER
+# ───────────────────────────────────────────────────────────────────────────────
+
+try:
+    from components.common.config import DEBUG_MODE, REACTPY_DEBUG_MODE
+    if REACTPY_DEBUG_MODE:
+        import reactpy
+        reactpy.config.REACTPY_DEBUG_MODE.current = True
+        print("[task_runner.py DEBUG] REACTPY_DEBUG_MODE imported from config.py, using value:", REACTPY_DEBUG_MODE)
+    if DEBUG_MODE:
+        print("[task_runner.py DEBUG] DEBUG_MODE imported from config.py, using value:", DEBUG_MODE)
+except ImportError:
+    DEBUG_MODE = False
+    print("Warning: DEBUG_MODE not imported from config.py, using default value False.")
+
+def debug_log(*args):
+    if DEBUG_MODE:
+        print("[task_runner.py DEBUG]", *args)
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  CONFIGURATION
+# ───────────────────────────────────────────────────────────────────────────────
+
+MAX_RUNNING_TASKS = 64      # component jobs running at once; the rest wait their turn
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  RUNNER (all jobs run on the server's event loop)
+# ───────────────────────────────────────────────────────────────────────────────
+
+_tasks = set()
+_services = set()   # app-lifetime loops (start_service): not counted against MAX_RUNNING_TASKS
+_semaphore = None
+_stats = {"started": 0, "finished": 0, "failed": 0, "cancelled": 0}
+
+def _slots():
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(MAX_RUNNING_TASKS)
+    return _semaphore
+
+def _done(task):
+    _tasks.discard(task)
+    if task.cancelled():
+        _stats["cancelled"] += 1
+    elif task.exception() is not None:
+        _stats["failed"] += 1
+        print(f"Warning: background task {task.get_name()} failed: {task.exception()!r}")
+    else:
+        _stats["finished"] += 1
+
+def spawn(coro, name=None):
+    """
+    Schedule a coroutine on the running (server) loop and return its Task.
+    At most MAX_RUNNING_TASKS run at once. Tasks are referenced here until
+    they finish, so they can't be garbage-collected mid-flight, and
+    unhandled exceptions are logged instead of disappearing.
+    """
+    async def guarded():
+        try:
+            async with _slots():
+                return await coro
+        finally:
+            coro.close()  # no-op if it ran; avoids a "never awaited" warning if cancelled while queued
+
+    task = asyncio.get_running_loop().create_task(guarded(), name=name)
+    _tasks.add(task)
+    _stats["started"] += 1
+    task.add_done_callback(_done)
+    return task
+
+def start_service(coro, name=None):
+    """
+    Start a loop that lives as long as the app (a refresher, a sweeper) and
+    return its Task. It takes no MAX_RUNNING_TASKS slot, is cancelled by
+    shutdown(), and a crash is logged like a job failure.
+    """
+    task = asyncio.get_running_loop().create_task(coro, name=name)
+    _services.add(task)
+
+    def done(task):
+        _services.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Warning: service {task.get_name()} stopped: {task.exception()!r}")
+
+    task.add_done_callback(done)
+    return task
+
+async def run_blocking(fn, *args, **kwargs):
+    """Run a blocking call (SDK request, file work) in the shared thread pool."""
+    return await asyncio.to_thread(fn, *args, **kwargs)
+
+async def as_completed(jobs, timeout=None):
+    """
+    Run {key: coroutine} concurrently and yield (key, result, error) as each one
+    finishes. A job running past timeout seconds is cancelled and yields an
+    asyncio.TimeoutError; jobs still running when the caller stops iterating
+    are cancelled.
+    """
+    async def run(key, coro):
+        try:
+            return key, await asyncio.wait_for(coro, timeout), None
+        except Exception as e:
+            return key, None, e
+
+    tasks = [asyncio.ensure_future(run(key, coro)) for key, coro in jobs.items()]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+async def shutdown():
+    """Cancel whatever is still running (app shutdown)."""
+    running = list(_tasks) + list(_services)
+    for task in running:
+        task.cancel()
+    if running:
+        await asyncio.gather(*running, return_exceptions=True)
+    debug_log("Task runner stopped")
+
+def metrics():
+    """Counters for component jobs (served at /metrics/ai)."""
+    return {"running": len(_tasks), "max_running": MAX_RUNNING_TASKS, "services": len(_services), **_stats}
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  PER-COMPONENT HANDLES
+# ───────────────────────────────────────────────────────────────────────────────
+
+class TaskHandle:
+    """The jobs started by one component instance."""
+
+    def __init__(self, name):
+        self.name = name
+        self._tasks = set()
+
+    def run(self, coro, replace=True):
+        """Start a job; by default a still-running earlier job of this component is cancelled."""
+        if replace:
+            self.cancel()
+        task = spawn(coro, name=self.name)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def cancel(self):
+        for task in list(self._tasks):
+            task.cancel()
+
+def use_task_runner(name="component"):
+    """Hook returning this component's TaskHandle; its jobs are cancelled on unmount."""
+    ref = use_ref(None)
+    if ref.current is None:
+        ref.current = TaskHandle(name)
+    handle = ref.current
+    use_effect(lambda: handle.cancel, [])
+    return handle
@@ -0,0 +1,180 @@
+import asyncio
+import re
+import zlib
+from components.common import ai_admission
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  DEBUG LOGGER
+# ───────────────────────────────────────────────────────────────────────────────
+
+try:
+    from components.common.config import DEBUG_MODE, REACTPY_DEBUG_MODE
+    if REACTPY_DEBUG_MODE:
+        import reactpy
+        reactpy.config.REACTPY_DEBUG_MODE.current = True
+        print("[text_chunker.py DEBUG] REACTPY_DEBUG_MODE imported from config.py, using value:", REACTPY_DEBUG_MODE)
+    if DEBUG_MODE:
+        print("[text_chunker.py DEBUG] DEBUG_MODE imported from config.py, using value:", DEBUG_MODE)
+except ImportError:
+    DEBUG_MODE = False
+    print("Warning: DEBUG_MODE not imported from config.py, using default value False.")
+
+def debug_log(*args):
+    if DEBUG_MODE:
+        print("[text_chunker.py DEBUG]", *args)
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  CONFIGURATION
+# ───────────────────────────────────────────────────────────────────────────────
+
+MAX_CHUNK_CHARS = 800       # ~200 input tokens, leaves room under max_tokens=400 for the output
+PENDING_PLACEHOLDER = "…"   # shown in place of chunks that are still being processed
+CHARS_PER_TOKEN = 4         # rough estimate, good enough for budgeting
+SECTION_BOUNDARY_EVERY = 4  # content-defined sections end after ~1 in N paragraphs
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+_PARAGRAPH_BREAK = re.compile(r"(\n[ \t]*\n\s*)")
+_SENTENCE_END = re.compile(r"(?<=[.!?…。！？])(\s+)")
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  SPLITTING
+# ───────────────────────────────────────────────────────────────────────────────
+
+def _split_keep(pattern, text):
+    """Split into pieces that each carry their trailing separator, so "".join() == text."""
+    parts = pattern.split(text)
+    pieces = []
+    for i in range(0, len(parts), 2):
+        piece = parts[i] + (parts[i + 1] if i + 1 < len(parts) else "")
+        if piece:
+            pieces.append(piece)
+    return pieces
+
+def _hard_split(text, max_chars):
+    """Last resort for one enormous sentence: cut at the last space before max_chars."""
+    pieces = []
+    while len(text) > max_chars:
+        cut = text.rfind(" ", 0, max_chars)
+        pieces.append(text[:cut + 1] if cut > 0 else text[:max_chars])  # keep the space with the word before it
+        text = text[len(pieces[-1]):]
+    if text:
+        pieces.append(text)
+    return pieces
+
+def _pack(pieces, max_chars):
+    chunks = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + len(piece) > max_chars:
+            chunks.append(current)
+            current = ""
+        current += piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+def _pieces(text, max_chars):
+    """Paragraphs, with oversized ones broken into sentences (or words)."""
+    pieces = []
+    for paragraph in _split_keep(_PARAGRAPH_BREAK, text):
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        for sentence in _split_keep(_SENTENCE_END, paragraph):
+            pieces.extend(_hard_split(sentence, max_chars) if len(sentence) > max_chars else [sentence])
+    return pieces
+
+def _with_margins(chunks):
+    result = []
+    for chunk in chunks:
+        body = chunk.strip()
+        if not body:
+            result.append((chunk, "", ""))
+            continue
+        start = chunk.index(body)
+        result.append((chunk[:start], body, chunk[start + len(body):]))
+    return result
+
+def split(text, max_chars=MAX_CHUNK_CHARS):
+    """
+    Split text into (lead, body, trail) chunks of at most max_chars, breaking on
+    paragraphs first, then sentences. lead/trail hold the whitespace around each
+    body, so "".join(lead + body + trail) gives back the original text exactly.
+    """
+    return _with_margins(_pack(_pieces(text, max_chars), max_chars))
+
+def split_sections(text, max_chars, min_chars=None):
+    """
+    Like split(), but section boundaries are content-defined: a section ends
+    after a paragraph whose hash hits 1 in SECTION_BOUNDARY_EVERY (once it has
+    min_chars), or before it would exceed max_chars. Editing one paragraph then
+    only changes the section it is in, so per-section results stay cacheable.
+    """
+    min_chars = max_chars // 4 if min_chars is None else min_chars
+    sections = []
+    current = ""
+    for piece in _pieces(text, max_chars):
+        if current and len(current) + len(piece) > max_chars:
+            sections.append(current)
+            current = ""
+        current += piece
+        key = piece.strip().encode("utf-8")
+        if len(current) >= min_chars and key and zlib.crc32(key) % SECTION_BOUNDARY_EVERY == 0:
+            sections.append(current)
+            current = ""
+    if current:
+        sections.append(current)
+    return _with_margins(sections)
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  CONCURRENT PROCESSING
+# ───────────────────────────────────────────────────────────────────────────────
+
+def _assemble(chunks, results):
+    return "".join(
+        lead + (PENDING_PLACEHOLDER if out is None else out) + trail
+        for (lead, _, trail), out in zip(chunks, results)
+    )
+
+async def gather_bounded(jobs, limit=None):
+    """
+    Await every job (a zero-argument coroutine function) with at most limit
+    running at once, by default the AI admission per-session cap, so one tab's
+    calls never queue behind each other long enough to time out. Results come
+    back in order; on the first error the other jobs are cancelled and it is raised.
+    """
+    semaphore = asyncio.Semaphore(limit or ai_admission.MAX_PER_SESSION)
+
+    async def run(job):
+        async with semaphore:
+            return await job()
+
+    tasks = [asyncio.ensure_future(run(job)) for job in jobs]
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()  # no-op for the ones that finished
+
+async def map_chunks(text, process, on_progress=None, max_chars=MAX_CHUNK_CHARS):
+    """
+    Run `await process(body)` on every chunk of text concurrently and return the
+    results stitched back together with the original whitespace between them.
+    on_progress(partial_text) is called each time a chunk finishes, with chunks
+    still running shown as PENDING_PLACEHOLDER. At most MAX_PER_SESSION
+    chunks are processed at once (see gather_bounded).
+    """
+    chunks = split(text, max_chars)
+    results = [None] * len(chunks)
+    debug_log(f"Processing {len(chunks)} chunks of up to {max_chars} chars")
+
+    async def run(i):
+        body = chunks[i][1]
+        results[i] = (await process(body)).strip() if body else ""
+        if on_progress and len(chunks) > 1:
+            on_progress(_assemble(chunks, results))
+
+    await gather_bounded([lambda i=i: run(i) for i in range(len(chunks))])
+    return _assemble(chunks, results)
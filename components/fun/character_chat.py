@@ -2,6 +2,7 @@ from reactpy import component, html, use_state
 import json
 import os
 import asyncio
+from components.common import ai_admission, ai_client, chat_history
 
 CHAR_MAP_PATH = os.path.join(os.path.dirname(__file__), '../../static/assets/characters/character_map.json')
 with open(CHAR_MAP_PATH, encoding='utf-8') as f:
@@ -14,12 +15,15 @@ def CharacterChat():
     chat, set_chat = use_state([])  # (speaker, message)
     user_input, set_user_input = use_state("")
     is_typing, set_is_typing = use_state(False)
+    session_key = ai_admission.use_session_key()
+    chat_memory = chat_history.use_chat_history()
     error, set_error = use_state("")
     started, set_started = use_state(False)
 
     def handle_start(_event=None):
         set_started(True)
         set_chat([])
+        chat_memory.reset()
         set_error("")
 
     async def send_message(msg):
@@ -27,17 +31,7 @@ def CharacterChat():
         set_error("")
         set_chat(lambda c: c + [("You", msg)])
         try:
-            import aiohttp
             char_data = CHAR_MAP[selected_show]["characters"][selected_char]
-            # Build chat history for context
-            history = []
-            for speaker, message in chat:
-                if speaker == "You":
-                    history.append({"role": "user", "content": message})
-                else:
-                    history.append({"role": "assistant", "content": message})
-            # Add the new user message
-            history.append({"role": "user", "content": msg})
             system_prompt = (
                 f"You are roleplaying as {selected_char.capitalize()} from {selected_show.title()}. Stay in character."
                 "Respond to the user's messages as if you were that character, using their unique speech patterns and personality traits."
@@ -46,22 +40,19 @@ def CharacterChat():
                 "Respond in short-sized messages, and use emojis where appropriate."
                 " Do NOT use asterisks for actions, sound effects, or stage directions (e.g., *giggles*, *sighs*, etc.). Only reply with dialogue, not actions."
             )
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "https://ai.hackclub.com/chat/completions",
-                    headers={"Content-Type": "application/json"},
-                    json={
-                        "messages": [
-                            {"role": "system", "content": system_prompt},
-                            *history
-                        ]
-                    },
-                    timeout=aiohttp.ClientTimeout(total=60)
-                ) as resp:
-                    resp.raise_for_status()
-                    data = await resp.json()
-            reply = data["choices"][0]["message"]["content"]
-            set_chat(lambda c: c + [(selected_char, reply)])
+            # Stream the reply into the last bubble as it arrives
+            started_reply = False
+            async for partial in ai_client.stream_text(
+                # Recent turns verbatim, older ones as a rolling summary
+                chat_memory.messages(system_prompt, chat, msg, session_key),
+                timeout=60,
+                session_key=session_key,
+            ):
+                if not started_reply:
+                    set_chat(lambda c, p=partial: c + [(selected_char, p)])
+                    started_reply = True
+                else:
+                    set_chat(lambda c, p=partial: c[:-1] + [(selected_char, p)])
         except Exception as e:
             set_error(f"AI error: {e}")
         set_is_typing(False)
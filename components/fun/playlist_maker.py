@@ -1,15 +1,12 @@
 from reactpy import component, html, use_state
-import asyncio
-import threading
 from components.common.config import CACHE_SUFFIX
 import os
 import spotipy
 from spotipy.oauth2 import SpotifyClientCredentials
 from dotenv import load_dotenv
 import re
-import json
-import aiohttp
 import subprocess
+from components.common import ai_client, json_stream, task_runner
 
 
 # Load Spotify credentials from .env
@@ -47,6 +44,7 @@ def PlaylistMaker():
     loading, set_loading = use_state(False)
     results, set_results = use_state([])
     error, set_error = use_state("")
+    tasks = task_runner.use_task_runner("playlist_maker")
 
     def handle_info_click(event):
         set_info_open(lambda prev: not prev)
@@ -62,91 +60,89 @@ def PlaylistMaker():
         set_results([])
         set_error("")
         debug_log("Submitting search:", search, "Num songs:", num_songs)
-        def run_async():
-            async def do_request():
-                try:
-                    # Always use AI to generate the song list, even for Spotify URLs
-                    if is_spotify_url(search):
-                        # If playlist, get all song titles/artists; if track, get that song
-                        if "/playlist/" in search:
-                            debug_log("Detected Spotify playlist URL")
-                            playlist_songs = get_spotify_playlist_tracks(search)
-                            if not playlist_songs:
-                                debug_log("Playlist is empty or inaccessible (possibly private or invalid)")
-                                set_error("Could not access this playlist. It may be private or invalid. Please use a public playlist or try another input.")
-                                set_loading(False)
-                                return
-                            ai_input = ", ".join(f"{s['title']} by {s['artist']}" for s in playlist_songs)
-                            # Instruct AI to avoid recommending songs already in the playlist
-                            ai_prompt = (
-                                f"User provided a playlist containing: {ai_input}. "
-                                f"Recommend {num_songs} songs that are NOT already in this playlist. "
-                                f"You must not recommend any song that is already in the provided playlist. "
-                                f"List only new songs, not present in the user's playlist."
-                            )
-                            debug_log("AI prompt for playlist:", ai_prompt)
-                            songs = await ai_get_song_list(ai_prompt, int(num_songs))
-                        elif "/track/" in search:
-                            debug_log("Detected Spotify track URL")
-                            m = re.search(r"track/([a-zA-Z0-9]+)", search)
-                            if m:
-                                track_id = m.group(1)
-                                track = sp.track(track_id)
-                                debug_log("Fetched track info:", track)
-                                ai_prompt = f"User input: {track['name']} by {track['artists'][0]['name']}."
-                                debug_log("AI prompt for track:", ai_prompt)
-                                songs = await ai_get_song_list(ai_prompt, int(num_songs))
-                            else:
-                                debug_log("Could not extract track ID from URL")
-                                songs = []
-                        else:
-                            debug_log("Spotify URL but not playlist or track; treating as text input.")
-                            songs = await ai_get_song_list(search, int(num_songs))
-                    elif is_youtube_playlist_url(search):
-                        debug_log("Detected YouTube playlist URL")
-                        yt_songs = get_youtube_playlist_tracks(search)
-                        if not yt_songs:
-                            debug_log("YouTube playlist is empty or inaccessible (possibly private or invalid)")
-                            set_error("Could not access this YouTube playlist. It may be private or invalid. Please use a public playlist or try another input.")
+        async def do_request():
+            try:
+                # Always use AI to generate the song list, even for Spotify URLs
+                if is_spotify_url(search):
+                    # If playlist, get all song titles/artists; if track, get that song
+                    if "/playlist/" in search:
+                        debug_log("Detected Spotify playlist URL")
+                        playlist_songs = await task_runner.run_blocking(get_spotify_playlist_tracks, search)
+                        if not playlist_songs:
+                            debug_log("Playlist is empty or inaccessible (possibly private or invalid)")
+                            set_error("Could not access this playlist. It may be private or invalid. Please use a public playlist or try another input.")
                             set_loading(False)
                             return
-                        ai_input = ", ".join(f"{s['title']} by {s['artist']}" if s['artist'] else s['title'] for s in yt_songs)
+                        ai_input = ", ".join(f"{s['title']} by {s['artist']}" for s in playlist_songs)
+                        # Instruct AI to avoid recommending songs already in the playlist
                         ai_prompt = (
-                            f"User provided a YouTube playlist containing: {ai_input}. "
+                            f"User provided a playlist containing: {ai_input}. "
                             f"Recommend {num_songs} songs that are NOT already in this playlist. "
                             f"You must not recommend any song that is already in the provided playlist. "
                             f"List only new songs, not present in the user's playlist."
                         )
-                        debug_log("AI prompt for YouTube playlist:", ai_prompt)
+                        debug_log("AI prompt for playlist:", ai_prompt)
                         songs = await ai_get_song_list(ai_prompt, int(num_songs))
+                    elif "/track/" in search:
+                        debug_log("Detected Spotify track URL")
+                        m = re.search(r"track/([a-zA-Z0-9]+)", search)
+                        if m:
+                            track_id = m.group(1)
+                            track = await task_runner.run_blocking(sp.track, track_id)
+                            debug_log("Fetched track info:", track)
+                            ai_prompt = f"User input: {track['name']} by {track['artists'][0]['name']}."
+                            debug_log("AI prompt for track:", ai_prompt)
+                            songs = await ai_get_song_list(ai_prompt, int(num_songs))
+                        else:
+                            debug_log("Could not extract track ID from URL")
+                            songs = []
                     else:
-                        debug_log("Non-Spotify/YouTube input. Feeding directly to AI.")
+                        debug_log("Spotify URL but not playlist or track; treating as text input.")
                         songs = await ai_get_song_list(search, int(num_songs))
-                    debug_log("Song list to embed:", songs)
-                    # 2. For each song, get Spotify track ID
-                    embeds = []
-                    not_found = []
-                    for song in songs[:int(num_songs)]:
-                        debug_log(f"Looking up Spotify track for: {song}")
-                        track_id = get_spotify_track_embed(song["title"], song["artist"])
-                        if track_id:
-                            debug_log(f"Embed for {song['title']} by {song['artist']}: {track_id}")
-                            embeds.append({"track_id": track_id, "title": song["title"], "artist": song["artist"]})
-                        else:
-                            debug_log(f"No Spotify track found for: {song}")
-                            not_found.append(song)
-                    # If not enough found, fill with artist top tracks
-                    if len(embeds) < int(num_songs) and songs:
-                        debug_log(f"Filling {int(num_songs)-len(embeds)} missing songs with artist top tracks")
-                        embeds = fill_missing_songs_with_artist_top(songs, embeds, int(num_songs))
-                    set_results(embeds)
-                except Exception as e:
-                    debug_log("Error in do_request:", e)
-                    set_error(str(e))
-                finally:
-                    set_loading(False)
-            asyncio.run(do_request())
-        threading.Thread(target=run_async, daemon=True).start()
+                elif is_youtube_playlist_url(search):
+                    debug_log("Detected YouTube playlist URL")
+                    yt_songs = await task_runner.run_blocking(get_youtube_playlist_tracks, search)
+                    if not yt_songs:
+                        debug_log("YouTube playlist is empty or inaccessible (possibly private or invalid)")
+                        set_error("Could not access this YouTube playlist. It may be private or invalid. Please use a public playlist or try another input.")
+                        set_loading(False)
+                        return
+                    ai_input = ", ".join(f"{s['title']} by {s['artist']}" if s['artist'] else s['title'] for s in yt_songs)
+                    ai_prompt = (
+                        f"User provided a YouTube playlist containing: {ai_input}. "
+                        f"Recommend {num_songs} songs that are NOT already in this playlist. "
+                        f"You must not recommend any song that is already in the provided playlist. "
+                        f"List only new songs, not present in the user's playlist."
+                    )
+                    debug_log("AI prompt for YouTube playlist:", ai_prompt)
+                    songs = await ai_get_song_list(ai_prompt, int(num_songs))
+                else:
+                    debug_log("Non-Spotify/YouTube input. Feeding directly to AI.")
+                    songs = await ai_get_song_list(search, int(num_songs))
+                debug_log("Song list to embed:", songs)
+                # 2. For each song, get Spotify track ID
+                embeds = []
+                not_found = []
+                for song in songs[:int(num_songs)]:
+                    debug_log(f"Looking up Spotify track for: {song}")
+                    track_id = await task_runner.run_blocking(get_spotify_track_embed, song["title"], song["artist"])
+                    if track_id:
+                        debug_log(f"Embed for {song['title']} by {song['artist']}: {track_id}")
+                        embeds.append({"track_id": track_id, "title": song["title"], "artist": song["artist"]})
+                    else:
+                        debug_log(f"No Spotify track found for: {song}")
+                        not_found.append(song)
+                # If not enough found, fill with artist top tracks
+                if len(embeds) < int(num_songs) and songs:
+                    debug_log(f"Filling {int(num_songs)-len(embeds)} missing songs with artist top tracks")
+                    embeds = await task_runner.run_blocking(fill_missing_songs_with_artist_top, songs, embeds, int(num_songs))
+                set_results(embeds)
+            except Exception as e:
+                debug_log("Error in do_request:", e)
+                set_error(str(e))
+            finally:
+                set_loading(False)
+        tasks.run(do_request())
 
     def get_spotify_track_embed(track_name, artist_name):
         debug_log(f"Searching Spotify for: {track_name} by {artist_name}")
@@ -232,31 +228,16 @@ def PlaylistMaker():
             f"If you cannot find enough, fill the rest with popular songs in a similar style. "
             f"Example output: [\n  {{\"title\": \"Song Name\", \"artist\": \"Artist Name\"}}, ... ]\n"
         )
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://ai.hackclub.com/chat/completions",
-                headers={"Content-Type": "application/json"},
-                json={
-                    "messages": [
-                        {"role": "system", "content": prompt},
-                        {"role": "user", "content": user_input}
-                    ]
-                },
-                timeout=aiohttp.ClientTimeout(total=60)
-            ) as response:
-                if response.status != 200:
-                    raise RuntimeError(f"AI model returned {response.status}")
-                data = await response.json()
-        content = data["choices"][0]["message"]["content"]
+        content = await ai_client.complete(
+            [
+                {"role": "system", "content": prompt},
+                {"role": "user", "content": user_input}
+            ],
+            timeout=60,
+        )
         debug_log("AI raw output:", content)
-        content = content.strip()
-        if content.startswith('```json') and content.endswith('```'):
-            content = content[len('```json'):].strip()
-            content = content[:-3].strip()
-        elif content.startswith('```') and content.endswith('```'):
-            content = content[3:-3].strip()
         try:
-            songs = json.loads(content)
+            songs = json_stream.loads(content, root="[")
             debug_log("AI parsed songs:", songs)
             return songs
         except Exception as e:
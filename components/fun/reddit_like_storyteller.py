@@ -1,11 +1,11 @@
 from reactpy import component, html, use_state
 import asyncio
-import aiohttp
 import markdown
 from bs4 import BeautifulSoup
 import re
 import os
 import time
+from components.common import ai_client, artifact_store, task_runner
 
 
 # ───────────────────────────────────────────────────────────────────────────────
@@ -63,78 +63,69 @@ def RedditLikeStoryteller():
     audio_loading, set_audio_loading = use_state(False)
     audio_error, set_audio_error = use_state("")
     generate_comments, set_generate_comments = use_state(True)
+    tasks = task_runner.use_task_runner("reddit_story")
+    audio_tasks = task_runner.use_task_runner("reddit_story_tts")
 
     def handle_generate_story(_event=None):
         set_loading(True)
         set_error("")
         set_story_html("")
-        def run_async():
-            async def do_request():
-                try:
-                    if generate_comments:
-                        system_prompt = (
-                            "You are a creative Reddit storyteller AI. "
-                            "Write a story in the style of the given subreddit, and if any, given theme. "
-                            "Include engaging comments or responses if the subreddit typically has them. "
-                            "Format it as a Reddit post, with a title, body, and (if appropriate) comments or responses. "
-                            "Make the names of the comments and users realistic, but do not use real Reddit usernames. "
-                            "Stay true to the tone, tropes, and conventions of the selected subreddit. "
-                            "Output only the story in Markdown, no extra commentary, explanations, or preamble. "
-                            "Do not include any text outside the Markdown story. "
-                            "Make a decently long story, but not too long. "
-                            "Add engaging comments or responses if the subreddit typically has them. "
-                            "Stay true to the subreddit style. "
-                            "For the comments, use the format: - **u/username** comment text. "
-                            "If the subreddit is r/TwoSentenceHorror, make it exactly two sentences. "
-                            "If the subreddit is r/AITA, include a verdict at the end (YTA, NTA, ESH, NAH)."
-                        )
-                    else:
-                        system_prompt = (
-                            "You are a creative Reddit storyteller AI. "
-                            "Write a story in the style of the given subreddit, and if any, given theme. "
-                            "Do NOT include any comments or responses, only the main story body. "
-                            "Format it as a Reddit post, with a title and body only. "
-                            "Make the story realistic and true to the tone, tropes, and conventions of the selected subreddit. "
-                            "Output only the story in Markdown, no extra commentary, explanations, or preamble. "
-                            "Do not include any text outside the Markdown story. "
-                            "Make a decently long story, but not too long. "
-                            "If the subreddit is r/TwoSentenceHorror, make it exactly two sentences. "
-                            "If the subreddit is r/AITA, include a verdict at the end (YTA, NTA, ESH, NAH)."
-                        )
-                    user_prompt = (
-                        f"Write a story in the style of {subreddit}. "
-                        f"Theme: {theme.strip() or 'Any'}."
+        async def do_request():
+            try:
+                if generate_comments:
+                    system_prompt = (
+                        "You are a creative Reddit storyteller AI. "
+                        "Write a story in the style of the given subreddit, and if any, given theme. "
+                        "Include engaging comments or responses if the subreddit typically has them. "
+                        "Format it as a Reddit post, with a title, body, and (if appropriate) comments or responses. "
+                        "Make the names of the comments and users realistic, but do not use real Reddit usernames. "
+                        "Stay true to the tone, tropes, and conventions of the selected subreddit. "
+                        "Output only the story in Markdown, no extra commentary, explanations, or preamble. "
+                        "Do not include any text outside the Markdown story. "
+                        "Make a decently long story, but not too long. "
+                        "Add engaging comments or responses if the subreddit typically has them. "
+                        "Stay true to the subreddit style. "
+                        "For the comments, use the format: - **u/username** comment text. "
+                        "If the subreddit is r/TwoSentenceHorror, make it exactly two sentences. "
+                        "If the subreddit is r/AITA, include a verdict at the end (YTA, NTA, ESH, NAH)."
                     )
-                    async with aiohttp.ClientSession() as session:
-                        async with session.post(
-                            "https://ai.hackclub.com/chat/completions",
-                            headers={"Content-Type": "application/json"},
-                            json={
-                                "messages": [
-                                    {"role": "system", "content": system_prompt},
-                                    {"role": "user", "content": user_prompt},
-                                ]
-                            },
-                            timeout=aiohttp.ClientTimeout(total=60)
-                        ) as resp:
-                            resp.raise_for_status()
-                            data = await resp.json()
-                    md = data["choices"][0]["message"]["content"]
-                    html_content = markdown.markdown(md, extensions=["tables", "nl2br"])
-                    html_content = re.sub(r'<li>\s*([*•])\s*u/', r'<li>u/', html_content)
-                    html_content = re.sub(r'(?:<br\s*/?>)?\s*[*•]\s*(u/\w+)', r'<li>\1', html_content)
-                    comments = re.findall(r'^[*•]\s*(u/\w+.*)$', md, re.MULTILINE)
-                    if comments:
-                        comments_html = "<ul>" + "".join(f"<li>{c}</li>" for c in comments) + "</ul>"
-                        html_content += comments_html
-                    set_story_html(f"<div class='markdown-body'>{html_content}</div>")
-                except Exception as e:
-                    set_error(str(e))
-                finally:
-                    set_loading(False)
-            asyncio.run(do_request())
-        import threading
-        threading.Thread(target=run_async, daemon=True).start()
+                else:
+                    system_prompt = (
+                        "You are a creative Reddit storyteller AI. "
+                        "Write a story in the style of the given subreddit, and if any, given theme. "
+                        "Do NOT include any comments or responses, only the main story body. "
+                        "Format it as a Reddit post, with a title and body only. "
+                        "Make the story realistic and true to the tone, tropes, and conventions of the selected subreddit. "
+                        "Output only the story in Markdown, no extra commentary, explanations, or preamble. "
+                        "Do not include any text outside the Markdown story. "
+                        "Make a decently long story, but not too long. "
+                        "If the subreddit is r/TwoSentenceHorror, make it exactly two sentences. "
+                        "If the subreddit is r/AITA, include a verdict at the end (YTA, NTA, ESH, NAH)."
+                    )
+                user_prompt = (
+                    f"Write a story in the style of {subreddit}. "
+                    f"Theme: {theme.strip() or 'Any'}."
+                )
+                md = await ai_client.complete(
+                    [
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt},
+                    ],
+                    timeout=60,
+                )
+                html_content = markdown.markdown(md, extensions=["tables", "nl2br"])
+                html_content = re.sub(r'<li>\s*([*•])\s*u/', r'<li>u/', html_content)
+                html_content = re.sub(r'(?:<br\s*/?>)?\s*[*•]\s*(u/\w+)', r'<li>\1', html_content)
+                comments = re.findall(r'^[*•]\s*(u/\w+.*)$', md, re.MULTILINE)
+                if comments:
+                    comments_html = "<ul>" + "".join(f"<li>{c}</li>" for c in comments) + "</ul>"
+                    html_content += comments_html
+                set_story_html(f"<div class='markdown-body'>{html_content}</div>")
+            except Exception as e:
+                set_error(str(e))
+            finally:
+                set_loading(False)
+        tasks.run(do_request())
 
     def extract_story_text(md: str) -> str:
         """Strip out comments/verdicts for plain narration to TTS."""
@@ -168,11 +159,8 @@ def RedditLikeStoryteller():
         set_audio_loading(True)
         set_audio_error("")
         set_audio_url("")
-        import threading
-        def run_piper():
+        async def run_piper():
             try:
-                temp_dir = os.path.join("static", "assets", "tts_temp")
-                os.makedirs(temp_dir, exist_ok=True)
                 # Prepare text
                 soup = BeautifulSoup(story_html, "html.parser")
                 text = soup.get_text("\n").strip()
@@ -182,46 +170,57 @@ def RedditLikeStoryteller():
                     return
                 # Generate unique filename by using a timestamp
                 ts = int(time.time() * 1000)
-                wav_path = os.path.join(temp_dir, f"tts_story_{ts}.wav")
+                wav_path = artifact_store.path_for("tts", f"tts_story_{ts}.wav")
                 # Piper binary and model paths
                 if system == "windows":
                     piper_bin = os.path.join(piper_bin_dir, "piper.exe")
                 else:
                     piper_bin = os.path.join(piper_bin_dir, "piper")
-                import subprocess
+                # Run Piper as an async subprocess so no thread is parked waiting on it
                 try:
-                    result = subprocess.run(
-                        [piper_bin, "--model", voice_model, "--config", voice_config, "--output_file", wav_path],
-                        input=text.encode("utf-8"),
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        timeout=60
+                    proc = await asyncio.create_subprocess_exec(
+                        piper_bin, "--model", voice_model, "--config", voice_config, "--output_file", wav_path,
+                        stdin=asyncio.subprocess.PIPE,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.PIPE,
                     )
-                    if result.returncode != 0:
-                        set_audio_error(f"Piper error: {result.stderr.decode('utf-8')}")
+                    try:
+                        _, stderr = await asyncio.wait_for(proc.communicate(text.encode("utf-8")), timeout=60)
+                    except (asyncio.TimeoutError, asyncio.CancelledError):
+                        proc.kill()
+                        await proc.wait()
+                        raise
+                    if proc.returncode != 0:
+                        set_audio_error(f"Piper error: {stderr.decode('utf-8')}")
                         set_audio_loading(False)
                         return
+                except asyncio.CancelledError:
+                    raise
                 except Exception as e:
                     set_audio_error(f"Piper execution failed: {e}")
                     set_audio_loading(False)
                     return
+                finally:
+                    if os.path.exists(wav_path):  # tracked even if Piper failed, so it still expires
+                        artifact_store.register(wav_path, "tts")
                 # Set audio URL for playback, but check file exists and is non-empty
-                import time as _time
                 for _ in range(10):  # Wait up to 1s for file to be written
                     if os.path.exists(wav_path) and os.path.getsize(wav_path) > 1000:
                         break
-                    _time.sleep(0.1)
+                    await asyncio.sleep(0.1)
                 if not os.path.exists(wav_path) or os.path.getsize(wav_path) == 0:
                     set_audio_error("Audio file was not created or is empty.")
                 else:
                     # Add a small delay to ensure file is ready before setting URL
-                    _time.sleep(0.15)
+                    await asyncio.sleep(0.15)
                     rel_url = f"/static/assets/tts_temp/tts_story_{ts}.wav"
                     set_audio_url(rel_url)
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 set_audio_error(f"Audio generation failed: {e}")
             set_audio_loading(False)
-        threading.Thread(target=run_piper, daemon=True).start()
+        audio_tasks.run(run_piper())
 
     from components.common.config import CACHE_SUFFIX
     return html.div(
@@ -1,13 +1,15 @@
 from reactpy import component, html, use_state, use_effect, use_ref
 import asyncio
-import aiohttp
+import contextlib
 import markdown
+from components.common import ai_admission, ai_client
 
 @component
 def BotVsBotRoastBattle():
     topic, set_topic = use_state("")
     chat, set_chat = use_state([])  # list of (speaker, message)
     is_typing, set_is_typing = use_state(False)
+    session_key = ai_admission.use_session_key()
     started, set_started = use_state(False)
     error, set_error = use_state("")
 
@@ -50,19 +52,22 @@ def BotVsBotRoastBattle():
                 if cancel_ref.current:
                     break
                 set_is_typing(True)
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        "https://ai.hackclub.com/chat/completions",
-                        json={"messages": payload, "max_tokens": 120},
-                        headers={"Content-Type": "application/json"},
-                        timeout=aiohttp.ClientTimeout(total=60),
-                    ) as resp:
-                        resp.raise_for_status()
-                        data = await resp.json()
+                # Stream the roast into a new bubble as it arrives
+                roast = None
+                # aclosing: breaking out on cancel releases the admission slot and connection right away
+                stream = ai_client.stream_text(payload, max_tokens=120, timeout=60, session_key=session_key)
+                async with contextlib.aclosing(stream):
+                    async for partial in stream:
+                        if cancel_ref.current:
+                            break
+                        if roast is None:
+                            set_chat(lambda c, p=partial.strip(): c + [(bot, p)])
+                        else:
+                            set_chat(lambda c, p=partial.strip(): c[:-1] + [(bot, p)])
+                        roast = partial.strip()
                 if cancel_ref.current:
                     break
-                roast = data["choices"][0]["message"]["content"].strip()
-                set_chat(lambda c: c + [(bot, roast)])
+                roast = roast or ""
                 history.append((bot, roast))
                 await asyncio.sleep(3.5 + 1.2 * (turn % 2))
                 set_is_typing(False)
@@ -1,7 +1,6 @@
 from reactpy import component, html, use_state
-import asyncio
-import aiohttp
 import markdown
+from components.common import ai_client, task_runner
 
 @component
 def RecipeMaker():
@@ -15,6 +14,7 @@ def RecipeMaker():
         "Frying", "Baking", "Boiling", "Microwave", "Grilling", "Air Fryer"
     ]
     selected_methods, set_selected_methods = use_state(cooking_methods[:])
+    tasks = task_runner.use_task_runner("recipe_maker")
 
     def handle_method_change(e):
         value = e["target"]["value"]
@@ -27,75 +27,63 @@ def RecipeMaker():
     def handle_generate_recipe(event):
         set_loading(True)
         set_recipe_html("")  # Clear previous output
-        import threading
-        def run_async():
-            async def do_request():
-                try:
-                    methods_str = ", ".join(selected_methods) if selected_methods else "any method"
-                    prompt = (
-                        "You are a helpful chef AI. "
-                        "Output ONLY the recipe in Markdown format, with no extra comments, explanations, or preamble. "
-                        "Do not include any text outside the Markdown recipe. "
-                        "Assume the user also has common ingredients like sugar, salt, and flour.\n"
-                        "Do not use any other cooking methods outside of the specified ones. If no method is possible, or if the ingredients are obviously for a salad or similar, you may use a no-cook recipe as a last resort.\n"
-                        "If the ingredients make sense as a main dish and a side (for example, chicken and potatoes as a main, cabbage and lemon as a salad), you may split them into a main and a side dish, and describe both in the recipe.\n"
-                        "Explain the recipe in detail, including cooking times and methods, do not cheap down on words.\n"
-                        "You don't have to use all the ingredients.\n\n"
-                        "Follow the provided template exactly:\n\n"
-                        "# Recipe Title\n\n"
-                        "## Ingredients\n"
-                        "- ingredient 1\n"
-                        "- ingredient 2\n\n"
-                        "## Instructions\n"
-                        "1. Step one\n"
-                        "2. Step two\n\n"
-                        "## Nutrition (per serving / per 100g)\n"
-                        "| Nutrient     | per serving | per 100g |\n"
-                        "|--------------|-------------|----------|\n"
-                        "| Calories     |             |          |\n"
-                        "| Protein      |             |          |\n"
-                        "| Carbs        |             |          |\n"
-                        "| Fat          |             |          |\n"
-                        "*Note: Nutritional values are approximate and AI generated.*\n\n"
-                        "## Alergens\n"
-                        "- allergen 1\n"
-                        "- allergen 2\n\n"
-                        "\n\n"
-                        "Fill in each section accordingly, using bullet lists and numbered steps exactly as above. "
-                    )
-                    async with aiohttp.ClientSession() as session:
-                        async with session.post(
-                            "https://ai.hackclub.com/chat/completions",
-                            headers={"Content-Type": "application/json"},
-                            json={
-                                "messages": [
-                                    {
-                                        "role": "system",
-                                        "content": prompt},
-                                    {
-                                        "role": "user", "content": (
-                                        f"Use these ingredients: {ingredients}\n"
-                                        f"Allowed cooking methods: {methods_str}."
-                                        f"Health level: {health_level}\n"
-                                        f"Servings: {servings}\n\n"
-                                        )
-                                    }
-                                ]
-                            },
-                            timeout=aiohttp.ClientTimeout(total=60)
-                        ) as response:
-                            if response.status != 200:
-                                raise RuntimeError(f"AI model returned {response.status}")
-                            data = await response.json()
-                    md = data["choices"][0]["message"]["content"]
-                    html_content = markdown.markdown(md, extensions=["tables"])
-                    set_recipe_html(f"<div class='markdown-body'>{html_content}</div>")
-                except Exception as e:
-                    set_recipe_html(f"<p style='color:red'>Error: {e}</p>")
-                finally:
-                    set_loading(False)
-            asyncio.run(do_request())
-        threading.Thread(target=run_async, daemon=True).start()
+        async def do_request():
+            try:
+                methods_str = ", ".join(selected_methods) if selected_methods else "any method"
+                prompt = (
+                    "You are a helpful chef AI. "
+                    "Output ONLY the recipe in Markdown format, with no extra comments, explanations, or preamble. "
+                    "Do not include any text outside the Markdown recipe. "
+                    "Assume the user also has common ingredients like sugar, salt, and flour.\n"
+                    "Do not use any other cooking methods outside of the specified ones. If no method is possible, or if the ingredients are obviously for a salad or similar, you may use a no-cook recipe as a last resort.\n"
+                    "If the ingredients make sense as a main dish and a side (for example, chicken and potatoes as a main, cabbage and lemon as a salad), you may split them into a main and a side dish, and describe both in the recipe.\n"
+                    "Explain the recipe in detail, including cooking times and methods, do not cheap down on words.\n"
+                    "You don't have to use all the ingredients.\n\n"
+                    "Follow the provided template exactly:\n\n"
+                    "# Recipe Title\n\n"
+                    "## Ingredients\n"
+                    "- ingredient 1\n"
+                    "- ingredient 2\n\n"
+                    "## Instructions\n"
+                    "1. Step one\n"
+                    "2. Step two\n\n"
+                    "## Nutrition (per serving / per 100g)\n"
+                    "| Nutrient     | per serving | per 100g |\n"
+                    "|--------------|-------------|----------|\n"
+                    "| Calories     |             |          |\n"
+                    "| Protein      |             |          |\n"
+                    "| Carbs        |             |          |\n"
+                    "| Fat          |             |          |\n"
+                    "*Note: Nutritional values are approximate and AI generated.*\n\n"
+                    "## Alergens\n"
+                    "- allergen 1\n"
+                    "- allergen 2\n\n"
+                    "\n\n"
+                    "Fill in each section accordingly, using bullet lists and numbered steps exactly as above. "
+                )
+                md = await ai_client.complete(
+                    [
+                        {
+                            "role": "system",
+                            "content": prompt},
+                        {
+                            "role": "user", "content": (
+                            f"Use these ingredients: {ingredients}\n"
+                            f"Allowed cooking methods: {methods_str}."
+                            f"Health level: {health_level}\n"
+                            f"Servings: {servings}\n\n"
+                            )
+                        }
+                    ],
+                    timeout=60,
+                )
+                html_content = markdown.markdown(md, extensions=["tables"])
+                set_recipe_html(f"<div class='markdown-body'>{html_content}</div>")
+            except Exception as e:
+                set_recipe_html(f"<p style='color:red'>Error: {e}</p>")
+            finally:
+                set_loading(False)
+        tasks.run(do_request())
 
     from components.common.config import CACHE_SUFFIX
     return html.div(
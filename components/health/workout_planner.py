@@ -1,10 +1,9 @@
 from reactpy import component, html, use_state
 import asyncio
-import aiohttp
 import markdown
-import threading
 import datetime
 from components.common.config import CACHE_SUFFIX
+from components.common import ai_client, task_runner
 
 # ───────────────────────────────────────────────────────────────────────────────
 #  DEBUG LOGGER
@@ -42,6 +41,7 @@ def WorkoutPlanner():
     show_flow, set_show_flow = use_state(False)
     weight_unit, set_weight_unit = use_state("kg")
     height_unit, set_height_unit = use_state("cm")
+    tasks = task_runner.use_task_runner("workout_planner")
 
     def handle_submit(event):
         set_loading(True)
@@ -57,95 +57,82 @@ def WorkoutPlanner():
             tw = round(tw * 0.453592, 2)
         if height_unit == "in":
             h = round(h * 2.54, 2)
-        def run_async():
-            async def do_request():
-                try:
-                    debug_log("Preparing AI prompt and user input")
-                    prompt = (
-                        "You are a professional fitness and nutrition assistant AI. "
-                        "Your goal is to help the user safely and effectively reach their target body weight. "
-                        "Use the user's provided data (current weight, target weight, biological sex, age, height, target date, and optional fat and muscle mass) "
-                        "to generate a customized fitness and nutrition plan.\n\n"
+        async def do_request():
+            try:
+                debug_log("Preparing AI prompt and user input")
+                prompt = (
+                    "You are a professional fitness and nutrition assistant AI. "
+                    "Your goal is to help the user safely and effectively reach their target body weight. "
+                    "Use the user's provided data (current weight, target weight, biological sex, age, height, target date, and optional fat and muscle mass) "
+                    "to generate a customized fitness and nutrition plan.\n\n"
 
-                        "Format the output in clean, readable Markdown only. Do not include any introductions, explanations, or formatting syntax explanations.\n\n"
+                    "Format the output in clean, readable Markdown only. Do not include any introductions, explanations, or formatting syntax explanations.\n\n"
 
-                        "### Output format:\n"
-                        "# Daily Caloric Intake\n"
-                        "- Total kcal/day (clearly state it)\n\n"
-                        "# Macronutrient Targets\n"
-                        "- Carbs: __ g/day\n"
-                        "- Protein: __ g/day\n"
-                        "- Fat: __ g/day\n\n"
+                    "### Output format:\n"
+                    "# Daily Caloric Intake\n"
+                    "- Total kcal/day (clearly state it)\n\n"
+                    "# Macronutrient Targets\n"
+                    "- Carbs: __ g/day\n"
+                    "- Protein: __ g/day\n"
+                    "- Fat: __ g/day\n\n"
 
-                        "# Weekly Workout Plan\n"
-                        "- List each day with:\n"
-                        "  - Workout type\n"
-                        "  - Suggested intensity (e.g. low, moderate, high)\n"
-                        "  - Estimated duration (minutes)\n"
-                        "  - Optional notes for beginners or advanced users\n\n"
+                    "# Weekly Workout Plan\n"
+                    "- List each day with:\n"
+                    "  - Workout type\n"
+                    "  - Suggested intensity (e.g. low, moderate, high)\n"
+                    "  - Estimated duration (minutes)\n"
+                    "  - Optional notes for beginners or advanced users\n\n"
 
-                        "# Nutrition Guidelines\n"
-                        "- Bullet points with specific dietary strategies and practical tips\n"
-                        "- Emphasize consistency, hydration, and whole foods\n\n"
+                    "# Nutrition Guidelines\n"
+                    "- Bullet points with specific dietary strategies and practical tips\n"
+                    "- Emphasize consistency, hydration, and whole foods\n\n"
 
-                        "# Progress Monitoring\n"
-                        "- Weekly weight check\n"
-                        "- Bi-weekly body measurements\n"
-                        "- Monthly photos or fitness assessments\n\n"
+                    "# Progress Monitoring\n"
+                    "- Weekly weight check\n"
+                    "- Bi-weekly body measurements\n"
+                    "- Monthly photos or fitness assessments\n\n"
 
-                        "# Motivation & Sustainability\n"
-                        "- Encouraging reminders and tips to stay on track\n"
-                        "- Ideas to adjust the plan if life gets busy or motivation drops\n\n"
+                    "# Motivation & Sustainability\n"
+                    "- Encouraging reminders and tips to stay on track\n"
+                    "- Ideas to adjust the plan if life gets busy or motivation drops\n\n"
 
-                        "## Notes:\n"
-                        "- Use body composition to personalize caloric and protein needs if available.\n"
-                        "- Recommend a gradual weight change pace unless the goal is short-term and realistic.\n"
-                        "- Never expose calculations or formulas.\n"
-                        "- Ensure tone is friendly, motivating, and actionable."
-                    )
-                    user_input = (
-                        f"Current weight: {w} kg\n"
-                        f"Target weight: {tw} kg\n"
-                        f"Sex: {sex}\n"
-                        f"Age: {age}\n"
-                        f"Height: {h} cm\n"
-                        f"Target date (MM/DD/YYYY): {target_date}\n"
-                        f"Current date: {datetime.datetime.now().strftime('%m/%d/%Y')}\n"
-                    )
-                    if fat_mass or muscle_mass:
-                        user_input += f"Fat mass: {fat_mass} kg\nMuscle mass: {muscle_mass} kg\n"
-                    debug_log("Prompt:", prompt)
-                    debug_log("User input:", user_input)
-                    async with aiohttp.ClientSession() as session:
-                        async with session.post(
-                            "https://ai.hackclub.com/chat/completions",
-                            headers={"Content-Type": "application/json"},
-                            json={
-                                "messages": [
-                                    {"role": "system", "content": prompt},
-                                    {"role": "user", "content": user_input}
-                                ]
-                            },
-                            timeout=aiohttp.ClientTimeout(total=60)
-                        ) as response:
-                            debug_log("AI response status:", response.status)
-                            if response.status != 200:
-                                raise RuntimeError(f"AI model returned {response.status}")
-                            data = await response.json()
-                    md = data["choices"][0]["message"]["content"]
-                    debug_log("AI raw output:", md)
-                    set_result_html("")  # Clear before animating
-                    # Animate result after a short delay
-                    def animate_result():
-                        set_result_html(f"<div class='workout-output animated-fadein'><div class='markdown-body'>{markdown.markdown(md)}</div></div>")
-                    threading.Timer(0.15, animate_result).start()
-                except Exception as e:
-                    debug_log("Error in do_request:", e)
-                    set_error(f"Error: {e}")
-                finally:
-                    set_loading(False)
-            asyncio.run(do_request())
-        threading.Thread(target=run_async, daemon=True).start()
+                    "## Notes:\n"
+                    "- Use body composition to personalize caloric and protein needs if available.\n"
+                    "- Recommend a gradual weight change pace unless the goal is short-term and realistic.\n"
+                    "- Never expose calculations or formulas.\n"
+                    "- Ensure tone is friendly, motivating, and actionable."
+                )
+                user_input = (
+                    f"Current weight: {w} kg\n"
+                    f"Target weight: {tw} kg\n"
+                    f"Sex: {sex}\n"
+                    f"Age: {age}\n"
+                    f"Height: {h} cm\n"
+                    f"Target date (MM/DD/YYYY): {target_date}\n"
+                    f"Current date: {datetime.datetime.now().strftime('%m/%d/%Y')}\n"
+                )
+                if fat_mass or muscle_mass:
+                    user_input += f"Fat mass: {fat_mass} kg\nMuscle mass: {muscle_mass} kg\n"
+                debug_log("Prompt:", prompt)
+                debug_log("User input:", user_input)
+                md = await ai_client.complete(
+                    [
+                        {"role": "system", "content": prompt},
+                        {"role": "user", "content": user_input}
+                    ],
+                    timeout=60,
+                )
+                debug_log("AI raw output:", md)
+                set_result_html("")  # Clear before animating
+                # Animate result after a short delay
+                await asyncio.sleep(0.15)
+                set_result_html(f"<div class='workout-output animated-fadein'><div class='markdown-body'>{markdown.markdown(md)}</div></div>")
+            except Exception as e:
+                debug_log("Error in do_request:", e)
+                set_error(f"Error: {e}")
+            finally:
+                set_loading(False)
+        tasks.run(do_request())
 
     # Determine if the form is valid (all required fields set)
     is_form_valid = bool(weight and height and age and target_weight)
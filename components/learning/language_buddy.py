@@ -1,8 +1,8 @@
 import os
 import json
 import asyncio
-import aiohttp
 from reactpy import component, html, use_state, use_effect
+from components.common import ai_admission, ai_client, chat_history
 
 LANGUAGES_PATH = os.path.join(os.path.dirname(__file__), '../../server-assets/languages-en.json')
 with open(LANGUAGES_PATH, encoding='utf-8') as f:
@@ -19,6 +19,8 @@ def LanguageBuddy():
     chat, set_chat = use_state([])           # list of (speaker, message)
     user_input, set_user_input = use_state("")
     is_typing, set_is_typing = use_state(False)
+    session_key = ai_admission.use_session_key()
+    chat_memory = chat_history.use_chat_history()
     error, set_error = use_state("")
     started, set_started = use_state(False)
     feedback, set_feedback = use_state("")
@@ -26,6 +28,7 @@ def LanguageBuddy():
     def handle_start(_event=None):
         set_started(True)
         set_chat([])
+        chat_memory.reset()
         set_feedback("")
         set_error("")
         set_user_input("")
@@ -45,15 +48,6 @@ def LanguageBuddy():
 
     async def send_message(msg):
         try:
-            # Build chat history for context
-            history = []
-            for speaker, message in chat:
-                if speaker == "You":
-                    history.append({"role": "user", "content": message})
-                else:
-                    history.append({"role": "assistant", "content": message})
-            # Add the new user message
-            history.append({"role": "user", "content": msg})
             prompt = (
                 f"You are a friendly AI language buddy. The user is a {level} learner of {target_lang}, "
                 f"whose native language is {native_lang}. They have been learning for {learning_time}. "
@@ -62,36 +56,35 @@ def LanguageBuddy():
                 "Format your response as follows: \n\n<reply>\n\nFEEDBACK: <feedback>. "
                 "Do not use Markdown or HTML formatting."
             )
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "https://ai.hackclub.com/chat/completions",
-                    json={
-                        "messages": [
-                            {"role": "system", "content": prompt},
-                            *history
-                        ],
-                        "max_tokens": 400
-                    },
-                    headers={"Content-Type": "application/json"},
-                    timeout=60,
-                ) as resp:
-                    resp.raise_for_status()
-                    data = await resp.json()
-                    content = data["choices"][0]["message"]["content"]
-                    # Split feedback if present
-                    if "FEEDBACK:" in content:
-                        reply, fb = content.split("FEEDBACK:", 1)
-                        set_chat(chat + [("You", msg), (target_lang, reply.strip())])
-                        set_feedback(fb.strip())
-                    else:
-                        set_chat(chat + [("You", msg), (target_lang, content.strip())])
-                        set_feedback("")
+            # Stream the reply; the FEEDBACK part is held back until the end
+            content = ""
+            async for content in ai_client.stream_text(
+                # Recent turns verbatim, older ones as a rolling summary
+                chat_memory.messages(prompt, chat, msg, session_key),
+                max_tokens=400,
+                timeout=60,
+                session_key=session_key,
+            ):
+                partial_reply = content.split("FEEDBACK:", 1)[0].strip()
+                set_chat(chat + [("You", msg), (target_lang, partial_reply)])
+            # Split feedback if present
+            if "FEEDBACK:" in content:
+                reply, fb = content.split("FEEDBACK:", 1)
+                set_chat(chat + [("You", msg), (target_lang, reply.strip())])
+                set_feedback(fb.strip())
+            else:
+                set_chat(chat + [("You", msg), (target_lang, content.strip())])
+                set_feedback("")
         except Exception as e:
             set_error(f"Error: {e}")
         set_is_typing(False)
 
     # Reset chat whenever setup options change
-    use_effect(lambda: set_chat([]), [native_lang, target_lang, level, learning_time])
+    def reset_chat():
+        set_chat([])
+        chat_memory.reset()
+
+    use_effect(reset_chat, [native_lang, target_lang, level, learning_time])
 
     def render_language_option(lang):
         # lang is a dict with 'name', 'flag', and optionally 'code'
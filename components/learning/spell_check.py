@@ -1,7 +1,7 @@
 from reactpy import component, html, use_state, use_effect
 import json
 import os
-import aiohttp
+from components.common import ai_admission, ai_client, text_chunker
 
 with open(os.path.join(os.path.dirname(__file__), "../../server-assets/language-codes.json"), encoding="utf-8") as f:
     LANGUAGES = json.load(f)
@@ -13,6 +13,7 @@ def SpellCheck():
     lang, set_lang = use_state("en")
     loading, set_loading = use_state(False)
     error, set_error = use_state("")
+    session_key = ai_admission.use_session_key()
 
     def handle_text(e):
         set_text(e["target"]["value"])
@@ -24,7 +25,13 @@ def SpellCheck():
         set_loading(True)
         set_error("")
         try:
-            resp = await fetch_spellcheck(text, lang)
+            # Long texts go out as paragraph/sentence chunks in parallel; finished chunks show up right away
+            set_corrected("")
+            resp = await text_chunker.map_chunks(
+                text,
+                lambda chunk: fetch_spellcheck(chunk, lang),
+                on_progress=set_corrected,
+            )
             set_corrected(resp)
         except Exception as ex:
             set_error(str(ex))
@@ -39,34 +46,27 @@ def SpellCheck():
         import asyncio
         await asyncio.sleep(0)  # yield control
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "https://ai.hackclub.com/chat/completions",
-                    json={
-                        "messages": [
-                            {
-                                "role": "system", 
-                                "content": 
-                                f"You are a helpful AI that corrects spelling and grammar in the language: {lang.upper()}."
-                                "Output the corrected text as plain text only. Do not use Markdown or HTML formatting."
-                                "Only return the corrected text, not explanations."
-                                "Preserve the original formatting and line breaks exactly as in the input."
-                                "Never collapse multiple lines or paragraphs into a single line."
-                                "Output must match the input's line breaks and spacing as closely as possible."
-                                "Do not forget spaces, or punctuation(dots at sentence endings, commas etc)."
-                                "Keep the text as close to the original as possible, while adding necesary punctuation."
-                            },
-                            {"role": "user", "content": text}
-                        ],
-                        "max_tokens": 400
+            return await ai_client.complete(
+                [
+                    {
+                        "role": "system", 
+                        "content": 
+                        f"You are a helpful AI that corrects spelling and grammar in the language: {lang.upper()}."
+                        "Output the corrected text as plain text only. Do not use Markdown or HTML formatting."
+                        "Only return the corrected text, not explanations."
+                        "Preserve the original formatting and line breaks exactly as in the input."
+                        "Never collapse multiple lines or paragraphs into a single line."
+                        "Output must match the input's line breaks and spacing as closely as possible."
+                        "Do not forget spaces, or punctuation(dots at sentence endings, commas etc)."
+                        "Keep the text as close to the original as possible, while adding necesary punctuation."
                     },
-                    headers={"Content-Type": "application/json"},
-                    timeout=60,
-                ) as resp:
-                    resp.raise_for_status()
-                    data = await resp.json()
-                    content = data["choices"][0]["message"]["content"]
-                    return content
+                    {"role": "user", "content": text}
+                ],
+                max_tokens=400,
+                timeout=60,
+                session_key=session_key,
+                cache="spell_check",
+            )
         except Exception as e:
             raise Exception(f"Spell check failed: {e}")
 
@@ -1,7 +1,80 @@
 from reactpy import component, html, use_state
 import asyncio
-import aiohttp
 import markdown
+from components.common import ai_admission, ai_client, text_chunker
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  MAP-REDUCE SUMMARIZATION (for texts too long for one request)
+# ───────────────────────────────────────────────────────────────────────────────
+
+SECTION_TOKENS = 1500           # input size of one section summary call
+SECTION_SUMMARY_TOKENS = 250    # max_tokens for each section / intermediate summary
+REDUCE_TOKENS = 2000            # partial summaries merged per reduce call
+
+SECTION_PROMPT = (
+    "You are a helpful AI that summarizes one section of a longer document. "
+    "Write compact plain-text notes with the key facts, names, numbers and arguments of this section. "
+    "Do not add an introduction or conclusion, and do not mention that this is a section."
+)
+MERGE_PROMPT = (
+    "You are a helpful AI that merges notes from consecutive sections of one document. "
+    "Combine them into compact plain-text notes, keeping the order and the key facts, and removing repetition."
+)
+
+async def _summarize_piece(system_prompt, text, session_key, max_tokens=SECTION_SUMMARY_TOKENS):
+    return (await ai_client.complete(
+        [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": text}
+        ],
+        max_tokens=max_tokens,
+        timeout=60,
+        cache="text_summarizer",
+        session_key=session_key,
+    )).strip()
+
+async def map_reduce_summary(text, final_prompt, on_progress=None, session_key=None):
+    """
+    Summarize a long text: split it into content-defined sections, summarize
+    them in parallel (a few at a time, each cached, so an edited document only
+    recomputes the sections that changed), then merge the partial summaries -
+    recursively if they are still too long - and write the final summary with
+    final_prompt.
+    on_progress(message) reports each step.
+    """
+    def report(message):
+        if on_progress:
+            on_progress(message)
+
+    section_chars = SECTION_TOKENS * text_chunker.CHARS_PER_TOKEN
+    sections = [body for _, body, _ in text_chunker.split_sections(text, section_chars) if body]
+    done = 0
+    report(f"Summarizing {len(sections)} sections...")
+
+    async def summarize_section(body):
+        nonlocal done
+        result = await _summarize_piece(SECTION_PROMPT, body, session_key)
+        done += 1
+        report(f"Summarized {done}/{len(sections)} sections...")
+        return result
+
+    # At most MAX_PER_SESSION calls at once, and the first failure cancels the rest
+    partials = await text_chunker.gather_bounded([lambda body=body: summarize_section(body) for body in sections])
+
+    reduce_chars = REDUCE_TOKENS * text_chunker.CHARS_PER_TOKEN
+    level = 1
+    while len("\n\n".join(partials)) > reduce_chars and len(partials) > 1:
+        groups = [body for _, body, _ in text_chunker.split("\n\n".join(partials), reduce_chars)]
+        if len(groups) >= len(partials):
+            break  # each partial is already too long on its own; let the final call cope
+        report(f"Merging {len(partials)} partial summaries (level {level})...")
+        partials = await text_chunker.gather_bounded(
+            [lambda group=group: _summarize_piece(MERGE_PROMPT, group, session_key) for group in groups]
+        )
+        level += 1
+
+    report("Writing the final summary...")
+    return await _summarize_piece(final_prompt, "\n\n".join(partials), session_key, max_tokens=400)
 
 @component
 def TextSummarizer():
@@ -10,6 +83,8 @@ def TextSummarizer():
     loading, set_loading = use_state(False)
     error, set_error = use_state("")
     summary_type, set_summary_type = use_state("bullets")  # 'bullets' or 'plain'
+    progress, set_progress = use_state("")
+    session_key = ai_admission.use_session_key()
 
     def handle_text(e):
         set_text(e["target"]["value"])
@@ -20,12 +95,14 @@ def TextSummarizer():
     async def summarize_text():
         set_loading(True)
         set_error("")
+        set_progress("")
         try:
             resp = await fetch_summary(text, summary_type)
             html_content = markdown.markdown(resp, extensions=["tables"])
             set_summary_html(f"<div class='markdown-body'>{html_content}</div>")
         except Exception as ex:
             set_error(str(ex))
+        set_progress("")
         set_loading(False)
 
     def handle_submit(e):
@@ -56,23 +133,18 @@ def TextSummarizer():
                     "If the text is very short, just rephrase it concisely. "
                     "Never include explanations or preamble, just the summary."
                 )
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "https://ai.hackclub.com/chat/completions",
-                    json={
-                        "messages": [
-                            {"role": "system", "content": system_prompt},
-                            {"role": "user", "content": text}
-                        ],
-                        "max_tokens": 400
-                    },
-                    headers={"Content-Type": "application/json"},
-                    timeout=60,
-                ) as resp:
-                    resp.raise_for_status()
-                    data = await resp.json()
-                    content = data["choices"][0]["message"]["content"]
-                    return content
+            if text_chunker.estimate_tokens(text) > SECTION_TOKENS:
+                return await map_reduce_summary(text, system_prompt, on_progress=set_progress, session_key=session_key)
+            return await ai_client.complete(
+                [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": text}
+                ],
+                max_tokens=400,
+                timeout=60,
+                cache="text_summarizer",
+                session_key=session_key,
+            )
         except Exception as e:
             raise Exception(f"Summarization failed: {e}")
 
@@ -132,6 +204,7 @@ def TextSummarizer():
                         None if summary_html else html.span({"className": "placeholder"}, "Summary will appear here.")
                     ),
                 ),
+                progress and loading and html.p({"className": "summary-progress"}, progress) or None,
                 error and html.p({"style": {"color": "red"}}, error),
             ),
         ),
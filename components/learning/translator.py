@@ -1,8 +1,8 @@
 from reactpy import component, html, use_state
 import asyncio
-import aiohttp
 import json
 import os
+from components.common import ai_admission, ai_client, text_chunker
 
 with open(os.path.join(os.path.dirname(__file__), "../../server-assets/language-codes.json"), encoding="utf-8") as f:
     LANGUAGES = json.load(f)
@@ -15,6 +15,7 @@ def Translator():
     tgt_lang, set_tgt_lang = use_state("ro")
     loading, set_loading = use_state(False)
     error, set_error = use_state("")
+    session_key = ai_admission.use_session_key()
 
     def handle_text(e):
         set_text(e["target"]["value"])
@@ -35,7 +36,13 @@ def Translator():
         set_loading(True)
         set_error("")
         try:
-            resp = await fetch_translate(text, src_lang, tgt_lang)
+            # Long texts go out as paragraph/sentence chunks in parallel; finished chunks show up right away
+            set_translated("")
+            resp = await text_chunker.map_chunks(
+                text,
+                lambda chunk: fetch_translate(chunk, src_lang, tgt_lang),
+                on_progress=set_translated,
+            )
             set_translated(resp)
         except Exception as ex:
             set_error(str(ex))
@@ -54,23 +61,16 @@ def Translator():
                 "Do not use Markdown or HTML formatting. "
                 "Never include explanations or preamble, just the translation."
             )
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "https://ai.hackclub.com/chat/completions",
-                    json={
-                        "messages": [
-                            {"role": "system", "content": system_prompt},
-                            {"role": "user", "content": text}
-                        ],
-                        "max_tokens": 400
-                    },
-                    headers={"Content-Type": "application/json"},
-                    timeout=60,
-                ) as resp:
-                    resp.raise_for_status()
-                    data = await resp.json()
-                    content = data["choices"][0]["message"]["content"]
-                    return content
+            return await ai_client.complete(
+                [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": text}
+                ],
+                max_tokens=400,
+                timeout=60,
+                session_key=session_key,
+                cache="translator",
+            )
         except Exception as e:
             raise Exception(f"Translation failed: {e}")
 
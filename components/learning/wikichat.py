@@ -1,6 +1,7 @@
 from reactpy import component, html, use_state
 import asyncio
 import wikipedia
+from components.common import ai_admission, ai_client, chat_history
 
 
 # ───────────────────────────────────────────────────────────────────────────────
@@ -23,11 +24,16 @@ def debug_log(*args):
     if DEBUG_MODE:
         print("[wikichat.py DEBUG]", *args)
 
+WIKI_CONTENT_MAX_CHARS = 20000   # how much of the page is kept for the session
+WIKI_EXCERPT_CHARS = 2500        # how much of it is sent with each question
+
 @component
 def WikiChat():
     chat, set_chat = use_state([])  # (speaker, message)
     user_input, set_user_input = use_state("")
     is_typing, set_is_typing = use_state(False)
+    session_key = ai_admission.use_session_key()
+    chat_memory = chat_history.use_chat_history()
     error, set_error = use_state("")
     started, set_started = use_state(False)
     wiki_input, set_wiki_input = use_state("")
@@ -50,9 +56,10 @@ def WikiChat():
                 page = wikipedia.page(title)
                 debug_log("Fetched page:", page.title)
                 set_wiki_title(page.title)
-                set_wiki_content(page.content[:3000])
+                set_wiki_content(page.content[:WIKI_CONTENT_MAX_CHARS])
                 set_started(True)
                 set_chat([])
+                chat_memory.reset()
             except Exception as e:
                 debug_log("Exception in fetching Wikipedia page by link:", e)
                 set_wiki_error(f"Could not fetch page: {e}")
@@ -82,9 +89,10 @@ def WikiChat():
                     set_wiki_error(f"Could not fetch any search result page. Try another search.")
                     return
                 set_wiki_title(page.title)
-                set_wiki_content(page.content[:3000])
+                set_wiki_content(page.content[:WIKI_CONTENT_MAX_CHARS])
                 set_started(True)
                 set_chat([])
+                chat_memory.reset()
             except Exception as e:
                 debug_log("Exception in Wikipedia search:", e)
                 set_wiki_error(f"Wikipedia error: {e}")
@@ -95,40 +103,32 @@ def WikiChat():
         set_error("")
         set_chat(lambda c: c + [("You", msg)])
         try:
-            import aiohttp
             if wiki_title and wiki_content:
                 debug_log("Preparing chat history for AI", chat)
-                history = []
-                for speaker, message in chat:
-                    if speaker == "You":
-                        history.append({"role": "user", "content": message})
-                    else:
-                        history.append({"role": "assistant", "content": message})
-                history.append({"role": "user", "content": msg})
+                # Only the parts of the page related to this question (and the last reply)
+                last_reply = chat[-1][1] if chat and chat[-1][0] != "You" else ""
+                excerpt = chat_history.relevant_excerpt(wiki_content, f"{msg} {last_reply}", WIKI_EXCERPT_CHARS)
                 system_prompt = (
                     f"You are a helpful assistant. The user is chatting about a Wikipedia page. "
-                    f"Here is the page content (may be truncated):\n{wiki_content}\n\nAnswer the user's questions or chat about this topic. If you don't know, say 'I don't know'. "
+                    f"Here are the relevant parts of the page content (may be truncated):\n{excerpt}\n\nAnswer the user's questions or chat about this topic. If you don't know, say 'I don't know'. "
                     "Do NOT make up facts."
                 )
-                debug_log("Sending to AI endpoint", system_prompt, history)
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        "https://ai.hackclub.com/chat/completions",
-                        headers={"Content-Type": "application/json"},
-                        json={
-                            "messages": [
-                                {"role": "system", "content": system_prompt},
-                                *history
-                            ]
-                        },
-                        timeout=aiohttp.ClientTimeout(total=60)
-                    ) as resp:
-                        debug_log("AI endpoint response status:", resp.status)
-                        resp.raise_for_status()
-                        data = await resp.json()
-                debug_log("AI response data:", data)
-                reply = data["choices"][0]["message"]["content"]
-                set_chat(lambda c: c + [(wiki_title, reply)])
+                # Recent turns verbatim, older ones as a rolling summary
+                messages = chat_memory.messages(system_prompt, chat, msg, session_key)
+                debug_log("Sending to AI endpoint", messages)
+                # Stream the reply into the last bubble as it arrives
+                reply = None
+                async for partial in ai_client.stream_text(
+                    messages,
+                    timeout=60,
+                    session_key=session_key,
+                ):
+                    if reply is None:
+                        set_chat(lambda c, p=partial: c + [(wiki_title, p)])
+                    else:
+                        set_chat(lambda c, p=partial: c[:-1] + [(wiki_title, p)])
+                    reply = partial
+                debug_log("AI reply:", reply)
         except Exception as e:
             debug_log("Exception in send_message:", e)
             set_error(f"AI error: {e}")
@@ -1,9 +1,9 @@
 from reactpy import component, html, use_state
-import aiohttp
 import asyncio
 import json
 import base64
 import re
+from components.common import ai_client, json_stream
 
 
 @component
@@ -63,35 +63,21 @@ def HTML5PortfolioBuilder():
                 "- For the 'color_style', extract 2-3 hex color codes as an array called 'hexes', and rewrite as 'color_style_desc'.",
                 "Return JSON only. No explanations or ```.",
             ]
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "https://ai.hackclub.com/chat/completions",
-                    headers={"Content-Type": "application/json"},
-                    json={
-                        "messages": [
-                            {"role": "system", "content": "\n".join(instructions)},
-                            {"role": "user", "content": json.dumps(input_obj)}
-                        ]
-                    },
-                    timeout=90
-                ) as resp:
-                    data = await resp.json()
-                    ai_raw = data["choices"][0]["message"]["content"]
-                    ai_clean = ai_raw.strip()
-                    if ai_clean.startswith("```"):
-                        ai_clean = ai_clean.lstrip("`\n ")
-                    if ai_clean.endswith("```"):
-                        ai_clean = ai_clean.rstrip("`\n ")
-                    if ai_clean.startswith("json"):
-                        ai_clean = ai_clean[4:].lstrip("\n ")
-                    result = json.loads(ai_clean)
-                    return {
-                        "title": result.get("title", title),
-                        "subtitle": result.get("subtitle", subtitle),
-                        "color_style_desc": result.get("color_style_desc", color_style),
-                        "hexes": result.get("hexes", []),
-                        "projects": result.get("projects", projects)
-                    }
+            ai_raw = await ai_client.complete(
+                [
+                    {"role": "system", "content": "\n".join(instructions)},
+                    {"role": "user", "content": json.dumps(input_obj)}
+                ],
+                timeout=90,
+            )
+            result = json_stream.loads(ai_raw, root="{")
+            return {
+                "title": result.get("title", title),
+                "subtitle": result.get("subtitle", subtitle),
+                "color_style_desc": result.get("color_style_desc", color_style),
+                "hexes": result.get("hexes", []),
+                "projects": result.get("projects", projects)
+            }
         except Exception as e:
             return {"title": title, "subtitle": subtitle, "color_style_desc": color_style, "hexes": [], "projects": projects}
 
@@ -1,7 +1,6 @@
 from reactpy import component, html, use_state
-import aiohttp
-import json
 import asyncio
+from components.common import ai_client, json_stream
 
 @component
 def AIColorPicker():
@@ -41,31 +40,18 @@ def AIColorPicker():
                 "For each color, provide a very short (1 phrase) meaning or feeling it represents, in the 'meanings' array, same order as 'colors'. "
                 "Do not include any text outside the JSON object."
             )
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "https://ai.hackclub.com/chat/completions",
-                    headers={"Content-Type": "application/json"},
-                    json={
-                        "messages": [
-                            {"role": "system", "content": prompt},
-                            {"role": "user", "content": f"Project description: {description}\nNumber of colors: {n}\n"}
-                        ]
-                    },
-                    timeout=60
-                ) as response:
-                    if response.status != 200:
-                        raise RuntimeError(f"AI model returned {response.status}")
-                    data = await response.json()
-                    content = data["choices"][0]["message"]["content"].strip()
-                    import re
-                    match = re.search(r'\{.*\}', content, re.DOTALL)
-                    if not match:
-                        raise ValueError("No JSON found in AI response.")
-                    json_str = match.group(0)
-                    palette_data = json.loads(json_str)
-                    set_palette(palette_data.get("colors", []))
-                    set_ai_message(palette_data.get("message", ""))
-                    set_color_meanings(palette_data.get("meanings", []))
+            content = await ai_client.complete(
+                [
+                    {"role": "system", "content": prompt},
+                    {"role": "user", "content": f"Project description: {description}\nNumber of colors: {n}\n"}
+                ],
+                timeout=60,
+                cache="color_picker",
+            )
+            palette_data = json_stream.loads(content, root="{")
+            set_palette(palette_data.get("colors", []))
+            set_ai_message(palette_data.get("message", ""))
+            set_color_meanings(palette_data.get("meanings", []))
         except Exception as e:
             set_error(f"Error: {e}")
         set_loading(False)
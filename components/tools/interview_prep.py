@@ -1,8 +1,8 @@
 from reactpy import component, html, use_state
 import markdown
-import aiohttp
 import json
 import asyncio
+from components.common import ai_client
 
 @component
 def InterviewPrep():
@@ -53,29 +53,21 @@ def InterviewPrep():
                 "- [Specific advice for the role]\n\n"
                 "\nProvide 2-3 questions per selected category, with detailed sample answers and interviewer tips."
             )
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "https://ai.hackclub.com/chat/completions",
-                    headers={"Content-Type": "application/json"},
-                    json={
-                        "messages": [
-                            {"role": "system", "content": prompt},
-                            {"role": "user", "content": (
-                                f"Role: {role}\n"
-                                f"Experience Level: {experience_level}\n"
-                                f"Question Type: {question_type}\n"
-                                f"Categories to focus on: {categories_str}\n"
-                            )}
-                        ]
-                    },
-                    timeout=60
-                ) as response:
-                    if response.status != 200:
-                        raise RuntimeError(f"AI model returned {response.status}")
-                    data = await response.json()
-                    md_content = data["choices"][0]["message"]["content"]
-                    html_content = markdown.markdown(md_content, extensions=["tables", "extra"])
-                    set_output_html(f"<div class='markdown-body'>{html_content}</div>")
+            md_content = await ai_client.complete(
+                [
+                    {"role": "system", "content": prompt},
+                    {"role": "user", "content": (
+                        f"Role: {role}\n"
+                        f"Experience Level: {experience_level}\n"
+                        f"Question Type: {question_type}\n"
+                        f"Categories to focus on: {categories_str}\n"
+                    )}
+                ],
+                timeout=60,
+                cache="interview_prep",
+            )
+            html_content = markdown.markdown(md_content, extensions=["tables", "extra"])
+            set_output_html(f"<div class='markdown-body'>{html_content}</div>")
         except Exception as e:
             set_output_html(f"An error occurred: {str(e)}")
         set_loading(False)
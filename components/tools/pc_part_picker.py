@@ -1,13 +1,11 @@
 from reactpy import component, html, use_state
-import aiohttp
-import asyncio
 import markdown
-import os
 import json
 import datetime
 import re
+from components.common import ai_admission, ai_client, exchange_rates, json_stream, part_index, pc_catalog, pc_solver, task_runner
 
-DATA_PATH = "static/assets/pc_parts"
+SECTION_TIMEOUT = 30  # seconds a post-build section (expert analysis, game estimates) may take before it is dropped
 
 
 # ───────────────────────────────────────────────────────────────────────────────
@@ -32,66 +30,11 @@ def debug_log(*args):
 
 
 
-# Load all relevant datasets into a dict for easy lookup
-def load_json(filename):
-    try:
-        if DEBUG_MODE:
-            print(f"[DEBUG] Loading dataset: {filename}")
-        with open(os.path.join(DATA_PATH, filename), "r") as f:
-            data = json.load(f)
-            if DEBUG_MODE:
-                print(f"[DEBUG] Loaded {len(data)} items from {filename}")
-            return data
-    except Exception as e:
-        if DEBUG_MODE:
-            print(f"[DEBUG] Failed to load {filename}: {e}")
-        return []
-
-def find_best_match(name, dataset):
-    if DEBUG_MODE:
-        print(f"[DEBUG] Matching part: '{name}' in dataset of size {len(dataset)}")
-    # Try exact match, then case-insensitive, then partial
-    for item in dataset:
-        if item.get("name", "").lower() == name.lower():
-            return item
-    for item in dataset:
-        if name.lower() in item.get("name", "").lower():
-            return item
-    return None
-
-def smart_find_best_match(name, dataset):
-    """
-    Try to match using brand and model keywords, not just the full string.
-    E.g., if AI outputs 'nvidia' and '3060', match 'GeForce RTX 3060'.
-    """
-    if not name or not dataset:
-        return None
-    name = name.lower()
-    # Split on space, dash, etc. to get tokens
-    tokens = re.split(r"[\s\-_/]+", name)
-    tokens = [t for t in tokens if t]
-    # Try to match all tokens in the item name (case-insensitive)
-    for item in dataset:
-        item_name = item.get("name", "").lower()
-        if all(token in item_name for token in tokens):
-            return item
-    # Try to match any token in the item name
-    for item in dataset:
-        item_name = item.get("name", "").lower()
-        if any(token in item_name for token in tokens):
-            return item
-    # Fallback to partial match
-    for item in dataset:
-        if name in item.get("name", "").lower():
-            return item
-    return None
-
 @component
 def PCPartPicker():
     from reactpy import use_effect
     currency_list, set_currency_list = use_state([])
     currency, set_currency = use_state("eur")
-    exchange_rates, set_exchange_rates = use_state({})
     budget, set_budget = use_state(1000)
     use_case, set_use_case = use_state("Gaming")
     perf_level, set_perf_level = use_state("Medium")
@@ -103,35 +46,20 @@ def PCPartPicker():
     games, set_games = use_state("")
     result_md, set_result_md = use_state("")
     loading, set_loading = use_state(False)
+    session_key = ai_admission.use_session_key()
     error, set_error = use_state("")
-    parts_loading, set_parts_loading = use_state(True)
-    datasets, set_datasets = use_state({
-        "cpu": [], "gpu": [], "motherboard": [], "ram": [], "storage": [], "psu": [], "case": []
-    })
+    parts_loading, set_parts_loading = use_state(not pc_solver.is_ready())
+    tasks = task_runner.use_task_runner("pc_part_picker")
 
-    # Load datasets only once on mount
-    def load_all():
-        if DEBUG_MODE:
-            print("[DEBUG] Loading all datasets...")
-        ds = {
-            "cpu": load_json("cpu.json"),
-            "gpu": load_json("video-card.json"),
-            "motherboard": load_json("motherboard.json"),
-            "ram": load_json("memory.json"),
-            "storage": load_json("internal-hard-drive.json"),
-            "psu": load_json("power-supply.json"),
-            "case": load_json("case.json"),
-        }
-        if DEBUG_MODE:
-            print("[DEBUG] All datasets loaded.")
-        return ds
-
-    def load_datasets_once():
-        set_parts_loading(True)
-        ds = load_all()
-        set_datasets(ds)
-        set_parts_loading(False)
-    use_effect(load_datasets_once, [])
+    # The part catalog and its search index are shared by all sessions; only the first visitor after startup may wait for them
+    def ensure_catalog():
+        if not parts_loading:
+            return
+        async def load():
+            await task_runner.run_blocking(pc_solver.prepare)
+            set_parts_loading(False)
+        tasks.run(load())
+    use_effect(ensure_catalog, [])
 
     # Novice-friendly dropdowns
     def dropdown(label, value, set_value, options, explanation, id_):
@@ -202,218 +130,8 @@ def PCPartPicker():
         if DEBUG_MODE:
             print(msg)
 
-    async def ai_post(url, payload, timeout=60):
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                url,
-                json=payload,
-                headers={"Content-Type": "application/json"},
-                timeout=timeout
-            ) as resp:
-                return await resp.json()
-
-    async def handle_submit(event=None):
-        if loading:
-            debug("[DEBUG] Submit ignored: already loading.")
-            return  # Prevent double-clicks
-        set_loading(True)
-        set_result_md("")
-        set_error("")
-        # Convert user budget to EUR for AI
-        budget_eur = convert_to_eur(budget, currency)
-        # --- Check for impossible config before AI call ---
-        impossible_msg = is_impossible_config(budget_eur, use_case, perf_level)
-        if impossible_msg:
-            set_error(impossible_msg)
-            set_loading(False)
-            return
-        brand_pref_str = brand_pref.strip() if brand_pref.strip() else "Doesn't matter"
-        games_str = games.strip() if games.strip() else "(not specified)"
-        user_prefs = (
-            f"Budget: {int(budget_eur)} EUR\n"
-            f"Use case: {use_case}\n"
-            f"Performance: {perf_level}\n"
-            f"Noise: {noise_pref}\n"
-            f"Size: {size_pref}\n"
-            f"Preferred Brands: {brand_pref_str}\n"
-            f"Wi-Fi/Bluetooth: {wifi_pref}\n"
-            f"Upgradeability: {upgrade_pref}\n"
-            f"Games: {games_str}\n"
-        )
-        debug(f"[PCPartPicker] {datetime.datetime.now().isoformat()}\nUser preferences (AI gets EUR):\n{user_prefs}")
-        tries = 0
-        max_tries = 6
-        last_missing = None
-        debug(f"[DEBUG] Entering AI build loop (max_tries={max_tries})")
-        while tries < max_tries:
-            tries += 1
-            debug(f"[DEBUG] AI request attempt {tries} (last_missing={last_missing})")
-            prompt = SYSTEM_PROMPT + "\nUser preferences:\n" + user_prefs
-            if last_missing:
-                dataset_snippet = datasets.get(last_missing, [])[:3]
-                for item in dataset_snippet:
-                    if "price" in item and item.get("price") is not None:
-                        item["price_eur"] = round(convert_to_eur(item["price"], "usd"), 2)
-                snippet_str = json.dumps(dataset_snippet, ensure_ascii=False)
-                prompt += (f"\nLast time, the part '{last_missing}' could not be found in the dataset. "
-                           f"Please suggest a different, more common or compatible {last_missing}. "
-                           f"Here is a snippet of the {last_missing} database (prices in EUR):\n{snippet_str}\n")
-            debug(f"[DEBUG] Prompt sent to AI (length={len(prompt)}):\n{prompt}")
-            try:
-                payload = {
-                    "messages": [
-                        {"role": "system", "content": SYSTEM_PROMPT},
-                        {"role": "user", "content": user_prefs}
-                    ],
-                    "max_tokens": 400
-                }
-                raw_json = await ai_post("https://ai.hackclub.com/chat/completions", payload, timeout=60)
-                text = raw_json.get("choices", [{}])[0].get("message", {}).get("content", "")
-                debug(f"[PCPartPicker][AI raw response]:\n{text}")
-                if not text.strip():
-                    debug("[DEBUG] AI response text is empty!")
-                    set_error("AI returned an empty response. Try again.")
-                    break
-                # Use non-greedy regex with DOTALL to extract the first JSON object
-                matches = list(re.finditer(r"\{.*?\}", text, re.DOTALL))
-                debug(f"[DEBUG] Regex matches found: {len(matches)}")
-                if len(matches) > 1:
-                    debug(f"[DEBUG] Warning: Multiple JSON objects found in AI response. Using the first one.")
-                match = matches[0] if matches else None
-                debug(f"[DEBUG] Regex match: {match}")
-                if not match:
-                    debug("[DEBUG] No JSON object found in AI response.")
-                    set_error("AI did not return a JSON object. Try again.")
-                    with open("ai_debug.log", "a") as f:
-                        f.write(f"\n[NO JSON] {datetime.datetime.now().isoformat()}\nPrompt:\n{prompt}\nAI raw text:\n{text}\n\n")
-                    break
-                json_str = match.group(0)
-                debug(f"[DEBUG] Extracted JSON string (to be parsed):\n{json_str}")
-                try:
-                    data = json.loads(json_str.replace("'", '"'))
-                    debug(f"[DEBUG] Parsed JSON: {data}")
-                except Exception as e:
-                    debug(f"[DEBUG] JSON parse error: {e}")
-                    debug(f"[DEBUG] Problematic string: {json_str}")
-                    with open("ai_debug.log", "a") as f:
-                        f.write(f"\n[JSON ERROR] {datetime.datetime.now().isoformat()}\nPrompt:\n{prompt}\nAI raw text:\n{text}\nExtracted JSON string:\n{json_str}\nError: {e}\n\n")
-                    set_error(f"AI JSON parse error: {e}")
-                    break
-                build = {}
-                missing = None
-                for part, name in data.items():
-                    debug(f"[DEBUG] Matching {part}: {name}")
-                    match = smart_find_best_match(name, datasets.get(part, []))
-                    if not match:
-                        match = find_best_match(name, datasets.get(part, []))
-                    if match:
-                        debug(f"[DEBUG] Found match for {part}: {match.get('name')}")
-                        build[part] = match
-                    else:
-                        debug(f"[DEBUG] No match for {part}: {name}")
-                        missing = part
-                        break
-                if not missing:
-                    debug("[DEBUG] All parts matched. Rendering markdown.")
-                    # Calculate total price in EUR, USD, and user currency
-                    total_eur = 0.0
-                    total_usd = 0.0
-                    total_user = 0.0
-                    for part, info in build.items():
-                        if info.get('price'):
-                            price_eur = round(convert_to_eur(info['price'], 'usd'), 2)
-                            price_user = round(convert_from_eur(price_eur, currency), 2)
-                            price_usd = info['price']
-                            total_eur += price_eur
-                            total_usd += price_usd
-                            total_user += price_user
-                    md = f"# Your PC Build\n\n"
-                    for part, info in build.items():
-                        md += f"**{part.upper()}**: {info.get('name', 'Unknown')}\n"
-                        if info.get('price'):
-                            price_eur = round(convert_to_eur(info['price'], 'usd'), 2)
-                            price_user = round(convert_from_eur(price_eur, currency), 2)
-                            md += f"- Price: {price_user} {currency.upper()} (original: ${info['price']} USD, €{price_eur} EUR)\n"
-                        if info.get('brand'):
-                            md += f"- Brand: {info['brand']}\n"
-                        if info.get('specs'):
-                            md += f"- Specs: {info['specs']}\n"
-                        md += "\n"
-                    md += f"**Total Price:** {round(total_user,2)} {currency.upper()} (original: ${round(total_usd,2)} USD, €{round(total_eur,2)} EUR)\n\n"
-                    md += "---\n"
-                    md += "## Tips & Recommendations\n"
-                    md += (
-                        "- Double-check compatibility before buying.\n"
-                        "- Prices and availability may have changed since 2024.\n"
-                        "- If you want to upgrade, consider increasing your budget or performance level.\n"
-                    )
-                    set_result_md(md)
-                    # --- Query AI again for expert analysis ---
-                    try:
-                        build_summary = ", ".join([f"{part}: {info.get('name','Unknown')}" for part, info in build.items()])
-                        analysis_prompt = (
-                            "You are a PC building expert. Given a build, "
-                            "provide a short analysis of potential bottlenecks, system balance, upgrade advice, and any expert opinions. State everything is according to you, an AI, not any bottlenech calculators and so on."
-                            "Be concise and helpful."
-                        )
-                        analysis_payload = {
-                            "messages": [
-                                {"role": "system", "content": analysis_prompt},
-                                {"role": "user", "content": build_summary}
-                            ],
-                            "max_tokens": 250
-                        }
-                        analysis_json = await ai_post("https://ai.hackclub.com/chat/completions", analysis_payload, timeout=40)
-                        analysis_text = analysis_json.get("choices", [{}])[0].get("message", {}).get("content", "")
-                        if analysis_text:
-                            set_result_md(lambda prev: prev + "\n---\n## Expert Analysis\n" + analysis_text.strip())
-                    except Exception as e:
-                        debug(f"[DEBUG] Error during expert analysis AI call: {e}")
-                    # --- Query AI again for game performance estimates ---
-                    try:
-                        build_summary = ", ".join([f"{part}: {info.get('name','Unknown')}" for part, info in build.items()])
-                        games_list = games.strip() if games.strip() else None
-                        if games_list:
-                            perf_prompt = (
-                                "You are a PC gaming expert. Given a build, "
-                                "estimate how games would run on it. "
-                                "For each game, estimate the expected settings (e.g., low/medium/high/ultra), resolution, and FPS. "
-                                "If a game is not in your knowledge base, say so. "
-                                "Add a disclaimer that these are AI-generated estimates and may not be accurate."
-                            )
-                            perf_payload = {
-                                "messages": [
-                                    {"role": "system", "content": perf_prompt},
-                                    {"role": "user", "content": f"Build: {build_summary}, Games: {games_list}."}
-                                ],
-                                "max_tokens": 300
-                            }
-                            perf_json = await ai_post("https://ai.hackclub.com/chat/completions", perf_payload, timeout=40)
-                            perf_text = perf_json.get("choices", [{}])[0].get("message", {}).get("content", "")
-                            if perf_text:
-                                # Ensure each '- ' is on its own line for Markdown
-                                perf_text_md = re.sub(r'(?<!\n)- ', '\n- ', perf_text)
-                                set_result_md(lambda prev: prev + "\n---\n## Game Performance Estimates\n" + perf_text_md.strip())
-                    except Exception as e:
-                        debug(f"[DEBUG] Error during game performance AI call: {e}")
-                    set_loading(False)
-                    debug("[DEBUG] Done. Build and analysis shown to user.")
-                    return
-                else:
-                    last_missing = missing
-                    debug(f"[DEBUG] Will retry for missing part: {missing}")
-                    continue
-            except Exception as e:
-                debug(f"[DEBUG] Exception during AI call: {e}")
-                set_error(f"Error: {e}")
-                break
-        if not result_md:
-            debug("[DEBUG] Could not find a compatible build after several tries.")
-            set_result_md("Could not find a compatible build after several tries. Please adjust your preferences and try again.")
-        set_loading(False)
-
     def handle_submit_click(event=None):
-        asyncio.create_task(handle_submit(event))
+        tasks.run(handle_submit(event))
 
     # Fetch currency list on mount
     def fetch_currencies():
@@ -427,23 +145,6 @@ def PCPartPicker():
             set_currency_list([("eur", "Euro"), ("usd", "US Dollar")])
     use_effect(fetch_currencies, [])
 
-    # Fetch exchange rates on mount and when currency changes
-    async def fetch_exchange_rates():
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get("https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@latest/v1/currencies/eur.json", timeout=10) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        rates = data.get("eur", {})
-                        set_exchange_rates(rates)
-                        if DEBUG_MODE:
-                            print(f"[DEBUG] Fetched exchange rates")
-                    else:
-                        set_exchange_rates({"usd": 1.09, "eur": 1.0})
-        except Exception as e:
-            set_exchange_rates({"usd": 1.09, "eur": 1.0})
-    use_effect(lambda: asyncio.create_task(fetch_exchange_rates()), [currency])
-
     # Budget input with currency dropdown
     def budget_input():
         def handle_budget_change(e):
@@ -471,32 +172,16 @@ def PCPartPicker():
             ])
         )
 
-    # Currency conversion utility
+    # Currency conversion utility (rates are shared and refreshed by components.common.exchange_rates)
     def convert_to_eur(amount, from_currency):
-        if from_currency == "eur" or not exchange_rates:
-            return amount
-        rate = exchange_rates.get(from_currency, None)
-        if rate is None:
-            if DEBUG_MODE:
-                print(f"[DEBUG] No exchange rate for {from_currency}, returning original amount.")
-            return amount
-        converted = amount / rate
-        if DEBUG_MODE:
-            print(f"[DEBUG] Converted {amount} {from_currency.upper()} to {converted:.2f} EUR (rate: {rate})")
-        return converted
+        if DEBUG_MODE and exchange_rates.rate(from_currency) is None:
+            print(f"[DEBUG] No exchange rate for {from_currency}, returning original amount.")
+        return exchange_rates.to_eur(amount, from_currency)
 
     def convert_from_eur(amount_eur, to_currency):
-        if to_currency == "eur" or not exchange_rates:
-            return amount_eur
-        rate = exchange_rates.get(to_currency, None)
-        if rate is None:
-            if DEBUG_MODE:
-                print(f"[DEBUG] No exchange rate for {to_currency}, returning EUR amount.")
-            return amount_eur
-        converted = amount_eur * rate
-        if DEBUG_MODE:
-            print(f"[DEBUG] Converted {amount_eur} EUR to {converted:.2f} {to_currency.upper()} (rate: {rate})")
-        return converted
+        if DEBUG_MODE and exchange_rates.rate(to_currency) is None:
+            print(f"[DEBUG] No exchange rate for {to_currency}, returning EUR amount.")
+        return exchange_rates.from_eur(amount_eur, to_currency)
 
     # --- Helper: Check for impossible config ---
     def is_impossible_config(budget_eur, use_case, perf_level):
@@ -539,225 +224,170 @@ def PCPartPicker():
         set_loading(True)
         set_result_md("")
         set_error("")
-        # Convert user budget to EUR for AI
-        budget_eur = convert_to_eur(budget, currency)
-        # --- Check for impossible config before AI call ---
-        impossible_msg = is_impossible_config(budget_eur, use_case, perf_level)
-        if impossible_msg:
-            set_error(impossible_msg)
-            set_loading(False)
-            return
-        brand_pref_str = brand_pref.strip() if brand_pref.strip() else "Doesn't matter"
-        games_str = games.strip() if games.strip() else "(not specified)"
-        user_prefs = (
-            f"Budget: {int(budget_eur)} EUR\n"
-            f"Use case: {use_case}\n"
-            f"Performance: {perf_level}\n"
-            f"Noise: {noise_pref}\n"
-            f"Size: {size_pref}\n"
-            f"Preferred Brands: {brand_pref_str}\n"
-            f"Wi-Fi/Bluetooth: {wifi_pref}\n"
-            f"Upgradeability: {upgrade_pref}\n"
-            f"Games: {games_str}\n"
-        )
-        debug(f"[PCPartPicker] {datetime.datetime.now().isoformat()}\nUser preferences (AI gets EUR):\n{user_prefs}")
-        tries = 0
-        max_tries = 6
-        last_missing = None
-        debug(f"[DEBUG] Entering AI build loop (max_tries={max_tries})")
-        while tries < max_tries:
-            tries += 1
-            debug(f"[DEBUG] AI request attempt {tries} (last_missing={last_missing})")
-            prompt = SYSTEM_PROMPT + "\nUser preferences:\n" + user_prefs
-            if last_missing:
-                dataset_snippet = datasets.get(last_missing, [])[:3]
-                for item in dataset_snippet:
-                    if "price" in item and item.get("price") is not None:
-                        item["price_eur"] = round(convert_to_eur(item["price"], "usd"), 2)
-                snippet_str = json.dumps(dataset_snippet, ensure_ascii=False)
-                prompt += (f"\nLast time, the part '{last_missing}' could not be found in the dataset. "
-                           f"Please suggest a different, more common or compatible {last_missing}. "
-                           f"Here is a snippet of the {last_missing} database (prices in EUR):\n{snippet_str}\n")
-            debug(f"[DEBUG] Prompt sent to AI (length={len(prompt)}):\n{prompt}")
+        try:
+            # Convert user budget to EUR for AI
+            budget_eur = convert_to_eur(budget, currency)
+            # --- Check for impossible config before AI call ---
+            impossible_msg = is_impossible_config(budget_eur, use_case, perf_level)
+            if impossible_msg:
+                set_error(impossible_msg)
+                return
+            brand_pref_str = brand_pref.strip() if brand_pref.strip() else "Doesn't matter"
+            games_str = games.strip() if games.strip() else "(not specified)"
+            user_prefs = (
+                f"Budget: {int(budget_eur)} EUR\n"
+                f"Use case: {use_case}\n"
+                f"Performance: {perf_level}\n"
+                f"Noise: {noise_pref}\n"
+                f"Size: {size_pref}\n"
+                f"Preferred Brands: {brand_pref_str}\n"
+                f"Wi-Fi/Bluetooth: {wifi_pref}\n"
+                f"Upgradeability: {upgrade_pref}\n"
+                f"Games: {games_str}\n"
+            )
+            debug(f"[PCPartPicker] {datetime.datetime.now().isoformat()}\nUser preferences (AI gets EUR):\n{user_prefs}")
+            debug("[DEBUG] Requesting build suggestion")
             try:
-                payload = {
-                    "messages": [
+                text = await ai_client.complete(
+                    [
                         {"role": "system", "content": SYSTEM_PROMPT},
                         {"role": "user", "content": user_prefs}
                     ],
-                    "max_tokens": 400
-                }
-                raw_json = await ai_post("https://ai.hackclub.com/chat/completions", payload, timeout=60)
-                text = raw_json.get("choices", [{}])[0].get("message", {}).get("content", "")
-                debug(f"[PCPartPicker][AI raw response]:\n{text}")
-                if not text.strip():
-                    debug("[DEBUG] AI response text is empty!")
-                    set_error("AI returned an empty response. Try again.")
-                    break
-                # Use non-greedy regex with DOTALL to extract the first JSON object
-                matches = list(re.finditer(r"\{.*?\}", text, re.DOTALL))
-                debug(f"[DEBUG] Regex matches found: {len(matches)}")
-                if len(matches) > 1:
-                    debug(f"[DEBUG] Warning: Multiple JSON objects found in AI response. Using the first one.")
-                match = matches[0] if matches else None
-                debug(f"[DEBUG] Regex match: {match}")
-                if not match:
-                    debug("[DEBUG] No JSON object found in AI response.")
-                    set_error("AI did not return a JSON object. Try again.")
-                    with open("ai_debug.log", "a") as f:
-                        f.write(f"\n[NO JSON] {datetime.datetime.now().isoformat()}\nPrompt:\n{prompt}\nAI raw text:\n{text}\n\n")
-                    break
-                json_str = match.group(0)
-                debug(f"[DEBUG] Extracted JSON string (to be parsed):\n{json_str}")
-                try:
-                    data = json.loads(json_str.replace("'", '"'))
-                    debug(f"[DEBUG] Parsed JSON: {data}")
-                except Exception as e:
-                    debug(f"[DEBUG] JSON parse error: {e}")
-                    debug(f"[DEBUG] Problematic string: {json_str}")
-                    with open("ai_debug.log", "a") as f:
-                        f.write(f"\n[JSON ERROR] {datetime.datetime.now().isoformat()}\nPrompt:\n{prompt}\nAI raw text:\n{text}\nExtracted JSON string:\n{json_str}\nError: {e}\n\n")
-                    set_error(f"AI JSON parse error: {e}")
-                    break
-                build = {}
-                missing = None
-                for part, name in data.items():
-                    debug(f"[DEBUG] Matching {part}: {name}")
-                    match = smart_find_best_match(name, datasets.get(part, []))
-                    if not match:
-                        match = find_best_match(name, datasets.get(part, []))
-                    if match:
-                        debug(f"[DEBUG] Found match for {part}: {match.get('name')}")
-                        build[part] = match
-                    else:
-                        debug(f"[DEBUG] No match for {part}: {name}")
-                        missing = part
-                        break
-                if not missing:
-                    debug("[DEBUG] All parts matched. Rendering markdown.")
-                    # Calculate total price in EUR, USD, and user currency
-                    total_eur = 0.0
-                    total_usd = 0.0
-                    total_user = 0.0
-                    for part, info in build.items():
-                        if info.get('price'):
-                            price_eur = round(convert_to_eur(info['price'], 'usd'), 2)
-                            price_user = round(convert_from_eur(price_eur, currency), 2)
-                            price_usd = info['price']
-                            total_eur += price_eur
-                            total_usd += price_usd
-                            total_user += price_user
-                    md = f"# Your PC Build\n\n"
-                    for part, info in build.items():
-                        md += f"**{part.upper()}**: {info.get('name', 'Unknown')}\n"
-                        if info.get('price'):
-                            price_eur = round(convert_to_eur(info['price'], 'usd'), 2)
-                            price_user = round(convert_from_eur(price_eur, currency), 2)
-                            md += f"- Price: {price_user} {currency.upper()} (original: ${info['price']} USD, €{price_eur} EUR)\n"
-                        if info.get('brand'):
-                            md += f"- Brand: {info['brand']}\n"
-                        if info.get('specs'):
-                            md += f"- Specs: {info['specs']}\n"
-                        md += "\n"
-                    md += f"**Total Price:** {round(total_user,2)} {currency.upper()} (original: ${round(total_usd,2)} USD, €{round(total_eur,2)} EUR)\n\n"
-                    md += "---\n"
-                    md += "## Tips & Recommendations\n"
-                    md += (
-                        "- Double-check compatibility before buying.\n"
-                        "- Prices and availability may have changed since 2024.\n"
-                        "- If you want to upgrade, consider increasing your budget or performance level.\n"
-                    )
-                    set_result_md(md)
-                    # --- Query AI again for expert analysis ---
-                    try:
-                        build_summary = ", ".join([f"{part}: {info.get('name','Unknown')}" for part, info in build.items()])
-                        analysis_prompt = (
-                            "You are a PC building expert. Given a build, "
-                            "provide a short analysis of potential bottlenecks, system balance, upgrade advice, and any expert opinions. State everything is according to you, an AI, not any bottlenech calculators and so on."
-                            "Be concise and helpful."
-                        )
-                        analysis_payload = {
-                            "messages": [
-                                {"role": "system", "content": analysis_prompt},
-                                {"role": "user", "content": build_summary}
-                            ],
-                            "max_tokens": 250
-                        }
-                        analysis_json = await ai_post("https://ai.hackclub.com/chat/completions", analysis_payload, timeout=40)
-                        analysis_text = analysis_json.get("choices", [{}])[0].get("message", {}).get("content", "")
-                        if analysis_text:
-                            set_result_md(lambda prev: prev + "\n---\n## Expert Analysis\n" + analysis_text.strip())
-                    except Exception as e:
-                        debug(f"[DEBUG] Error during expert analysis AI call: {e}")
-                    # --- Query AI again for game performance estimates ---
-                    try:
-                        build_summary = ", ".join([f"{part}: {info.get('name','Unknown')}" for part, info in build.items()])
-                        games_list = games.strip() if games.strip() else None
-                        if games_list:
-                            perf_prompt = (
-                                "You are a PC gaming expert. Given a build, "
-                                "estimate how games would run on it. "
-                                "For each game, estimate the expected settings (e.g., low/medium/high/ultra), resolution, and FPS. "
-                                "If a game is not in your knowledge base, say so. "
-                                "Add a disclaimer that these are AI-generated estimates and may not be accurate."
-                            )
-                            perf_payload = {
-                                "messages": [
-                                    {"role": "system", "content": perf_prompt},
-                                    {"role": "user", "content": f"Build: {build_summary}, Games: {games_list}."}
-                                ],
-                                "max_tokens": 300
-                            }
-                            perf_json = await ai_post("https://ai.hackclub.com/chat/completions", perf_payload, timeout=40)
-                            perf_text = perf_json.get("choices", [{}])[0].get("message", {}).get("content", "")
-                            if perf_text:
-                                # Ensure each '- ' is on its own line for Markdown
-                                perf_text_md = re.sub(r'(?<!\n)- ', '\n- ', perf_text)
-                                set_result_md(lambda prev: prev + "\n---\n## Game Performance Estimates\n" + perf_text_md.strip())
-                    except Exception as e:
-                        debug(f"[DEBUG] Error during game performance AI call: {e}")
-                    set_loading(False)
-                    debug("[DEBUG] Done. Build and analysis shown to user.")
-                    return
-                else:
-                    last_missing = missing
-                    debug(f"[DEBUG] Will retry for missing part: {missing}")
-                    continue
+                    max_tokens=400,
+                    timeout=60,
+                    session_key=session_key,
+                )
             except Exception as e:
                 debug(f"[DEBUG] Exception during AI call: {e}")
                 set_error(f"Error: {e}")
-                break
-        if not result_md:
-            debug("[DEBUG] Could not find a compatible build after several tries.")
-            set_result_md("Could not find a compatible build after several tries. Please adjust your preferences and try again.")
-        set_loading(False)
-
-    # Budget input with currency dropdown
-    def budget_input():
-        def handle_budget_change(e):
-            val = e["target"]["value"]
+                return
+            debug(f"[PCPartPicker][AI raw response]:\n{text}")
+            if not text.strip():
+                debug("[DEBUG] AI response text is empty!")
+                set_error("AI returned an empty response. Try again.")
+                return
+            # Parse the first JSON object (tolerates fences, single quotes, trailing commas)
             try:
-                set_budget(int(val) if val.strip() else 0)
-            except Exception:
-                set_budget(0)
-        return html.div(
-            {"className": "form-group"},
-            html.label({"for": "budget"}, "Budget:"),
-            html.input({
-                "type": "number",
-                "id": "budget",
-                "min": 1,
-                "value": budget,
-                "onBlur": handle_budget_change
-            }),
-            html.select({
-                "id": "currency",
-                "value": currency,
-                "onChange": lambda e: set_currency(e["target"]["value"])
-            }, *[
-                html.option({"value": code}, f"{code.upper()} - {name}") for code, name in currency_list
-            ])
-        )
+                data = json_stream.loads(text, root="{")
+                debug(f"[DEBUG] Parsed JSON: {data}")
+            except ValueError:
+                debug("[DEBUG] No JSON object found in AI response.")
+                set_error("AI did not return a JSON object. Try again.")
+                with open("ai_debug.log", "a") as f:
+                    f.write(f"\n[NO JSON] {datetime.datetime.now().isoformat()}\nPrompt:\n{user_prefs}\nAI raw text:\n{text}\n\n")
+                return
+            # The AI's names are only the intent: match what we can, then let the solver
+            # fix compatibility, fill in unmatched parts and keep the build within budget
+            choices = {}
+            for part in pc_solver.PART_ORDER:
+                choices[part] = part_index.find_row(part, data.get(part))
+                debug(f"[DEBUG] Matching {part}: {data.get(part)} -> {choices[part]}")
+            budget_usd = convert_from_eur(budget_eur, "usd")
+            solved, notes = pc_solver.solve(choices, budget_usd, use_case, perf_level)
+            if len(solved) < len(pc_solver.PART_ORDER):
+                debug(f"[DEBUG] Solver could not complete the build: {notes}")
+                set_result_md("Could not find a compatible build. Please adjust your preferences and try again.")
+                return
+            build = {part: pc_catalog.get(part).row(row) for part, row in solved.items()}
+            debug("[DEBUG] Build solved. Rendering markdown.")
+            # Prices come from the shared converted price columns (one conversion per rate update)
+            prices = {}
+            for part, row in solved.items():
+                price_usd = build[part].get('price')
+                if price_usd:
+                    prices[part] = (
+                        price_usd,
+                        float(exchange_rates.catalog_prices(part, "eur")[row]),
+                        float(exchange_rates.catalog_prices(part, currency)[row]),
+                    )
+            total_usd = sum(p[0] for p in prices.values())
+            total_eur = sum(p[1] for p in prices.values())
+            total_user = sum(p[2] for p in prices.values())
+            md = f"# Your PC Build\n\n"
+            for part, info in build.items():
+                md += f"**{part.upper()}**: {info.get('name', 'Unknown')}\n"
+                if part in prices:
+                    price_usd, price_eur, price_user = prices[part]
+                    md += f"- Price: {price_user} {currency.upper()} (original: ${price_usd} USD, €{price_eur} EUR)\n"
+                if info.get('brand'):
+                    md += f"- Brand: {info['brand']}\n"
+                if info.get('specs'):
+                    md += f"- Specs: {info['specs']}\n"
+                md += "\n"
+            md += f"**Total Price:** {round(total_user,2)} {currency.upper()} (original: ${round(total_usd,2)} USD, €{round(total_eur,2)} EUR)\n\n"
+            md += "---\n"
+            md += "## Compatibility Check\n"
+            md += f"- Estimated power draw: {int(pc_solver.estimated_power(solved))} W, power supply: {build['psu'].get('wattage')} W\n"
+            if notes:
+                md += "".join(f"- {note}\n" for note in notes)
+            else:
+                md += "- All suggested parts fit together and within the budget.\n"
+            md += "\n---\n"
+            md += "## Tips & Recommendations\n"
+            md += (
+                "- Check the graphics card length against the case before buying.\n"
+                "- Prices and availability may have changed since 2024.\n"
+                "- If you want to upgrade, consider increasing your budget or performance level.\n"
+            )
+            set_result_md(md)
+            # --- Post-build sections: independent AI calls run concurrently, each shown as soon as it's ready ---
+            build_summary = ", ".join([f"{part}: {info.get('name','Unknown')}" for part, info in build.items()])
+
+            async def expert_analysis():
+                analysis_prompt = (
+                    "You are a PC building expert. Given a build, "
+                    "provide a short analysis of potential bottlenecks, system balance, upgrade advice, and any expert opinions. State everything is according to you, an AI, not any bottlenech calculators and so on."
+                    "Be concise and helpful."
+                )
+                analysis_text = await ai_client.complete(
+                    [
+                        {"role": "system", "content": analysis_prompt},
+                        {"role": "user", "content": build_summary}
+                    ],
+                    max_tokens=250,
+                    timeout=SECTION_TIMEOUT,
+                    priority=ai_admission.BACKGROUND,
+                    session_key=session_key,
+                )
+                return analysis_text.strip()
+
+            async def game_performance(games_list):
+                perf_prompt = (
+                    "You are a PC gaming expert. Given a build, "
+                    "estimate how games would run on it. "
+                    "For each game, estimate the expected settings (e.g., low/medium/high/ultra), resolution, and FPS. "
+                    "If a game is not in your knowledge base, say so. "
+                    "Add a disclaimer that these are AI-generated estimates and may not be accurate."
+                )
+                perf_text = await ai_client.complete(
+                    [
+                        {"role": "system", "content": perf_prompt},
+                        {"role": "user", "content": f"Build: {build_summary}, Games: {games_list}."}
+                    ],
+                    max_tokens=300,
+                    timeout=SECTION_TIMEOUT,
+                    priority=ai_admission.BACKGROUND,
+                    session_key=session_key,
+                )
+                # Ensure each '- ' is on its own line for Markdown
+                return re.sub(r'(?<!\n)- ', '\n- ', perf_text).strip()
+
+            sections = {"Expert Analysis": expert_analysis()}
+            games_list = games.strip() if games.strip() else None
+            if games_list:
+                sections["Game Performance Estimates"] = game_performance(games_list)
+            async for title, text, err in task_runner.as_completed(sections, timeout=SECTION_TIMEOUT):
+                if err is not None:
+                    debug(f"[DEBUG] Dropped section {title}: {err!r}")
+                    continue
+                if text:
+                    set_result_md(lambda prev, title=title, text=text: prev + f"\n---\n## {title}\n" + text)
+            debug("[DEBUG] Done. Build and analysis shown to user.")
+        except Exception as e:
+            debug(f"[DEBUG] Exception while building: {e}")
+            set_error(f"Error: {e}")
+        finally:
+            set_loading(False)
 
     from components.common.config import CACHE_SUFFIX
     return html.div(
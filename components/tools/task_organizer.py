@@ -1,11 +1,11 @@
 from reactpy import component, html, use_state
 import threading, time
-import aiohttp
 import asyncio
 import json
 import random
 import string
 import components.common.calendar_db as calendar_db
+from components.common import ai_admission, ai_client, json_stream
 
 # ───────────────────────────────────────────────────────────────────────────────
 #  DEBUG LOGGER
@@ -28,7 +28,7 @@ def debug_log(*args):
         print("[task_organizer.py DEBUG]", *args)
 
 
-async def call_ai_schedule(tasks):
+async def call_ai_schedule(tasks, on_block=None, session_key=None):
     debug_log("call_ai_schedule called with tasks:", tasks)
     debug_log("---- USER INPUT ----")
     debug_log(json.dumps(tasks, indent=2, ensure_ascii=False))
@@ -47,31 +47,24 @@ async def call_ai_schedule(tasks):
     ]
     try:
         debug_log("Sending request to AI endpoint with payload:", json.dumps(tasks, indent=2, ensure_ascii=False))
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://ai.hackclub.com/chat/completions",
-                headers={"Content-Type": "application/json"},
-                json={
-                    "messages": [
-                        {"role": "system", "content": "\n".join(instructions)},
-                        {"role": "user", "content": json.dumps(tasks)}
-                    ]
-                },
-                timeout=aiohttp.ClientTimeout(total=60)
-            ) as resp:
-                debug_log("AI endpoint response status:", resp.status)
-                ai_raw = (await resp.json())["choices"][0]["message"]["content"]
-        ai_clean = ai_raw.strip()
-        if ai_clean.startswith("```"):
-            ai_clean = ai_clean.lstrip("`\n ")
-        if ai_clean.endswith("```"):
-            ai_clean = ai_clean.rstrip("`\n ")
-        if ai_clean.startswith("json"):
-            ai_clean = ai_clean[4:].lstrip("\n ")
+        # Stream the schedule; on_block(block) is called as each block's object closes
+        parser = json_stream.IncrementalParser(root="[")
+        async for delta in ai_client.stream(
+            [
+                {"role": "system", "content": "\n".join(instructions)},
+                {"role": "user", "content": json.dumps(tasks)}
+            ],
+            timeout=60,
+            priority=ai_admission.DEFAULT,
+            session_key=session_key,
+        ):
+            for path, value in parser.feed(delta):
+                if on_block and len(path) == 1 and isinstance(value, dict):
+                    on_block(value)
+        scheduled = parser.close()
         debug_log("---- AI OUTPUT ----")
-        debug_log(ai_clean)
+        debug_log(json.dumps(scheduled, indent=2, ensure_ascii=False))
         debug_log("---- END AI OUTPUT ----")
-        scheduled = json.loads(ai_clean)
         return scheduled
     except Exception as e:
         debug_log(f"[TaskOrganizer] AI scheduling error: {e}")
@@ -136,6 +129,7 @@ def TaskOrganizer():
     ai_estimate_all, set_ai_estimate_all = use_state(True)
     organized_tasks, set_organized_tasks = use_state([])
     loading, set_loading = use_state(False)
+    session_key = ai_admission.use_session_key()
     error, set_error = use_state("")
     show_link_modal, set_show_link_modal = use_state(False)
     calendar_url, set_calendar_url = use_state("")
@@ -200,7 +194,12 @@ def TaskOrganizer():
             await asyncio.sleep(0.7)
             debug_log("User tasks:", tasks)
             try:
-                scheduled = await call_ai_schedule(tasks)
+                set_organized_tasks([])
+                scheduled = await call_ai_schedule(
+                    tasks,
+                    on_block=lambda block: set_organized_tasks(lambda prev: prev + [block]),
+                    session_key=session_key,
+                )
                 debug_log("AI scheduled tasks:", scheduled)
                 set_organized_tasks(scheduled)
             except Exception as e:
@@ -425,19 +424,14 @@ def TaskOrganizer():
         async def resolve_timezone():
             try:
                 prompt = f"Given the user input '{val}', return the best matching IANA timezone name (e.g. Europe/Moscow, America/New_York). Only return the timezone name, nothing else. If ambiguous, pick the most likely for a city or region."
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        "https://ai.hackclub.com/chat/completions",
-                        headers={"Content-Type": "application/json"},
-                        json={
-                            "messages": [
-                                {"role": "system", "content": "You are a helpful assistant that maps user input to IANA timezone names."},
-                                {"role": "user", "content": prompt}
-                            ]
-                        },
-                        timeout=aiohttp.ClientTimeout(total=20)
-                    ) as resp:
-                        ai_raw = (await resp.json())["choices"][0]["message"]["content"].strip()
+                ai_raw = await ai_client.complete(
+                    [
+                        {"role": "system", "content": "You are a helpful assistant that maps user input to IANA timezone names."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    timeout=20,
+                )
+                ai_raw = ai_raw.strip()
                 # Clean up any code block formatting
                 if ai_raw.startswith("`"):
                     ai_raw = ai_raw.lstrip("`\n ")
@@ -1,12 +1,11 @@
 from reactpy import component, html, use_state
 import asyncio
-import aiohttp
 import json
 import datetime
-import re
 import random
 import os
 from components.common import generate_flightroute
+from components.common import ai_admission, ai_client, airport_index, artifact_store, json_stream, route_images, task_runner
 
 # ───────────────────────────────────────────────────────────────────────────────
 #  DEBUG LOGGER
@@ -28,6 +27,8 @@ def debug_log(*args):
     if DEBUG_MODE:
         print("[trip_planner.py DEBUG]", *args)
 
+ROUTE_IMAGE_SIZES = "(max-width: 900px) 100vw, 900px"  # the route image fills the 900px page column
+
 async def generate_pdf_server_side(trip_data, route_img_path=None):
     """Generate PDF on server side and return the file path"""
     try:
@@ -36,12 +37,9 @@ async def generate_pdf_server_side(trip_data, route_img_path=None):
         from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
         from reportlab.lib.enums import TA_CENTER
         
-        temp_dir = "./static/assets/pdf_temp"
-        os.makedirs(temp_dir, exist_ok=True)
-        
         random_id = random.randint(100000, 999999)
         filename = f"Trip-{random_id}.pdf"
-        filepath = os.path.join(temp_dir, filename)
+        filepath = artifact_store.path_for("pdf", filename)
         
         doc = SimpleDocTemplate(filepath, pagesize=A4)
         styles = getSampleStyleSheet()
@@ -126,13 +124,13 @@ async def generate_pdf_server_side(trip_data, route_img_path=None):
                 content.append(Spacer(1, 15))
         
         # Add flight route image if available
-        if route_img_path and os.path.exists(f".{route_img_path}"):
+        if route_img_path and os.path.exists(route_img_path):
             try:
                 content.append(PageBreak())
                 content.append(Paragraph("Flight Route Map", heading_style))
                 content.append(Spacer(1, 12))
                 from reportlab.lib.utils import ImageReader
-                img_path = f".{route_img_path}"
+                img_path = route_img_path
                 img_reader = ImageReader(img_path)
                 orig_width, orig_height = img_reader.getSize()
                 max_width, max_height = 500, 300
@@ -153,8 +151,17 @@ async def generate_pdf_server_side(trip_data, route_img_path=None):
             except Exception as img_e:
                 debug_log(f"Could not add image to PDF: {img_e}")
         
-        # Build PDF
-        doc.build(content)
+        # Build PDF in a thread (reportlab is CPU-bound); the thread finishes even if we are cancelled
+        def build():
+            try:
+                doc.build(content)
+            except Exception:
+                if os.path.exists(filepath):  # a partial file would never be registered, so never expire
+                    os.remove(filepath)
+                raise
+            artifact_store.register(filepath, "pdf")
+
+        await task_runner.run_blocking(build)
         
         debug_log(f"PDF generated successfully: {filepath}")
         return f"/static/assets/pdf_temp/{filename}"
@@ -182,8 +189,9 @@ def TripPlanner():
     ai_loading, set_ai_loading = use_state(False)
     ai_error, set_ai_error = use_state("")
     ai_result, set_ai_result = use_state("")
-    route_img_url, set_route_img_url = use_state("")
+    route_img, set_route_img = use_state({})  # variant name -> /routes/ URL, plus "print_file" for the PDF
     suggested_route, set_suggested_route = use_state([])
+    route_notes, set_route_notes = use_state([])
     # Modal state for details popup
     details_modal, set_details_modal = use_state({"open": False, "label": "", "details": ""})
     # Modal state for route image popup
@@ -194,6 +202,7 @@ def TripPlanner():
     pdf_download_url, set_pdf_download_url = use_state("")
     # Route image loading state
     route_img_loading, set_route_img_loading = use_state(False)
+    session_key = ai_admission.use_session_key()
 
     def handle_input(field, value):
         debug_log(f"Input change: {field} = {value}")
@@ -204,8 +213,9 @@ def TripPlanner():
         set_ai_loading(True)
         set_ai_error("")
         set_ai_result("")
-        set_route_img_url("")
+        set_route_img({})
         set_suggested_route([])
+        set_route_notes([])
         debug_log("User prefs:", prefs)
         # Always provide the current date to the AI
         current_date = datetime.datetime.now().strftime('%Y-%m-%d')
@@ -266,58 +276,32 @@ def TripPlanner():
         """
         debug_log("AI prompt:", prompt)
         try:
-            async with aiohttp.ClientSession() as session:
-                debug_log("Opening aiohttp session...")
-                async with session.post(
-                    "https://ai.hackclub.com/chat/completions",
-                    headers={"Content-Type": "application/json"},
-                    json={
-                        "messages": [
-                            {"role": "system", "content": prompt},
-                            {"role": "user", "content": f"Current date(YYY-MM-DD): {current_date}\nUser preferences: {json.dumps(prefs, ensure_ascii=False)}"}
-                        ]
-                    },
-                    timeout=aiohttp.ClientTimeout(total=60)
-                ) as resp:
-                    debug_log(f"AI endpoint response status: {resp.status}")
-                    raw_json = await resp.json()
-                    debug_log("AI raw response:", raw_json)
-                    ai_raw = raw_json["choices"][0]["message"]["content"]
-            ai_clean = ai_raw.strip()
-            debug_log("AI cleaned response (pre-strip):", ai_clean)
-            # Remove code block wrappers (
-            if ai_clean.startswith("json"):
-                ai_clean = ai_clean[7:]
-            if ai_clean.startswith(""):
-                ai_clean = ai_clean.lstrip("\n ")
-            if ai_clean.endswith(" "):
-                ai_clean = ai_clean.rstrip("\n ")
-            if ai_clean.startswith("json"):
-                ai_clean = ai_clean[4:].lstrip("\n ")
-            ai_clean = ai_clean.strip()
-            debug_log("AI cleaned response (post-strip):", ai_clean)
-            # Extract the first JSON object from the string
-            match = re.search(r"\{[\s\S]*\}", ai_clean)
-            if match:
-                json_str = match.group(0)
-                # Remove illegal trailing commas before ] or }
-                json_str = re.sub(r',\s*([\]}])', r'\1', json_str)
-                # Fix invalid backslash escapes (e.g. \, \t, etc) by replacing single backslashes not part of \\ or \", with \\.
-                # This will make the string safe for json.loads
-                def fix_invalid_escapes(s):
-                    # Replace single backslashes not followed by \\, ", /, b, f, n, r, t, u
-                    return re.sub(r'(?<!\\)\\(?![\\"/bfnrtu])', r'\\\\', s)
-                json_str = fix_invalid_escapes(json_str)
-                try:
-                    result = json.loads(json_str)
-                except Exception as e:
-                    debug_log("JSON decode error after trailing comma and escape fix:", e)
-                    raise
-            else:
-                raise ValueError("No JSON object found in AI response")
+            # Stream the plan and show each day as soon as its object closes
+            parser = json_stream.IncrementalParser(root="{")
+            days = []
+            async for delta in ai_client.stream(
+                [
+                    {"role": "system", "content": prompt},
+                    {"role": "user", "content": f"Current date(YYY-MM-DD): {current_date}\nUser preferences: {json.dumps(prefs, ensure_ascii=False)}"}
+                ],
+                timeout=60,
+                priority=ai_admission.DEFAULT,
+                session_key=session_key,
+            ):
+                for path, value in parser.feed(delta):
+                    if len(path) == 2 and path[0] == "daily_plan" and isinstance(value, dict):
+                        days.append(value)
+                        set_ai_result({"daily_plan": list(days)})
+            result = parser.close()
             debug_log("Parsed AI result:", result)
+            # Check the route against the offline airport data (fixes codes locally, never geocodes)
+            route, notes = airport_index.repair_route(result.get("route", []))
+            if notes:
+                debug_log("Route repaired:", notes)
+            result = {**result, "route": route}
             set_ai_result(result)
-            set_suggested_route(result.get("route", []))
+            set_suggested_route(route)
+            set_route_notes(notes)
             # Generate flight route image if route is present
             if result.get("route"):
                 debug_log("Generating route image for:", result["route"])
@@ -347,26 +331,12 @@ def TripPlanner():
     async def generate_route_image(route):
         set_route_img_loading(True)
         try:
-            # Use route IATA codes for filename
-            if route and isinstance(route, list) and len(route) > 0:
-                route_codes = '-'.join([str(code) for code in route])
-                filename = f"/static/assets/flight_routes_temp/route_{route_codes}.png"
-            else:
-                filename = f"/static/assets/flight_routes_temp/route_UNKNOWN.png"
-            # Check if file already exists
-            abs_path = f".{filename}"
-            if os.path.exists(abs_path):
-                set_route_img_url(filename)
-                debug_log(f"Route image already exists, serving: {filename}")
-                return
-            
-            # Add the departure airport at the end of the route
-            #if route and isinstance(route, list) and len(route) > 0:
-            #    route = route + [route[0]]
-            debug_log(f"generate_route_image: filename={filename}, route={route}")
-            await generate_flightroute.create_clean_route_map(route, abs_path, extra_lon_margin=0.30, extra_lat_margin=0.70, npts=50)
-            set_route_img_url(filename)
-            debug_log(f"Route image generated and set: {filename}")
+            # Rendered once per route and served from the /routes/ cache: SVG, WebP sizes
+            # for srcset, thumbnail and the print JPEG for the PDF
+            debug_log(f"generate_route_image: route={route}")
+            entry = await route_images.ensure(route, allow_lookup=True)
+            set_route_img({**route_images.urls(route, entry), "print_file": str(route_images.blob_path(entry, "print"))})
+            debug_log(f"Route image ready: {'-'.join(route)}")
         except Exception as e:
             debug_log("Exception in generate_route_image:", e)
             set_ai_error(f"Flight route image error: {e}")
@@ -387,7 +357,7 @@ def TripPlanner():
         set_pdf_error("")
         
         try:
-            pdf_path = await generate_pdf_server_side(ai_result, route_img_url)
+            pdf_path = await generate_pdf_server_side(ai_result, route_img.get("print_file"))
             if pdf_path:
                 # Create download link and trigger download
                 debug_log(f"PDF generated at: {pdf_path}")
@@ -415,7 +385,7 @@ def TripPlanner():
     random.shuffle(shuffled_emojis)
 
     def download_pdf_btn():
-        if not (ai_result and isinstance(ai_result, dict) and ai_result.get("daily_plan")):
+        if ai_loading or not (ai_result and isinstance(ai_result, dict) and ai_result.get("daily_plan")):
             return None
         
         def trigger_pdf(_):
@@ -569,14 +539,20 @@ def TripPlanner():
             ai_result and ai_result.get("explanation") and html.div({"className": "explanation-block"},
                 html.b("Why this trip?"), html.br(), ai_result["explanation"]
             ) or None,
-            route_img_url and html.div({"className": "route-image-block"},
+            route_img and html.div({"className": "route-image-block"},
                 html.h4("Flight Route"),
                 html.img({
-                    "src": route_img_url,
+                    "src": route_img["web"],
+                    # The browser picks the smallest WebP that covers the image's width on this screen
+                    "srcSet": ", ".join(
+                        f"{route_img[name]} {generate_flightroute.ROUTE_VARIANTS[name][1]}w" for name in ("thumb", "web", "web2x")
+                    ),
+                    "sizes": ROUTE_IMAGE_SIZES,
                     "className": "route-image",
                     "style": {"cursor": "pointer"},
                     "onClick": lambda e: set_route_img_modal({"open": True})
-                })
+                }),
+                *[html.div({"className": "schedule-tip"}, note) for note in route_notes]
             ) or None,
             # Show loading message while route image is being generated
             route_img_loading and html.div({"className": "route-image-loading"}, "Loading flight route...") or None,
@@ -584,7 +560,7 @@ def TripPlanner():
             route_img_modal["open"] and html.div({"className": "modal-overlay", "onClick": lambda e: set_route_img_modal({"open": False})},
                 html.div({"className": "route-image-modal-content", "onClick": lambda e: (e.stop_propagation() if hasattr(e, 'stop_propagation') else None)},
                     html.img({
-                        "src": route_img_url,
+                        "src": route_img["svg"],
                         "className": "route-image-modal-img"
                     }),
                     html.button({
@@ -0,0 +1,83 @@
+import json
+import os
+import sys
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  Compiles airports.json (IATA code, position, name, country, size, type)
+#  into server-assets/airport_db.json, the offline airport database the
+#  runtime index (components/common/airport_index) loads. No network needed,
+#  unlike cache_airports.py which geocodes every code through Nominatim.
+#
+#  Closed airports are kept even without a position (most have none in
+#  airports.json) so the index can flag them instead of geocoding them.
+#
+#  Run from this folder:  python build_airport_db.py
+# ───────────────────────────────────────────────────────────────────────────────
+
+INPUT_FILE = "airports.json"  # https://github.com/jbrooksuk/JSON-Airports/blob/master/airports.json
+OUTPUT_FILE = "../../server-assets/airport_db.json"
+COLUMNS = ["iata", "lon", "lat", "name", "iso", "size", "type", "closed"]
+SIZE_RANK = {"large": 3, "medium": 2, "small": 1}
+KNOWN_CLOSED = ("BWS", "AHT")  # checked after every build (the precache geocodes BWS to Brisbane)
+
+def to_float(value):
+    try:
+        return round(float(value), 6)
+    except (TypeError, ValueError):
+        return None
+
+def rank(airport):
+    """Which record to keep when a code appears more than once."""
+    return (airport["lon"] is not None, not airport["closed"], SIZE_RANK.get(airport["size"], 0))
+
+def main():
+    with open(INPUT_FILE, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    airports = {}
+    skipped = 0
+    for a in raw:
+        code = (a.get("iata") or "").strip().upper()
+        if len(code) != 3:
+            skipped += 1
+            continue
+        airport = {
+            "iata": code,
+            "lon": to_float(a.get("lon")),
+            "lat": to_float(a.get("lat")),
+            "name": a.get("name"),
+            "iso": a.get("iso"),
+            "size": a.get("size"),
+            "type": a.get("type"),
+            "closed": a.get("status") == 0 or a.get("type") == "closed",
+        }
+        if code not in airports or rank(airport) > rank(airports[code]):
+            airports[code] = airport
+    # Open airports are only useful with a position; closed ones are kept regardless, to be flagged
+    kept = [a for a in airports.values() if a["closed"] or (a["lon"] is not None and a["lat"] is not None)]
+    kept.sort(key=lambda a: a["iata"])
+    rows = [[a[c] for c in COLUMNS] for a in kept]
+    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
+        json.dump({"columns": COLUMNS, "rows": rows}, f, ensure_ascii=False, separators=(",", ":"))
+    closed = sum(1 for a in kept if a["closed"])
+    print(f"{len(raw)} records, {len(airports)} codes, {len(kept)} kept ({closed} closed, "
+          f"{len(airports) - len(kept)} without a position, {skipped} without a code) -> {os.path.abspath(OUTPUT_FILE)}")
+    problems = check(rows)
+    for problem in problems:
+        print(f"Check failed: {problem}")
+    return 1 if problems else 0
+
+def check(rows):
+    """Problems with the written rows: every KNOWN_CLOSED code must be present and flagged closed."""
+    by_code = {row[COLUMNS.index("iata")]: dict(zip(COLUMNS, row)) for row in rows}
+    problems = []
+    for code in KNOWN_CLOSED:
+        if code not in by_code:
+            problems.append(f"{code} is missing")
+        elif not by_code[code]["closed"]:
+            problems.append(f"{code} is not flagged closed")
+    if not any(row[COLUMNS.index("closed")] for row in rows):
+        problems.append("no closed airports at all")
+    return problems
+
+if __name__ == "__main__":
+    sys.exit(main())
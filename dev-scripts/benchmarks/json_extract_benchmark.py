@@ -0,0 +1,94 @@
+import json
+import os
+import re
+import sys
+import time
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  Compares the old per-component JSON extraction (fence stripping + regex +
+#  trailing-comma / escape fixes + json.loads) with components/common/json_stream
+#  on a corpus of real-world-shaped model outputs.
+#
+#  Run from the repo root:  python dev-scripts/benchmarks/json_extract_benchmark.py
+# ───────────────────────────────────────────────────────────────────────────────
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from components.common import json_stream
+
+CORPUS_FILE = os.path.join(os.path.dirname(__file__), "json_corpus.jsonl")
+ROUNDS = 200
+CHUNK_SIZE = 4  # roughly one streamed token
+
+def legacy_extract(text):
+    """The Trip Planner pipeline, the most forgiving of the old copies."""
+    clean = text.strip()
+    if clean.startswith("```"):
+        clean = clean.lstrip("`\n ")
+    if clean.endswith("```"):
+        clean = clean.rstrip("`\n ")
+    if clean.startswith("json"):
+        clean = clean[4:].lstrip("\n ")
+    match = re.search(r"\{[\s\S]*\}|\[[\s\S]*\]", clean)
+    if not match:
+        raise ValueError("No JSON object found in AI response")
+    json_str = re.sub(r',\s*([\]}])', r'\1', match.group(0))
+    json_str = re.sub(r'(?<!\\)\\(?![\\"/bfnrtu])', r'\\\\', json_str)
+    return json.loads(json_str)
+
+def new_extract(text):
+    return json_stream.loads(text)
+
+def time_per_call(fn, text):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        try:
+            fn(text)
+        except Exception:
+            pass
+    return (time.perf_counter() - start) / ROUNDS * 1e6
+
+def first_event_at(text):
+    """Characters received before the first element/field could be rendered."""
+    parser = json_stream.IncrementalParser()
+    for i in range(0, len(text), CHUNK_SIZE):
+        for path, value in parser.feed(text[i:i + CHUNK_SIZE]):
+            if len(path) == 1:
+                return min(i + CHUNK_SIZE, len(text))
+    return len(text)
+
+def main():
+    with open(CORPUS_FILE, encoding="utf-8") as f:
+        corpus = [json.loads(line) for line in f if line.strip()]
+
+    print(f"{'sample':<20} {'chars':>6} {'legacy':>8} {'new':>8} {'legacy µs':>10} {'new µs':>8} {'1st item @':>11}")
+    totals = {"legacy_ok": 0, "new_ok": 0, "legacy_us": 0.0, "new_us": 0.0}
+    for sample in corpus:
+        text = sample["text"]
+        try:
+            legacy_extract(text)
+            legacy_ok = True
+        except Exception:
+            legacy_ok = False
+        try:
+            new_extract(text)
+            new_ok = True
+        except Exception:
+            new_ok = False
+        legacy_us = time_per_call(legacy_extract, text)
+        new_us = time_per_call(new_extract, text)
+        totals["legacy_ok"] += legacy_ok
+        totals["new_ok"] += new_ok
+        totals["legacy_us"] += legacy_us
+        totals["new_us"] += new_us
+        first = first_event_at(text)
+        print(f"{sample['name']:<20} {len(text):>6} {'ok' if legacy_ok else 'FAIL':>8} {'ok' if new_ok else 'FAIL':>8} "
+              f"{legacy_us:>10.1f} {new_us:>8.1f} {100 * first / len(text):>10.0f}%")
+
+    print()
+    print(f"parsed: legacy {totals['legacy_ok']}/{len(corpus)}, new {totals['new_ok']}/{len(corpus)}")
+    print(f"total time per pass: legacy {totals['legacy_us']:.0f} µs, new {totals['new_us']:.0f} µs")
+    print("'1st item @' = share of the response streamed before the first array element/object")
+    print("field could be shown; the legacy path always needs 100%.")
+
+if __name__ == "__main__":
+    main()
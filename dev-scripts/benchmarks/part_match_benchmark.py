@@ -0,0 +1,94 @@
+import json
+import os
+import re
+import sys
+import time
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  Compares the old PC Part Picker name matching (find_best_match /
+#  smart_find_best_match: linear scans, first hit wins) with the BM25 index in
+#  components/common/part_index on names the AI typically suggests.
+#
+#  Run from the repo root:  python dev-scripts/benchmarks/part_match_benchmark.py
+# ───────────────────────────────────────────────────────────────────────────────
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from components.common import part_index, pc_catalog
+
+ROUNDS = 50
+
+QUERIES = [
+    ("cpu", "AMD Ryzen 5 5600"),
+    ("cpu", "Ryzen 7 7800X3D"),
+    ("cpu", "Intel i7 13700k"),
+    ("cpu", "Rysen 5 7600"),
+    ("gpu", "nvidia 3060"),
+    ("gpu", "NVIDIA GeForce RTX 4070 Super"),
+    ("gpu", "AMD Radeon RX 7800 XT"),
+    ("gpu", "RTX 4060"),
+    ("gpu", "RTX 5090"),
+    ("motherboard", "MSI B550 Tomahawk"),
+    ("motherboard", "B660M motherboard"),
+    ("ram", "Corsair Vengeance LPX 16GB DDR4 3200"),
+    ("ram", "G.Skill Trident Z5 32GB DDR5 6000"),
+    ("storage", "Samsung 970 EVO Plus 1TB"),
+    ("storage", "WD Blue SN570 1TB"),
+    ("psu", "EVGA 600W 80+ Bronze"),
+    ("psu", "Corsair RM750x"),
+    ("case", "Lian Li O11 Dynamic"),
+]
+
+def legacy_find(name, dataset):
+    """The two old matchers, in the order handle_submit called them."""
+    lowered = name.lower()
+    tokens = [t for t in re.split(r"[\s\-_/]+", lowered) if t]
+    for item in dataset:
+        if all(token in item.get("name", "").lower() for token in tokens):
+            return item
+    for item in dataset:
+        if any(token in item.get("name", "").lower() for token in tokens):
+            return item
+    for item in dataset:
+        if lowered in item.get("name", "").lower():
+            return item
+    for item in dataset:
+        if item.get("name", "").lower() == lowered:
+            return item
+    for item in dataset:
+        if lowered in item.get("name", "").lower():
+            return item
+    return None
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        result = fn(*args)
+    return result, (time.perf_counter() - start) / ROUNDS * 1e3
+
+def label(part):
+    if not part:
+        return "-"
+    extra = f" [{part['chipset']}]" if part.get("chipset") else ""
+    return f"{part['name']}{extra}"[:48]
+
+def main():
+    datasets = {}
+    for category, filename in pc_catalog.CATEGORIES.items():
+        with open(os.path.join(pc_catalog.DATA_PATH, filename), "r") as f:
+            datasets[category] = json.load(f)
+    start = time.perf_counter()
+    part_index.build_all()
+    print(f"index build: {time.perf_counter() - start:.2f} s\n")
+
+    print(f"{'query':<38} {'legacy ms':>9} {'index ms':>9}  legacy -> index")
+    totals = [0.0, 0.0]
+    for category, name in QUERIES:
+        old, old_ms = timed(legacy_find, name, datasets[category])
+        new, new_ms = timed(part_index.find, category, name)
+        totals[0] += old_ms
+        totals[1] += new_ms
+        print(f"{category + ': ' + name:<38} {old_ms:>9.2f} {new_ms:>9.2f}  {label(old)}  ->  {label(new)}")
+    print(f"\ntotal per pass: legacy {totals[0]:.1f} ms, index {totals[1]:.1f} ms")
+
+if __name__ == "__main__":
+    main()
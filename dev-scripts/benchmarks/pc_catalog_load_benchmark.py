@@ -0,0 +1,62 @@
+import json
+import os
+import subprocess
+import sys
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  Cold start of the PC part catalog in a fresh process: parsing the JSON
+#  datasets and building the name indexes vs mapping the compiled catalog
+#  (server-assets/pc_catalog.bin). Reports load time, time to the first
+#  name lookup and resident memory.
+#
+#  Run from the repo root:  python dev-scripts/benchmarks/pc_catalog_load_benchmark.py [rounds]
+# ───────────────────────────────────────────────────────────────────────────────
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+ROUNDS = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+CHILD = r"""
+import json, os, resource, sys, time
+sys.path.insert(0, ".")
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+baseline = rss_mb()
+from components.common import pc_catalog, part_index
+if sys.argv[1] == "json":
+    pc_catalog.COMPILED_PATH = os.devnull + ".missing"
+import_rss = rss_mb()
+start = time.perf_counter()
+pc_catalog.load_all()
+loaded = time.perf_counter()
+part_index.build_all()
+indexed = time.perf_counter()
+part_index.find("gpu", "RTX 4070 Super")
+first = time.perf_counter()
+print(json.dumps({
+    "load_ms": (loaded - start) * 1e3,
+    "index_ms": (indexed - loaded) * 1e3,
+    "first_ms": (first - start) * 1e3,
+    "rss_mb": rss_mb() - import_rss,
+    "peak_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3 - baseline,
+}))
+"""
+
+def run(mode):
+    out = subprocess.run([sys.executable, "-c", CHILD, mode], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def main():
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    from components.common import pc_catalog
+    if pc_catalog.ensure_compiled():
+        print(f"built {pc_catalog.COMPILED_PATH}")
+    print(f"{ROUNDS} cold starts each, best run shown\n")
+    print(f"{'':<10} {'load ms':>9} {'index ms':>9} {'first ms':>9} {'RSS MB':>8} {'peak MB':>8}")
+    for mode in ("json", "compiled"):
+        best = min((run(mode) for _ in range(ROUNDS)), key=lambda r: r["first_ms"])
+        print(f"{mode:<10} {best['load_ms']:>9.1f} {best['index_ms']:>9.1f} {best['first_ms']:>9.1f} {best['rss_mb']:>8.1f} {best['peak_mb']:>8.1f}")
+
+if __name__ == "__main__":
+    main()
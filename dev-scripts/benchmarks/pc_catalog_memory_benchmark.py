@@ -0,0 +1,56 @@
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  Memory held by the PC part datasets with N open PC Part Picker sessions:
+#  the old per-session json.load() of every file vs the shared columnar
+#  catalog in components/common/pc_catalog.
+#
+#  Run from the repo root:  python dev-scripts/benchmarks/pc_catalog_memory_benchmark.py [sessions]
+# ───────────────────────────────────────────────────────────────────────────────
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from components.common import pc_catalog
+
+SESSIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+def legacy_session():
+    """What every mount used to keep in use_state."""
+    datasets = {}
+    for category, filename in pc_catalog.CATEGORIES.items():
+        with open(os.path.join(pc_catalog.DATA_PATH, filename), "r") as f:
+            datasets[category] = json.load(f)
+    return datasets
+
+def catalog_session():
+    """What a mount holds now: references to the shared tables."""
+    return {category: pc_catalog.get(category) for category in pc_catalog.CATEGORIES}
+
+def measure(make_session):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    sessions = [make_session() for _ in range(SESSIONS)]
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del sessions
+    return current, peak, elapsed
+
+def main():
+    print(f"{SESSIONS} sessions")
+    print(f"{'':<10} {'held MB':>9} {'peak MB':>9} {'load s':>8}")
+    for label, make_session in (("legacy", legacy_session), ("catalog", catalog_session)):
+        current, peak, elapsed = measure(make_session)
+        print(f"{label:<10} {current / 1e6:>9.1f} {peak / 1e6:>9.1f} {elapsed:>8.2f}")
+    print()
+    print("catalog tables (pc_catalog.stats()):")
+    for category, info in pc_catalog.stats().items():
+        print(f"  {category:<12} {info['parts']:>6} parts {info['bytes'] / 1e6:>6.2f} MB")
+
+if __name__ == "__main__":
+    main()
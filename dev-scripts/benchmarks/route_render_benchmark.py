@@ -0,0 +1,66 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  Per-route render time of generate_flightroute with the basemap cache:
+#    cold    nothing cached, land/ocean/coastline drawn from the shapefiles
+#    disk    basemap PNG on disk, not in this worker's memory
+#    warm    same route again (basemap in memory)
+#    nearby  different routes whose extent snaps to an already cached basemap
+#
+#  Rendering runs in-process (like inside one render worker), writing to a
+#  temporary folder. Run from the repo root:
+#      python dev-scripts/benchmarks/route_render_benchmark.py
+# ───────────────────────────────────────────────────────────────────────────────
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from components.common import airport_index, generate_flightroute as gf
+
+ROUTES = [
+    ["OTP", "BCN", "JFK", "LAX", "SFO", "OTP"],
+    ["OTP", "FRA", "SIN", "SYD", "OTP"],
+    ["LHR", "CDG", "FCO", "ATH"],
+]
+NEARBY = [
+    ["OTP", "MAD", "JFK", "LAX", "SEA", "OTP"],
+    ["OTP", "MUC", "SIN", "MEL", "OTP"],
+    ["LGW", "ORY", "CIA", "ATH"],
+]
+
+def render(codes, out_dir):
+    coords = [airport_index.get(code) for code in codes]
+    start = time.perf_counter()
+    gf._render_route_map(coords, codes, [(str(out_dir / f"{'-'.join(codes)}.png"), None)], 0.30, 0.70, 50)
+    return (time.perf_counter() - start) * 1e3
+
+def main():
+    out_dir = Path(tempfile.mkdtemp(prefix="route_render_"))
+    gf.BASEMAP_DIR = out_dir / "basemaps"
+    gf.BASEMAP_MEMORY = len(ROUTES)
+    try:
+        start = time.perf_counter()
+        gf._init_worker()
+        print(f"worker init (Natural Earth preload): {time.perf_counter() - start:.2f} s\n")
+        rows = []
+        for codes, nearby in zip(ROUTES, NEARBY):
+            gf._basemaps.clear()
+            cold = render(codes, out_dir)
+            gf._basemaps.clear()
+            disk = render(codes, out_dir)
+            warm = render(codes, out_dir)
+            cached = set(gf._basemaps)
+            near = render(nearby, out_dir)
+            shared = set(gf._basemaps) <= cached  # nearby route snapped to the same basemap
+            rows.append((codes, cold, disk, warm, near, shared))
+        print(f"{'route':<34} {'cold ms':>9} {'disk ms':>9} {'warm ms':>9} {'nearby ms':>10}  basemap reused")
+        for codes, cold, disk, warm, near, shared in rows:
+            print(f"{'-'.join(codes):<34} {cold:>9.0f} {disk:>9.0f} {warm:>9.0f} {near:>10.0f}  {'yes' if shared else 'no'}")
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import argparse
+import os
+import sys
+import time
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  Compiles static/assets/pc_parts/*.json into the memory-mapped catalog the
+#  PC Part Picker loads (server-assets/pc_catalog.bin). Run at image build
+#  time; the app also rebuilds it on startup when the JSON has changed.
+#
+#  Run from the repo root:  python dev-scripts/build_pc_catalog.py [--force | --check]
+# ───────────────────────────────────────────────────────────────────────────────
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from components.common import pc_catalog
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the compiled PC part catalog.")
+    parser.add_argument("--force", action="store_true", help="rebuild even if the compiled catalog is current")
+    parser.add_argument("--check", action="store_true", help="only report whether it is current (exit 1 if not)")
+    args = parser.parse_args()
+
+    current = pc_catalog.is_compiled()
+    if args.check:
+        print(f"{pc_catalog.COMPILED_PATH}: {'current' if current else 'missing or out of date'}")
+        sys.exit(0 if current else 1)
+    if current and not args.force:
+        print(f"{pc_catalog.COMPILED_PATH} is up to date")
+        return
+    start = time.perf_counter()
+    path = pc_catalog.build_compiled()
+    print(f"Wrote {path} ({os.path.getsize(path) / 1e6:.1f} MB) in {time.perf_counter() - start:.1f} s")
+
+if __name__ == "__main__":
+    main()
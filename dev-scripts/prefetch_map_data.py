@@ -0,0 +1,31 @@
+import argparse
+import os
+import sys
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  Downloads the Natural Earth land/ocean/coastline shapefiles the flight-route
+#  maps use into server-assets/cartopy, so the image ships with them and render
+#  workers never download at request time. --verify only checks that every
+#  file is present and readable (no network), exiting 1 if not.
+#
+#  Run from the repo root:  python dev-scripts/prefetch_map_data.py [--verify] [--scales 110m 50m]
+# ───────────────────────────────────────────────────────────────────────────────
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from components.common import map_features
+
+def main():
+    parser = argparse.ArgumentParser(description="Prefetch the Natural Earth data for flight-route maps.")
+    parser.add_argument("--verify", action="store_true", help="only check the files, never download (exit 1 on problems)")
+    parser.add_argument("--scales", nargs="+", default=list(map_features.SCALES), choices=map_features.SCALES)
+    args = parser.parse_args()
+
+    problems = map_features.prefetch(args.scales, verify_only=args.verify)
+    for problem in problems:
+        print(f"  {problem}")
+    if problems:
+        sys.exit(1)
+    print(f"Natural Earth {', '.join(args.scales)} ({', '.join(map_features.LAYERS)}) ready")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import asyncio
+import json
+import os
+import sys
+import time
+from aiohttp import web
+
+# ───────────────────────────────────────────────────────────────────────────────
+#  Local stand-in for the completion endpoint, for trying out streaming.
+#
+#  Serve it:   python tests/sse_stub_server.py
+#  Point the app at it:
+#      AI_ENDPOINT=http://127.0.0.1:8099/chat/completions uvicorn app:app
+#  Or run the client demo against it:
+#      python tests/sse_stub_server.py --demo
+# ───────────────────────────────────────────────────────────────────────────────
+
+HOST = "127.0.0.1"
+PORT = 8099
+TOKEN_DELAY = 0.03  # seconds between streamed tokens
+
+REPLY = (
+    "Hello! This reply is coming from the local stub server, one word at a time, "
+    "so you can watch the chat bubble fill in while the model is still talking. "
+    "FEEDBACK: Great job testing streaming!"
+)
+
+def completion_chunk(text):
+    return {"choices": [{"index": 0, "delta": {"content": text}, "finish_reason": None}]}
+
+async def chat_completions(request):
+    body = await request.json()
+    words = [w + " " for w in REPLY.split(" ")]
+    max_tokens = body.get("max_tokens")
+    if max_tokens:
+        words = words[:max_tokens]
+
+    if not body.get("stream"):
+        return web.json_response({"choices": [{"message": {"role": "assistant", "content": "".join(words).strip()}}]})
+
+    resp = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+    await resp.prepare(request)
+    await resp.write(b": stub stream\n\n")
+    for word in words:
+        await resp.write(f"data: {json.dumps(completion_chunk(word))}\n\n".encode("utf-8"))
+        await asyncio.sleep(TOKEN_DELAY)
+    await resp.write(b"data: [DONE]\n\n")
+    await resp.write_eof()
+    return resp
+
+def make_app():
+    app = web.Application()
+    app.router.add_post("/chat/completions", chat_completions)
+    return app
+
+async def demo():
+    # Run the stub and stream one reply through the app's own client
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+    from components.common import ai_client
+    ai_client.AI_ENDPOINT = f"http://{HOST}:{PORT}/chat/completions"
+
+    runner = web.AppRunner(make_app())
+    await runner.setup()
+    await web.TCPSite(runner, HOST, PORT).start()
+    try:
+        start = time.perf_counter()
+        first = None
+        updates = 0
+        async for partial in ai_client.stream_text([{"role": "user", "content": "hi"}]):
+            if first is None:
+                first = time.perf_counter() - start
+            updates += 1
+            print(f"\r{partial}", end="", flush=True)
+        total = time.perf_counter() - start
+        print(f"\n\nfirst text after {first * 1000:.0f} ms, {updates} UI updates, done after {total * 1000:.0f} ms")
+    finally:
+        await runner.cleanup()
+
+if __name__ == "__main__":
+    if "--demo" in sys.argv:
+        asyncio.run(demo())
+    else:
+        web.run_app(make_app(), host=HOST, port=PORT)
@@ -0,0 +1,70 @@
+import asyncio
+import pytest
+from components.common import ai_admission
+
+
+@pytest.fixture(autouse=True)
+def small_gate(monkeypatch):
+    monkeypatch.setattr(ai_admission, "MAX_CONCURRENT", 1)
+    monkeypatch.setattr(ai_admission, "MAX_PER_SESSION", 1)
+
+
+async def _hold(order, name, priority, release, session_key=None):
+    async with ai_admission.slot(priority, session_key):
+        order.append(name)
+        await release.wait()
+
+
+def test_waiters_are_served_by_priority_then_arrival():
+    async def run():
+        order = []
+        release = asyncio.Event()
+        holder = asyncio.ensure_future(_hold(order, "holder", ai_admission.DEFAULT, release))
+        await asyncio.sleep(0)
+        waiters = []
+        for name, priority in [("bg", ai_admission.BACKGROUND), ("default1", ai_admission.DEFAULT),
+                               ("chat", ai_admission.INTERACTIVE), ("default2", ai_admission.DEFAULT)]:
+            gate = asyncio.Event()
+            gate.set()  # each waiter leaves as soon as it is admitted
+            waiters.append(asyncio.ensure_future(_hold(order, name, priority, gate)))
+            await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(holder, *waiters)
+        return order
+
+    assert asyncio.run(run()) == ["holder", "chat", "default1", "default2", "bg"]
+
+
+def test_a_tab_at_its_cap_does_not_block_other_tabs(monkeypatch):
+    monkeypatch.setattr(ai_admission, "MAX_CONCURRENT", 2)
+
+    async def run():
+        order = []
+        release = asyncio.Event()
+        busy = asyncio.ensure_future(_hold(order, "a1", ai_admission.DEFAULT, release, "tab-a"))
+        await asyncio.sleep(0)
+        blocked = asyncio.ensure_future(_hold(order, "a2", ai_admission.INTERACTIVE, release, "tab-a"))
+        other = asyncio.ensure_future(_hold(order, "b1", ai_admission.BACKGROUND, release, "tab-b"))
+        await asyncio.sleep(0.01)
+        seen = list(order)
+        release.set()
+        await asyncio.gather(busy, blocked, other)
+        return seen
+
+    assert asyncio.run(run()) == ["a1", "b1"]
+
+
+def test_queue_timeout_fails_fast():
+    async def run():
+        release = asyncio.Event()
+        holder = asyncio.ensure_future(_hold([], "holder", ai_admission.DEFAULT, release))
+        await asyncio.sleep(0)
+        with pytest.raises(RuntimeError, match="busy"):
+            async with ai_admission.slot(ai_admission.DEFAULT, timeout=0.01):
+                pass
+        release.set()
+        await holder
+        async with ai_admission.slot(ai_admission.DEFAULT, timeout=0.01):
+            return True  # the timed-out waiter didn't leak a slot
+
+    assert asyncio.run(run())
@@ -0,0 +1,62 @@
+import asyncio
+import pytest
+from components.common import ai_cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(ai_cache, "DB_PATH", str(tmp_path / "ai_cache.db"))
+    monkeypatch.setattr(ai_cache, "SQLITE_ENABLED", True)
+    monkeypatch.setattr(ai_cache, "_db_ready", False)
+    monkeypatch.setattr(ai_cache, "_memory", ai_cache.OrderedDict())
+    monkeypatch.setattr(ai_cache, "_memory_bytes", 0)
+    monkeypatch.setattr(ai_cache, "_stats", {})
+
+
+def test_key_is_content_addressed():
+    messages = [{"role": "user", "content": "hi"}]
+    assert ai_cache.make_key("e", messages, 10) == ai_cache.make_key("e", [dict(m) for m in messages], 10)
+    assert ai_cache.make_key("e", messages, 10) != ai_cache.make_key("e", messages, 11)
+
+
+def test_hit_after_store():
+    async def run():
+        assert await ai_cache.get("k", "tool") is None
+        await ai_cache.put("k", "answer", "tool")
+        return await ai_cache.get("k", "tool")
+
+    assert asyncio.run(run()) == "answer"
+    counter = ai_cache.stats()["modules"]["tool"]
+    assert (counter["misses"], counter["stores"], counter["memory_hits"]) == (1, 1, 1)
+
+
+def test_sqlite_tier_survives_memory_loss():
+    async def run():
+        await ai_cache.put("k", "answer", "tool")
+        ai_cache._memory.clear()
+        return await ai_cache.get("k", "tool")
+
+    assert asyncio.run(run()) == "answer"
+    assert ai_cache.stats()["modules"]["tool"]["sqlite_hits"] == 1
+
+
+def test_expired_entries_miss():
+    async def run():
+        await ai_cache.put("k", "answer", "tool", ttl=-1)
+        return await ai_cache.get("k", "tool")
+
+    assert asyncio.run(run()) is None
+
+
+def test_oversized_value_evicts_the_old_entry(monkeypatch):
+    monkeypatch.setattr(ai_cache, "SQLITE_ENABLED", False)
+    monkeypatch.setattr(ai_cache, "MEMORY_MAX_BYTES", 200)
+
+    async def run():
+        await ai_cache.put("k", "old", "tool")
+        await ai_cache.put("k", "x" * 500, "tool")
+        return await ai_cache.get("k", "tool")
+
+    assert asyncio.run(run()) is None
+    assert ai_cache.stats()["memory_bytes"] == 0
+
@@ -0,0 +1,86 @@
+import asyncio
+import pytest
+from components.common import airport_index
+
+
+@pytest.fixture(autouse=True)
+def fresh_index(tmp_path, monkeypatch):
+    """The shipped precache and database, but lookups are journalled to tmp_path."""
+    monkeypatch.setattr(airport_index, "CACHE_FILE", tmp_path / "airport_cache.json")
+    monkeypatch.setattr(airport_index, "JOURNAL_FILE", tmp_path / "airport_cache.journal")
+    monkeypatch.setattr(airport_index, "_coords", None)
+    monkeypatch.setattr(airport_index, "_learned", {})
+    monkeypatch.setattr(airport_index, "_airports", {})
+    monkeypatch.setattr(airport_index, "_journal_lines", 0)
+    monkeypatch.setattr(airport_index, "_pending", {})
+
+
+@pytest.fixture
+def fake_nominatim(monkeypatch):
+    calls = []
+
+    async def fetch(code, session):
+        calls.append(code)
+        await asyncio.sleep(0.05)
+        if code == "QQQ":
+            raise ValueError("Airport 'QQQ' not found by Nominatim.")
+        return 10.0, 20.0
+
+    monkeypatch.setattr(airport_index, "_fetch", fetch)
+    return calls
+
+
+def test_known_codes_need_no_io():
+    lon, lat = airport_index.get("OTP")
+    assert 25 < lon < 27 and 44 < lat < 45
+    assert airport_index.info("OTP")["closed"] is False
+
+
+def test_concurrent_lookups_share_one_fetch_and_are_journalled(fake_nominatim):
+    async def run():
+        return await asyncio.gather(*(airport_index.lookup("ZZX") for _ in range(4)))
+
+    assert asyncio.run(run()) == [(10.0, 20.0)] * 4
+    assert fake_nominatim == ["ZZX"]
+    assert airport_index.JOURNAL_FILE.read_text().strip() == '["ZZX", 10.0, 20.0]'
+    airport_index._coords = None
+    assert airport_index.get("ZZX") == (10.0, 20.0)  # reloaded from the journal
+
+
+def test_cancelling_the_first_caller_does_not_fail_the_others(fake_nominatim):
+    async def run():
+        first = asyncio.ensure_future(airport_index.lookup("ZZX"))
+        await asyncio.sleep(0.01)
+        second = asyncio.ensure_future(airport_index.lookup("ZZX"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return first, await second
+
+    first, coords = asyncio.run(run())
+    assert first.cancelled()
+    assert coords == (10.0, 20.0)
+    assert fake_nominatim == ["ZZX"]
+
+
+def test_lookup_errors_reach_every_caller(fake_nominatim):
+    async def run():
+        return await asyncio.gather(*(airport_index.lookup("QQQ") for _ in range(2)), return_exceptions=True)
+
+    assert all(isinstance(r, ValueError) for r in asyncio.run(run()))
+    assert airport_index._pending == {}
+
+
+def test_nearest_open_airport():
+    lon, lat = airport_index.get("LHR")
+    code, km = airport_index.nearest_airport(lon + 0.01, lat, sizes=("large",))
+    assert code == "LHR" and km < 2
+    assert all(km <= 50 for _, km in airport_index.airports_within(lon, lat, 50))
+
+
+def test_repair_route_drops_closed_and_unknown_codes():
+    route, notes = airport_index.repair_route(["otp", "BWS", "ZZQ", "JFK", "jfk"])
+    assert route == ["OTP", "JFK"]
+    assert any("BWS" in note and "closed" in note for note in notes)
+    assert any("ZZQ" in note for note in notes)
+    assert airport_index.info("BWS")["closed"] is True
+    assert airport_index.get("BWS") is None  # the precache's guessed position is ignored
@@ -0,0 +1,119 @@
+import asyncio
+import os
+import time
+import pytest
+from components.common import artifact_store, task_runner
+
+
+@pytest.fixture(autouse=True)
+def store(tmp_path, monkeypatch):
+    """An empty store with one kind ("t", 60 s) under tmp_path and a 25-byte quota."""
+    monkeypatch.setattr(artifact_store, "DB_PATH", tmp_path / "db" / "artifacts.db")
+    monkeypatch.setattr(artifact_store, "KINDS", {"t": (tmp_path / "t", 60)})
+    monkeypatch.setattr(artifact_store, "MAX_TOTAL_BYTES", 25)
+    monkeypatch.setattr(artifact_store, "_items", None)
+    monkeypatch.setattr(artifact_store, "_expiry", [])
+    monkeypatch.setattr(artifact_store, "_lru", artifact_store.OrderedDict())
+    monkeypatch.setattr(artifact_store, "_total_bytes", 0)
+    monkeypatch.setattr(artifact_store, "_touched", set())
+    monkeypatch.setattr(artifact_store, "_changes", {})
+    monkeypatch.setattr(artifact_store, "_stats", {"registered": 0, "expired": 0, "evicted": 0, "missing": 0})
+    monkeypatch.setattr(artifact_store, "_sweeper", None)
+
+
+def write(name, size=10):
+    path = artifact_store.path_for("t", name)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    artifact_store.register(path, "t")
+    return path
+
+
+def reload():
+    artifact_store._items = None
+    artifact_store._lru.clear()
+    artifact_store._expiry.clear()
+    artifact_store._total_bytes = 0
+
+
+def test_quota_evicts_least_recently_used():
+    a, b = write("a"), write("b")
+    artifact_store.touch(a)  # b is now the least recently used
+    c = write("c")
+    assert [artifact_store.contains(p) for p in (a, b, c)] == [True, False, True]
+    assert os.path.exists(b)  # deleted by the next flush, not on the caller's thread
+    artifact_store.flush()
+    assert not os.path.exists(b)
+    assert artifact_store.stats()["evicted"] == 1
+    assert artifact_store.stats()["bytes"] == 20
+
+
+def rows():
+    conn = artifact_store.get_db()
+    try:
+        return conn.execute("SELECT COUNT(*) FROM artifacts").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_register_and_touch_only_queue_db_writes():
+    a = write("a")
+    artifact_store.flush()
+    write("b")
+    artifact_store.touch(a)
+    assert rows() == 1
+    assert artifact_store.stats()["queued"] == 2
+    artifact_store.flush()
+    assert rows() == 2
+    assert artifact_store.stats()["queued"] == 0
+
+
+def test_evicted_then_rewritten_file_survives_the_flush():
+    a = write("a")
+    write("b")
+    write("c")  # evicts a
+    with open(a, "wb") as f:
+        f.write(b"y")
+    artifact_store.register(a, "t")  # evicts b
+    artifact_store.flush()
+    assert os.path.exists(a) and artifact_store.contains(a)
+
+
+def test_sweep_removes_expired_and_keeps_touched():
+    a, b = write("a"), write("b")
+    artifact_store.flush()
+    later = time.time() + 45
+    artifact_store._items[a]["accessed"] = later  # touched 45 s from now
+    artifact_store._expiry.append((later + 60, a))
+    artifact_store._touched.add(a)
+    assert artifact_store.sweep(time.time() + 70) == 1
+    assert os.path.exists(a) and not os.path.exists(b)
+
+
+def test_index_survives_a_restart():
+    a, b = write("a"), write("b")
+    artifact_store.touch(a)
+    artifact_store.flush()
+    reload()
+    assert artifact_store.contains(a) and artifact_store.contains(b)
+    write("c")  # b was used least recently before the restart
+    assert not artifact_store.contains(b)
+
+
+def test_first_run_adopts_existing_files(tmp_path):
+    os.makedirs(tmp_path / "t")
+    (tmp_path / "t" / "old.wav").write_bytes(b"x" * 5)
+    assert artifact_store.contains(tmp_path / "t" / "old.wav")
+    assert artifact_store.sweep(time.time() + 120) == 1
+    assert not (tmp_path / "t" / "old.wav").exists()
+
+
+def test_start_loads_off_the_loop_and_runs_as_a_service():
+    async def run():
+        await artifact_store.start()
+        loaded = artifact_store._items is not None
+        services = task_runner.metrics()["services"]
+        await task_runner.shutdown()
+        return loaded, services
+
+    assert asyncio.run(run()) == (True, 1)
@@ -0,0 +1,59 @@
+import pytest
+from components.common import json_stream
+from components.common.json_stream import IncrementalParser
+
+
+def feed_all(text, step=1):
+    parser = IncrementalParser()
+    events = []
+    for i in range(0, len(text), step):
+        events += parser.feed(text[i:i + step])
+    return parser, events
+
+
+def test_array_elements_are_reported_as_they_close():
+    text = 'Here you go: {"daily_plan": [{"day": 1}, {"day": 2}], "done": true} trailing prose'
+    parser, events = feed_all(text)
+    paths = [path for path, _ in events]
+    assert paths.index(("daily_plan", 0)) < paths.index(("daily_plan", 1, "day"))
+    assert (("daily_plan", 0), {"day": 1}) in events
+    assert parser.complete
+    assert parser.close() == {"daily_plan": [{"day": 1}, {"day": 2}], "done": True}
+
+
+def test_partial_object_is_visible_before_the_root_closes():
+    parser = IncrementalParser()
+    parser.feed('{"title": "Trip", "stops": [{"city": "Paris"}, {"ci')
+    assert not parser.complete
+    assert parser.value == {"title": "Trip", "stops": [{"city": "Paris"}, {}]}
+
+
+def test_truncated_output_is_closed_off():
+    parser = IncrementalParser()
+    parser.feed('```json\n{"a": [1, 2, {"b": "unfinish')
+    assert parser.close() == {"a": [1, 2, {"b": "unfinish"}]}
+
+
+@pytest.mark.parametrize("step", [1, 3, 1000])
+def test_chunking_does_not_change_the_result(step):
+    text = '{"s": "caf\\u00e9 \\ud83d\\ude00", "n": -1.5e2, "l": [null, True, \'x\']}'
+    parser, _ = feed_all(text, step)
+    assert parser.close() == {"s": "café 😀", "n": -150.0, "l": [None, True, "x"]}
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("{'a': 1, 'b': [1, 2,],}", {"a": 1, "b": [1, 2]}),
+    ('{"a": 1 "b": 2}', {"a": 1, "b": 2}),
+    ('{a: yes}', {"a": "yes"}),
+    ('{"t": 2:30}', {"t": "2:30"}),
+    ('{"t": 9 am, "u": 1}', {"t": "9 am", "u": 1}),
+    ('{"p": "C:\\d"}', {"p": "C:\\d"}),
+])
+def test_tolerated_model_mistakes(text, expected):
+    assert json_stream.loads(text) == expected
+
+
+def test_root_filter_and_missing_json():
+    assert json_stream.loads('[1] then {"a": 1}', root="{") == {"a": 1}
+    with pytest.raises(ValueError):
+        json_stream.loads("no json here")
@@ -0,0 +1,24 @@
+import pytest
+from components.common import part_index, pc_catalog
+
+
+def row(category, query):
+    found = part_index.find_row(category, query)
+    return None if found is None else pc_catalog.get(category).row(found)
+
+
+@pytest.mark.parametrize("category, query, field, expected", [
+    ("cpu", "AMD Ryzen 5 7600X", "name", "AMD Ryzen 5 7600X"),
+    ("cpu", "ryzen 5 7600", "name", "AMD Ryzen 5 7600"),      # not the X variant
+    ("cpu", "Intel Core i5-13600K", "name", "Intel Core i5-13600K"),
+    ("gpu", "RTX 4070", "chipset", "GeForce RTX 4070"),       # not a Super or Ti
+    ("gpu", "RTX 4070 Ti", "chipset", "GeForce RTX 4070 Ti"),
+    ("motherboard", "asus rog strix b650-a", "socket", "AM5"),
+])
+def test_names_match_the_intended_part(category, query, field, expected):
+    assert row(category, query)[field] == expected
+
+
+@pytest.mark.parametrize("query", [None, "", "banana phone"])
+def test_unmatched_names_give_none(query):
+    assert part_index.find_row("cpu", query) is None
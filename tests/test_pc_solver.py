@@ -0,0 +1,53 @@
+import pytest
+from components.common import part_index, pc_catalog, pc_solver
+
+
+@pytest.fixture(scope="module", autouse=True)
+def prepared():
+    pc_solver.prepare()
+
+
+def find(category, name):
+    found = part_index.find_row(category, name)
+    assert found is not None, name
+    return found
+
+
+def socket(category, build):
+    return pc_solver._get(category, build, "socket")
+
+
+def test_check_reports_a_socket_mismatch():
+    build = {"cpu": find("cpu", "AMD Ryzen 5 7600X"), "motherboard": find("motherboard", "MSI B550 Tomahawk")}
+    assert (socket("cpu", build), socket("motherboard", build)) == ("AM5", "AM4")
+    issues = pc_solver.check(build)
+    assert any("AM4 motherboard" in issue for issue in issues)
+
+
+def test_solve_replaces_the_board_that_doesnt_take_the_cpu():
+    choices = {"cpu": find("cpu", "AMD Ryzen 5 7600X"), "motherboard": find("motherboard", "MSI B550 Tomahawk")}
+    build, notes = pc_solver.solve(choices, 1200)
+    assert build["cpu"] == choices["cpu"]
+    assert build["motherboard"] != choices["motherboard"]
+    assert socket("motherboard", build) == "AM5"
+    assert any("socket" in note for note in notes)
+
+
+@pytest.mark.parametrize("budget, use_case, perf_level", [
+    (600, "Office/School", "Low"),
+    (1200, "Gaming", "Medium"),
+    (2500, "Content Creation", "Ultra"),
+])
+def test_solved_builds_are_complete_and_compatible(budget, use_case, perf_level):
+    build, _ = pc_solver.solve({}, budget, use_case, perf_level)
+    assert set(build) == set(pc_solver.PART_ORDER)
+    assert pc_solver.check(build) == []
+    cpu_socket, board_socket = socket("cpu", build), socket("motherboard", build)
+    assert cpu_socket == board_socket or (board_socket == "LGA1151?" and cpu_socket.startswith("LGA1151"))
+    assert pc_solver.required_psu_watts(build) <= pc_solver._get("psu", build, "wattage")
+
+
+def test_intel_board_for_an_intel_cpu():
+    build, _ = pc_solver.solve({"cpu": find("cpu", "Intel Core i5-13600K")}, 1500)
+    assert socket("motherboard", build) == socket("cpu", build) == "LGA1700"
+    assert pc_catalog.get("cpu").names[build["cpu"]] == "Intel Core i5-13600K"
@@ -0,0 +1,103 @@
+import os
+import pytest
+from components.common import generate_flightroute, route_images
+
+# app.py builds the Spotify client and the calendar DB at import time
+os.environ.setdefault("SPOTIPY_CLIENT_ID", "test")
+os.environ.setdefault("SPOTIPY_CLIENT_SECRET", "test")
+os.environ.setdefault("SPOTIPY_REDIRECT_URI", "http://localhost/")
+CALENDAR_DB = os.path.join(os.path.dirname(__file__), "../server-assets/persistent/calendars.db")
+_calendar_db_existed = os.path.exists(CALENDAR_DB)
+
+from fastapi.testclient import TestClient  # noqa: E402
+import app  # noqa: E402
+
+
+@pytest.fixture(scope="module", autouse=True)
+def remove_calendar_db():
+    yield
+    if not _calendar_db_existed and os.path.exists(CALENDAR_DB):
+        os.remove(CALENDAR_DB)
+
+
+@pytest.fixture
+def entry(tmp_path, monkeypatch):
+    """A rendered route whose blobs live in tmp_path; ensure() never renders."""
+    monkeypatch.setattr(route_images, "BLOB_DIR", tmp_path)
+    entry = {variant: f"{i:x}" * 64 for i, variant in enumerate(generate_flightroute.ROUTE_VARIANTS, 1)}
+    for variant in entry:
+        route_images.blob_path(entry, variant).write_bytes(variant.encode())
+    requested = []
+
+    async def ensure(codes, allow_lookup=False):
+        requested.append(codes)
+        return entry
+
+    monkeypatch.setattr(route_images, "ensure", ensure)
+    entry["_requested"] = requested
+    return entry
+
+
+@pytest.fixture
+def client():
+    return TestClient(app.app)
+
+
+def test_parse_and_urls():
+    assert route_images.parse("otp-jfk_800.webp") == (["OTP", "JFK"], "web")
+    assert route_images.parse("OTP-JFK-LAX.svg") == (["OTP", "JFK", "LAX"], "svg")
+    for bad in ["OTP.svg", "OTP-JFK.gif", "OTP-J/K.svg", "-".join(["AAA"] * 13) + ".svg"]:
+        with pytest.raises(ValueError):
+            route_images.parse(bad)
+    entry = {variant: "ab" * 32 for variant in generate_flightroute.ROUTE_VARIANTS}
+    assert route_images.urls(["OTP", "JFK"], entry)["web"] == "/routes/OTP-JFK_800.webp?v=" + "ab" * 8
+
+
+def test_not_modified():
+    tag = '"abc"'
+    assert route_images.not_modified('"x", "abc"', tag)
+    assert route_images.not_modified("*", tag)
+    assert route_images.not_modified('W/"abc"', tag)
+    assert not route_images.not_modified('"abcd"', tag)
+    assert not route_images.not_modified(None, tag)
+
+
+def test_versioned_url_is_immutable(client, entry):
+    version = route_images.version(entry, "web")
+    response = client.get(f"/routes/OTP-JFK_800.webp?v={version}")
+    assert response.status_code == 200
+    assert response.content == b"web"
+    assert response.headers["content-type"] == "image/webp"
+    assert response.headers["etag"] == route_images.etag(entry, "web")
+    assert response.headers["cache-control"] == route_images.CACHE_IMMUTABLE
+    assert entry["_requested"] == [["OTP", "JFK"]]
+
+
+@pytest.mark.parametrize("query", ["", "?v=0123456789abcdef"])
+def test_bare_or_stale_url_must_revalidate(client, entry, query):
+    response = client.get(f"/routes/OTP-JFK.svg{query}")
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == route_images.CACHE_REVALIDATE
+    assert response.headers["etag"] == route_images.etag(entry, "svg")
+
+
+def test_matching_etag_gets_304(client, entry):
+    tag = route_images.etag(entry, "print")
+    response = client.get("/routes/OTP-JFK_print.jpg", headers={"If-None-Match": tag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == tag
+    stale = client.get("/routes/OTP-JFK_print.jpg", headers={"If-None-Match": '"other"'})
+    assert stale.status_code == 200
+
+
+def test_errors(client, entry, monkeypatch):
+    assert client.get("/routes/not-a-route.png").status_code == 404
+
+    async def busy(codes, allow_lookup=False):
+        raise RuntimeError("The map renderer is busy, please try again in a moment.")
+
+    monkeypatch.setattr(route_images, "ensure", busy)
+    response = client.get("/routes/OTP-JFK.svg")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "5"
@@ -0,0 +1,56 @@
+import asyncio
+from components.common import ai_client
+
+
+def test_identical_requests_share_one_upstream_call(monkeypatch):
+    calls = []
+
+    async def fake_post(messages, max_tokens, timeout):
+        calls.append(messages)
+        await asyncio.sleep(0.05)
+        return "reply"
+
+    monkeypatch.setattr(ai_client, "_post_completion", fake_post)
+    messages = [{"role": "user", "content": "same"}]
+
+    async def run():
+        return await asyncio.gather(*(ai_client.complete(messages) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["reply"] * 5
+    assert len(calls) == 1
+    assert ai_client.metrics()["inflight"] == 0
+
+
+def test_cancelled_waiter_does_not_cancel_the_others():
+    started = []
+
+    async def factory():
+        started.append(1)
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def run():
+        first = asyncio.ensure_future(ai_client._single_flight("fp", factory))
+        second = asyncio.ensure_future(ai_client._single_flight("fp", factory))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return first, await second
+
+    first, result = asyncio.run(run())
+    assert first.cancelled()
+    assert result == "done"
+    assert started == [1]
+
+
+def test_failure_reaches_every_waiter():
+    async def factory():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("AI model returned 500")
+
+    async def run():
+        return await asyncio.gather(
+            *(ai_client._single_flight("boom", factory) for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
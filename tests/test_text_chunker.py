@@ -0,0 +1,63 @@
+import asyncio
+import pytest
+from components.common import text_chunker
+
+TEXT = (
+    "  Intro paragraph.\n\n"
+    + "A sentence that goes on. " * 40 + "\n \n\t"
+    + "word" * 300 + " tail!\n\n\n"
+    + "Last one? Yes.  "
+)
+
+
+@pytest.mark.parametrize("max_chars", [20, 80, 800])
+def test_split_rebuilds_its_input_exactly(max_chars):
+    chunks = text_chunker.split(TEXT, max_chars)
+    assert "".join(lead + body + trail for lead, body, trail in chunks) == TEXT
+    assert all(len(lead + body + trail) <= max_chars for lead, body, trail in chunks)
+    assert all(body == body.strip() for _, body, _ in chunks)
+
+
+def test_split_sections_rebuilds_its_input_exactly():
+    sections = text_chunker.split_sections(TEXT, 200)
+    assert "".join(lead + body + trail for lead, body, trail in sections) == TEXT
+
+
+def test_split_of_blank_text():
+    assert "".join("".join(c) for c in text_chunker.split("   \n\n ")) == "   \n\n "
+
+
+def test_map_chunks_keeps_whitespace_and_bounds_concurrency():
+    running = 0
+    peak = 0
+
+    async def upper(body):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return body.upper()
+
+    result = asyncio.run(text_chunker.map_chunks(TEXT, upper, max_chars=80))
+    assert result == TEXT.upper()
+    assert peak <= text_chunker.ai_admission.MAX_PER_SESSION
+
+
+def test_gather_bounded_cancels_the_rest_on_error():
+    finished = []
+
+    async def ok():
+        await asyncio.sleep(0.05)
+        finished.append(1)
+
+    async def boom():
+        raise RuntimeError("chunk failed")
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await text_chunker.gather_bounded([boom, ok, ok], limit=3)
+        await asyncio.sleep(0.1)
+
+    asyncio.run(run())
+    assert finished == []